@@ -1,6 +1,8 @@
 import os
 import git
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
 
 from cbc_sdk.enterprise_edr import Report, IOC_V2, Watchlist
 from cbc_sdk.rest_api import CBCloudAPI
@@ -10,11 +12,85 @@ sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.framework import techniques_resolver
 from Engines.modules.deployment import fetch_config_envvar
-from Engines.modules.logs import log
-from Engines.modules.tide import DataTide
+from Engines.modules.logs import log, in_log_context
+from Engines.modules.tide import DataTide, IndexTide
 from Engines.modules.plugins import DeployMDR
 
 
+class OrganizationCatalog:
+    """
+    Watchlists and reports of an organization, fetched once per deployment
+    and indexed by name and title. The index is kept up to date as reports
+    are created or deleted, and report changes are staged to be rolled out
+    with a single update per report.
+    """
+
+    def __init__(self, service: CBCloudAPI):
+        self.service = service
+        self.watchlists: dict[str, Watchlist] = {
+            w.name: w for w in service.select(Watchlist) or []
+        }
+        self.reports: dict[str, dict[str, Report]] = dict()
+        self.changes: dict[tuple[str, str], tuple[Report, dict]] = dict()
+
+    def watchlist(self, name: str) -> Watchlist | None:
+        return self.watchlists.get(name)
+
+    def watchlist_reports(self, watchlist_name: str) -> dict[str, Report]:
+        if watchlist_name not in self.reports:
+            watchlist = self.watchlists[watchlist_name]
+            self.reports[watchlist_name] = {r.title: r for r in watchlist.reports}
+        return self.reports[watchlist_name]
+
+    def report(self, watchlist_name: str, title: str) -> Report | None:
+        return self.watchlist_reports(watchlist_name).get(title)
+
+    def add(self, watchlist_name: str, report: Report):
+        self.watchlist_reports(watchlist_name)[report.title] = report
+
+    def remove(self, watchlist_name: str, title: str):
+        self.watchlist_reports(watchlist_name).pop(title, None)
+        self.changes.pop((watchlist_name, title), None)
+
+    def staged(self, watchlist_name: str, report: Report) -> dict:
+        """
+        Attributes of the report staged for update so far.
+        """
+        return self.changes.get((watchlist_name, report.title), (report, {}))[1]
+
+    def stage(self, watchlist_name: str, report: Report, **attributes):
+        """
+        Stages a report for update, merging the attributes with the ones
+        staged by previous MDRs.
+        """
+        _, staged = self.changes.setdefault((watchlist_name, report.title), (report, {}))
+        staged.update(attributes)
+
+    def rollout(self) -> dict[str, str]:
+        """
+        Updates every staged report once, deleting the ones left without
+        any IOC. Returns the errors by report title.
+        """
+        errors = dict()
+        for (watchlist_name, title), (report, attributes) in self.changes.items():
+            try:
+                if report.iocs_:
+                    report.update(**attributes)
+                else:
+                    report.delete()
+                    self.watchlist_reports(watchlist_name).pop(title, None)
+                    log(
+                        "WARNING",
+                        "The specified report was automatically"
+                        "deleted as they were no other rule",
+                        title,
+                    )
+            except Exception as error:
+                errors[title] = repr(error)
+        self.changes.clear()
+        return errors
+
+
 class CarbonBlackCloudDeploy(DeployMDR):
 
     def __init__(self):
@@ -28,6 +104,8 @@ class CarbonBlackCloudDeploy(DeployMDR):
         self.CBC_URL = CBC_SETUP["url"]
 
         self.ORGANIZATIONS = CBC_SETUP["organizations"]
+        # Organizations deployed concurrently, all of them at once by default
+        self.ORGANIZATION_WORKERS = int(CBC_SETUP.get("workers") or 0)
 
         self.SEVERITY_MAPPING = {
             "Informational": 1,
@@ -37,237 +115,275 @@ class CarbonBlackCloudDeploy(DeployMDR):
             "Critical": 10,
         }
 
-    def deploy_mdr(self, data):
+    def connect_organization(self, org: str) -> CBCloudAPI:
         """
-        Deployment routine, connecting to the platform and combining base and custom configurations
+        Resolves the secrets of the organization and connects to its tenant.
         """
-
-        # Logic to overwrite target organizations if it is specified on the MDR
-        custom_orgs = data["configurations"][self.DEPLOYER_IDENTIFIER].get(
-            "organization"
-        )
-        if custom_orgs:
-            deploy_orgs = custom_orgs
+        if org in self.CBC_SECRETS:
+            org_secrets = fetch_config_envvar(self.CBC_SECRETS[org])
+            org_key = org_secrets.get("org_key")
+            token = org_secrets.get("token")
         else:
-            deploy_orgs = self.ORGANIZATIONS
+            log(
+                "FATAL",
+                "Target organization is not present in Secrets configuration",
+                org,
+                "Double check TOML config to ensure there is a org_key and token entry for this org",
+            )
+            raise (Exception)
 
-        for org in deploy_orgs:
+        if not org_key:
+            log(
+                "FATAL",
+                "Could not fetch Organization Key for organization",
+                org,
+                "Double check that there is a namespaced entry for this organization in the TOML config",
+            )
+            raise (Exception)
 
+        if not token:
             log(
-                "ONGOING",
-                f" Currently deploying MDR {data['name']} on organization",
+                "FATAL",
+                "Could not fetch Organization Token for organization",
                 org,
+                "Double check that there is a namespaced entry for this organization in the TOML config",
             )
+            raise (Exception)
 
-            org = org.strip()  # Remove any whitespace in case there are
-            if org in self.CBC_SECRETS:
-                org_secrets = fetch_config_envvar(self.CBC_SECRETS[org])
-                org_key = org_secrets.get("org_key")
-                token = org_secrets.get("token")
-            else:
-                log(
-                    "FATAL",
-                    "Target organization is not present in Secrets configuration",
-                    org,
-                    "Double check TOML config to ensure there is a org_key and token entry for this org",
-                )
-                raise (Exception)
+        try:
+            service = CBCloudAPI(
+                url=self.CBC_URL, token=token, org_key=org_key, ssl_verify=False
+            )
+            log(
+                "SUCCESS",
+                "Successfully connected to Carbon Black Cloud on tenant",
+                org,
+            )
 
-            if not org_key:
-                log(
-                    "FATAL",
-                    "Could not fetch Organization Key for organization",
-                    org,
-                    "Double check that there is a namespaced entry for this organization in the TOML config",
-                )
-                raise (Exception)
+        except:
+            raise Exception(
+                f"⚠️ [FAILURE] Service could not be reached for organization {org}"
+            )
 
-            if not token:
-                log(
-                    "FATAL",
-                    "Could not fetch Organization Token for organization",
-                    org,
-                    "Double check that there is a namespaced entry for this organization in the TOML config",
-                )
-                raise (Exception)
+        return service
 
-            try:
-                service = CBCloudAPI(
-                    url=self.CBC_URL, token=token, org_key=org_key, ssl_verify=False
-                )
-                log(
-                    "SUCCESS",
-                    "Successfully connected to Carbon Black Cloud on tenant",
-                    org,
-                )
+    def target_organizations(self, data) -> list[str]:
+        """
+        Organizations the MDR deploys to, the ones specified on the MDR
+        overwriting the default ones.
+        """
+        custom_orgs = data["configurations"][self.DEPLOYER_IDENTIFIER].get(
+            "organization"
+        )
+        deploy_orgs = custom_orgs or self.ORGANIZATIONS
 
-            except:
-                raise Exception(
-                    f"⚠️ [FAILURE] Service could not be reached for organization {org}"
-                )
+        # Remove any whitespace in case there are
+        return [org.strip() for org in deploy_orgs]
+
+    def deploy_mdr(self, data, org: str, catalog: "OrganizationCatalog"):
+        """
+        Deployment routine on an organization, combining base and custom configurations
+        """
 
-            config_data = data["configurations"][self.DEPLOYER_IDENTIFIER]
-            uuid = data["uuid"]
-            name = data["name"]
-            description = data["description"]
-            status = config_data["status"]
-            query = config_data["query"]
+        log(
+            "ONGOING",
+            f" Currently deploying MDR {data['name']} on organization",
+            org,
+        )
 
-            # Check if case for removal or deployment, different procedures for each
-            deployment = False
-            removal = False
+        config_data = data["configurations"][self.DEPLOYER_IDENTIFIER]
+        uuid = data["uuid"]
+        name = data["name"]
+        description = data["description"]
+        status = config_data["status"]
+        query = config_data["query"]
 
-            if status in ["DISABLED", "REMOVED"]:
-                removal = True
-            else:
-                deployment = True
-
-            tags = list()
-            tags.append(config_data["status"])
-
-            if "detection_model" in data.keys():
-                cdm = data["detection_model"]
-                techniques = techniques_resolver(uuid)
-                tags.append(cdm)
-                tags.extend(techniques)
-
-            if "tags" in config_data.keys():
-                tags.extend(config_data["tags"])
-
-            # Severity Mapping
-            severity = self.SEVERITY_MAPPING[data["response"]["alert_severity"]]
-
-            # TODO Introduce optional deployment mode where one report can group MDR together
-            # To implement, the id of the CDM should be the unique ID of the report.
-            # The report title should be updated against CDM name on each push.
-            selected_watchlist = config_data.get("watchlist") or self.DEFAULT_WATCHLIST
-            selected_report = config_data.get("report") or name
-            watchlist_list = service.select(Watchlist)
-            # Select watchlist and report objects
-            report = None
-            watchlist = None
-
-            if watchlist_list:
-                for w in watchlist_list:
-                    if w.name == selected_watchlist:
-                        watchlist = w
-
-                if watchlist:
-                    for r in watchlist.reports:
-                        if r.title == selected_report:
-                            report = r
-                else:
-                    raise Exception(
-                        "⚠️ [FATAL] The CBC Deployer cannot create a detection in a non"
-                        f"existent Watchlist : {selected_watchlist}. Make sure to create"
-                        "one on the console before retriggering the deployment"
-                    )
+        # Check if case for removal or deployment, different procedures for each
+        deployment = False
+        removal = False
 
-            ioc = IOC_V2.create_query(service, uuid, query)
-
-            # If report already exists, update
-            if report:
-
-                # When no reports are selected, we stick to one MDR == one report
-                if selected_report == name:
-                    if deployment:
-                        report.remove_iocs_by_id(str(uuid))
-                        report.append_iocs([ioc])
-
-                        if severity != report.severity:
-                            report.update(
-                                description=description, tags=tags, severity=severity
-                            )
-                            log(
-                                "INFO",
-                                "Upgraded severity for this report to allign with MDR",
-                                str(severity),
-                            )
-                        else:
-                            report.update(description=description, tags=tags)
-                        log("SUCCESS", "Rolled out IOC to report", selected_report)
-
-                    elif removal:
-                        report.delete()
-                        log(
-                            "WARNING",
-                            "The report was deleted alongside the rule",
-                            selected_report,
-                        )
+        if status in ["DISABLED", "REMOVED"]:
+            removal = True
+        else:
+            deployment = True
 
-                # When a report is specified, we non destructively extend its data
-                else:
-                    if deployment:
-                        report.remove_iocs_by_id(uuid)
-                        report.append_iocs([ioc])
-
-                        # Add only new relevant tags to not block other MDR pushing to the same report
-                        tags.extend(t for t in report.tags if t not in tags)
-
-                        # Check for severity, if the MDR is higher than it, we update it
-                        if severity > report.severity:
-                            report.update(
-                                description=description, tags=tags, severity=severity
-                            )
-                            log(
-                                "INFO",
-                                "Upgraded severity for this report to allign with MDR",
-                                str(severity),
-                            )
-                        else:
-                            report.update(description=description, tags=tags)
-                        log("SUCCESS", "Deployed IOC to report", selected_report)
-
-                    elif removal:
-                        if len(report.iocs_) > 1:
-                            report.remove_iocs_by_id(uuid)
-                            report.update()
-                            log("SUCCESS", f"Deleted IOC from report", selected_report)
-
-                        else:
-                            report.delete()
-                            log(
-                                "WARNING",
-                                "The specified report was automatically"
-                                "deleted as they were no other rule",
-                                selected_report,
-                            )
-
-            # If report does not exist, create a new one and attach the IOC
-            else:
+        tags = list()
+        tags.append(config_data["status"])
+
+        if "detection_model" in data.keys():
+            cdm = data["detection_model"]
+            techniques = techniques_resolver(uuid)
+            tags.append(cdm)
+            tags.extend(techniques)
+
+        if "tags" in config_data.keys():
+            tags.extend(config_data["tags"])
+
+        # Severity Mapping
+        severity = self.SEVERITY_MAPPING[data["response"]["alert_severity"]]
+
+        selected_watchlist = config_data.get("watchlist") or self.DEFAULT_WATCHLIST
+        selected_report = config_data.get("report") or name
+
+        # Select watchlist and report objects
+        watchlist = catalog.watchlist(selected_watchlist)
+        if not watchlist:
+            raise Exception(
+                "⚠️ [FATAL] The CBC Deployer cannot create a detection in a non"
+                f"existent Watchlist : {selected_watchlist}. Make sure to create"
+                "one on the console before retriggering the deployment"
+            )
+        report = catalog.report(selected_watchlist, selected_report)
+
+        ioc = IOC_V2.create_query(catalog.service, uuid, query)
+
+        # If report already exists, update. Changes are staged on the report,
+        # and rolled out once all the MDRs of the organization are processed
+        if report:
+
+            # When no reports are selected, we stick to one MDR == one report
+            if selected_report == name:
                 if deployment:
-                    report_builder = Report.create(
-                        service, selected_report, description, severity
-                    )
-                    report_builder.add_ioc(ioc)
-                    for tag in tags:
-                        report_builder.add_tag(tag)
-                    report = report_builder.build()
-                    report.save_watchlist()
-                    watchlist.add_reports([report])  # type: ignore
-                    log("SUCCESS", "Created report and deployed IOC", selected_report)
+                    report.remove_iocs_by_id([str(uuid)])
+                    report.append_iocs([ioc])
+
+                    if severity != report.severity:
+                        catalog.stage(
+                            selected_watchlist,
+                            report,
+                            description=description,
+                            tags=tags,
+                            severity=severity,
+                        )
+                        log(
+                            "INFO",
+                            "Upgraded severity for this report to allign with MDR",
+                            str(severity),
+                        )
+                    else:
+                        catalog.stage(
+                            selected_watchlist, report, description=description, tags=tags
+                        )
+                    log("SUCCESS", "Rolled out IOC to report", selected_report)
 
                 elif removal:
+                    report.delete()
+                    catalog.remove(selected_watchlist, selected_report)
                     log(
-                        "SKIP",
-                        f"No report to delete, already removed from system",
+                        "WARNING",
+                        "The report was deleted alongside the rule",
                         selected_report,
                     )
 
+            # When a report is specified, we non destructively extend its data
+            else:
+                staged = catalog.staged(selected_watchlist, report)
+                if deployment:
+                    report.remove_iocs_by_id([str(uuid)])
+                    report.append_iocs([ioc])
+
+                    # Add only new relevant tags to not block other MDR pushing to the same report
+                    current_tags = staged.get("tags", report.tags)
+                    tags.extend(t for t in current_tags if t not in tags)
+
+                    # Check for severity, if the MDR is higher than it, we update it
+                    current_severity = staged.get("severity", report.severity)
+                    if severity > current_severity:
+                        catalog.stage(
+                            selected_watchlist,
+                            report,
+                            description=description,
+                            tags=tags,
+                            severity=severity,
+                        )
+                        log(
+                            "INFO",
+                            "Upgraded severity for this report to allign with MDR",
+                            str(severity),
+                        )
+                    else:
+                        catalog.stage(
+                            selected_watchlist, report, description=description, tags=tags
+                        )
+                    log("SUCCESS", "Deployed IOC to report", selected_report)
+
+                elif removal:
+                    # The report is deleted on roll out if no other rule is left
+                    report.remove_iocs_by_id([str(uuid)])
+                    catalog.stage(selected_watchlist, report)
+                    log("SUCCESS", f"Deleted IOC from report", selected_report)
+
+        # If report does not exist, create a new one and attach the IOC
+        else:
+            if deployment:
+                report_builder = Report.create(
+                    catalog.service, selected_report, description, severity
+                )
+                report_builder.add_ioc(ioc)
+                for tag in tags:
+                    report_builder.add_tag(tag)
+                report = report_builder.build()
+                report.save_watchlist()
+                watchlist.add_reports([report])  # type: ignore
+                catalog.add(selected_watchlist, report)
+                log("SUCCESS", "Created report and deployed IOC", selected_report)
+
+            elif removal:
+                log(
+                    "SKIP",
+                    f"No report to delete, already removed from system",
+                    selected_report,
+                )
+
         return True
 
+    def deploy_organization(self, org: str, mdrs: list[dict]) -> list[dict]:
+        """
+        Deploys all the MDRs targeting an organization with a single connection
+        and catalog of its watchlists. MDRs are deployed in order, as several
+        can target the same report, and the reports changed are then updated
+        once each.
+        """
+        results = list()
+        try:
+            catalog = OrganizationCatalog(self.connect_organization(org))
+        except Exception as error:
+            return [
+                {"org": org, "name": mdr["name"], "error": repr(error)} for mdr in mdrs
+            ]
+
+        for mdr in mdrs:
+            try:
+                self.deploy_mdr(mdr, org, catalog)
+                error = None
+            except Exception as e:
+                error = repr(e)
+                log("FAILURE", f"Could not deploy {mdr['name']} on organization", org)
+            results.append({"org": org, "name": mdr["name"], "error": error})
+
+        for title, error in catalog.rollout().items():
+            log("FAILURE", f"Could not update report {title} on organization", org)
+            results.append({"org": org, "name": f"Report {title}", "error": error})
+
+        return results
+
     def deploy(self, deployment: list[str]):
+        """
+        Groups the MDRs by target organization, and deploys organizations
+        concurrently, each with its own connection.
+        """
 
         if not deployment:
             raise Exception("DEPLOYMENT NOT FOUND")
 
-        # Start deployment routine
+        organizations: dict[str, list[dict]] = dict()
         for mdr in deployment:
-            mdr_data = DataTide.Models.mdr[mdr]
+            mdr_data = IndexTide.model("mdr", mdr)
 
             # Check if modified MDR contains a platform entry (by safety, but should not happen since orchestrator will filter for the platform)
             if self.DEPLOYER_IDENTIFIER in mdr_data["configurations"].keys():
-                self.deploy_mdr(mdr_data)
+                for org in self.target_organizations(mdr_data):
+                    organizations.setdefault(org, []).append(mdr_data)
             else:
                 log(
                     "SKIP",
@@ -275,6 +391,42 @@ class CarbonBlackCloudDeploy(DeployMDR):
                     mdr_data.get("name"),
                 )
 
+        if not organizations:
+            return
+
+        log(
+            "ONGOING",
+            f"Deploying {len(deployment)} MDRs across organizations",
+            ", ".join(organizations),
+        )
+        workers = self.ORGANIZATION_WORKERS or len(organizations)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = [
+                result
+                for org_results in pool.map(
+                    in_log_context(
+                        lambda org: self.deploy_organization(org, organizations[org])
+                    ),
+                    organizations,
+                )
+                for result in org_results
+            ]
+
+        print(
+            tabulate(
+                [
+                    [r["org"], r["name"], "❌ " + r["error"] if r["error"] else "✅"]
+                    for r in results
+                ],
+                headers=["Organization", "MDR", "Result"],
+                tablefmt="simple",
+            )
+        )
+
+        failures = [r for r in results if r["error"]]
+        if failures:
+            raise Exception(f"CBC DEPLOYMENT FAILED FOR {len(failures)} MDR")
+
 
 def declare():
     return CarbonBlackCloudDeploy()
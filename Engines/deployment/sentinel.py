@@ -15,10 +15,14 @@ from Engines.modules.sentinel import (
     create_query,
     iso_duration_timedelta,
 )
-from Engines.modules.framework import get_vocab_entry, techniques_resolver
+from Engines.modules.framework import (
+    get_vocab_entry,
+    techniques_resolver,
+    tactics_resolver,
+)
 from Engines.modules.deployment import fetch_config_envvar, Proxy
 from Engines.modules.logs import log
-from Engines.modules.tide import DataTide
+from Engines.modules.tide import DataTide, IndexTide
 from Engines.modules.plugins import DeployMDR
 
 from azure.mgmt.securityinsight import SecurityInsights
@@ -68,7 +72,7 @@ class SentinelDeploy(DeployMDR):
         else:
             status_parameters = {}
 
-        default_config = pd.json_normalize(self.DEFAULT_CONFIG, sep=".").to_dict(
+        default_config = pd.json_normalize(dict(self.DEFAULT_CONFIG), sep=".").to_dict(
             orient="records"
         )[0]
         mdr_config = pd.json_normalize(mdr_sentinel_raw, sep=".").to_dict(
@@ -214,14 +218,11 @@ class SentinelDeploy(DeployMDR):
         # Auto-enrich with techniques resolver
         techniques = techniques_resolver(data["uuid"])
         if techniques:
-            tactics = list()
-            for t in techniques:
-                # Sentinel backend expects PascalCase
-                vocab_tactics = [
-                    t.title().replace(" ", "").strip()
-                    for t in get_vocab_entry("att&ck", t, "tide.vocab.stages")
-                ]
-                tactics.extend(vocab_tactics)
+            # Sentinel backend expects PascalCase
+            tactics = [
+                t.title().replace(" ", "").strip()
+                for t in tactics_resolver(data["uuid"])
+            ]
 
             # Sentinel does not currently support sub-techniques for mapping
             techniques = [t.split(".")[0] for t in techniques]
@@ -287,7 +288,7 @@ class SentinelDeploy(DeployMDR):
         )
 
         for mdr in deployment:
-            mdr_data = DataTide.Models.mdr[mdr]
+            mdr_data = IndexTide.model("mdr", mdr)
 
             # Check if modified MDR contains a platform entry (by safety, but should not happen since
             # the orchestrator will filter for the platform)
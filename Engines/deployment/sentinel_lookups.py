@@ -1,22 +1,76 @@
 import os
 import git
+import csv
 import pandas as pd
 import time
 import sys
 import uuid
+import random
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
 
 start_time = time.time()
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.logs import log
+from Engines.modules.logs import log, in_log_context
 from Engines.modules.deployment import fetch_config_envvar, Proxy
 from Engines.modules.sentinel import connect_to_sentinel
 from Engines.modules.tide import DataTide
 from Engines.modules.plugins import DeployLookups
 
 from azure.mgmt.securityinsight import SecurityInsights
+from azure.core.exceptions import ResourceNotFoundError
+
+# Base delay in seconds between two attempts of a watchlist call, doubled at each retry
+RETRY_BACKOFF = 1
+# Delay in seconds between two checks of a watchlist deletion, and how long to wait for it
+DELETION_POLL = 2
+DELETION_TIMEOUT = 300
+
+
+def watchlist_row(item: dict, columns: list[str]) -> tuple[str, ...]:
+    """
+    Normalizes a watchlist item or lookup row into a hashable tuple of its
+    values, ordered as the lookup columns so both sides can be compared.
+    """
+    return tuple(
+        "" if pd.isna(value := item.get(column, "")) else str(value).strip()
+        for column in columns
+    )
+
+
+def csv_chunks(lookup_content: pd.DataFrame, size: int) -> Iterator[str]:
+    """
+    Serializes the lookup into CSV documents of at most `size` bytes, each
+    starting with the header row, so they can be uploaded separately. A
+    single row larger than the size is still yielded on its own.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def serialize(row) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    header = serialize(lookup_content.columns)
+    chunk = [header]
+    chunk_size = len(header.encode("utf-8"))
+    for row in lookup_content.itertuples(index=False, name=None):
+        line = serialize(row)
+        line_size = len(line.encode("utf-8"))
+        if len(chunk) > 1 and chunk_size + line_size > size:
+            yield "".join(chunk)
+            chunk = [header]
+            chunk_size = len(header.encode("utf-8"))
+        chunk.append(line)
+        chunk_size += line_size
+
+    if len(chunk) > 1:
+        yield "".join(chunk)
 
 
 class SentinelLookupsDeploy(DeployLookups):
@@ -42,6 +96,169 @@ class SentinelLookupsDeploy(DeployLookups):
         self.AZURE_SUBSCRIPTION_ID = SENTINEL_SETUP["azure_subscription_id"]
         self.AZURE_TENANT_ID = SENTINEL_SETUP["azure_tenant_id"]
 
+        SENTINEL_LOOKUPS = SENTINEL_CONFIG.lookups
+        self.WATCHLIST_WORKERS = int(SENTINEL_LOOKUPS.get("workers", 8))
+        self.WATCHLIST_RETRIES = int(SENTINEL_LOOKUPS.get("retries", 3))
+        self.REBUILD_THRESHOLD = float(SENTINEL_LOOKUPS.get("rebuild_threshold", 0.5))
+        self.BULK_UPLOAD = bool(SENTINEL_LOOKUPS.get("bulk_upload", True))
+        self.UPLOAD_SIZE = int(SENTINEL_LOOKUPS.get("upload_size", 3_800_000))
+
+    def retry(self, call: Callable, *args, **kwargs):
+        """
+        Runs a watchlist call, retrying it with an exponential backoff
+        when rejected, typically when throttled by the API.
+        """
+        for attempt in range(self.WATCHLIST_RETRIES + 1):
+            try:
+                return call(*args, **kwargs)
+            except Exception as error:
+                if attempt == self.WATCHLIST_RETRIES:
+                    raise
+                delay = RETRY_BACKOFF * 2**attempt + random.uniform(0, RETRY_BACKOFF)
+                log("WARNING", "Watchlist call failed, retrying", repr(error))
+                time.sleep(delay)
+
+    def delete_watchlist(self, client: SecurityInsights, watchlist_alias: str):
+        """
+        Deletes a watchlist and waits until it is removed, so a watchlist
+        with the same alias can be created right after. Only a not found
+        response confirms the deletion, other errors are retried.
+        """
+        self.retry(
+            client.watchlists.delete,
+            resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+            workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+            watchlist_alias=watchlist_alias,
+        )
+
+        def exists() -> bool:
+            try:
+                client.watchlists.get(
+                    resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                    workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                    watchlist_alias=watchlist_alias,
+                )
+                return True
+            except ResourceNotFoundError:
+                return False
+
+        deadline = time.monotonic() + DELETION_TIMEOUT
+        while self.retry(exists):
+            if time.monotonic() > deadline:
+                raise Exception(f"Watchlist {watchlist_alias} was not deleted in time")
+            time.sleep(DELETION_POLL)
+
+    def reconcile_items(
+        self, watchlist_items, lookup_content: pd.DataFrame
+    ) -> tuple[list[str], list[dict]]:
+        """
+        Compares the watchlist items to the lookup rows as sets of normalized
+        rows. Returns the identifiers of the items to delete, which includes
+        duplicated items, and the rows to create.
+        """
+        columns = [str(column) for column in lookup_content.columns]
+
+        existing = dict()
+        deletions = list()
+        for item in watchlist_items:
+            row = watchlist_row(item.items_key_value or {}, columns)
+            if row in existing:
+                deletions.append(item.watchlist_item_id)
+            else:
+                existing[row] = item.watchlist_item_id
+
+        lookup_rows = dict.fromkeys(
+            watchlist_row(dict(zip(columns, row)), columns)
+            for row in lookup_content.itertuples(index=False, name=None)
+        )
+
+        deletions.extend(
+            item_id for row, item_id in existing.items() if row not in lookup_rows
+        )
+        creations = [
+            dict(zip(columns, row)) for row in lookup_rows if row not in existing
+        ]
+
+        return deletions, creations
+
+    def write_items(
+        self,
+        client: SecurityInsights,
+        watchlist_alias: str,
+        deletions: list[str],
+        creations: list[dict],
+    ):
+        """
+        Applies the item changes to the watchlist with a bounded pool of
+        workers. Deletions are applied first, so the watchlist never holds
+        both the outdated and the updated version of a row.
+        """
+
+        def delete_item(item_id: str):
+            self.retry(
+                client.watchlist_items.delete,
+                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                watchlist_alias=watchlist_alias,
+                watchlist_item_id=item_id,
+            )
+
+        def create_item(items_key_value: dict):
+            item_model = client.watchlists.models.WatchlistItem()
+            item_model.items_key_value = items_key_value
+            self.retry(
+                client.watchlist_items.create_or_update,
+                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                watchlist_alias=watchlist_alias,
+                watchlist_item_id=str(uuid.uuid4()),
+                watchlist_item=item_model,
+            )
+
+        with ThreadPoolExecutor(max_workers=self.WATCHLIST_WORKERS) as pool:
+            list(pool.map(in_log_context(delete_item), deletions))
+            list(pool.map(in_log_context(create_item), creations))
+
+    def upload_watchlist(
+        self,
+        client: SecurityInsights,
+        watchlist_alias: str,
+        watchlist,
+        lookup_content: pd.DataFrame,
+    ):
+        """
+        Creates the watchlist with its items from the CSV content of the
+        lookup. Content larger than the upload size is split into chunks,
+        the first one creating the watchlist and the next ones adding their
+        items to it.
+        """
+        chunks = 0
+        for raw_content in csv_chunks(lookup_content, self.UPLOAD_SIZE):
+            watchlist.raw_content = raw_content
+            watchlist.number_of_lines_to_skip = 0
+            self.retry(
+                client.watchlists.create_or_update,
+                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                watchlist_alias=watchlist_alias,
+                watchlist=watchlist,
+            )
+            chunks += 1
+
+        # Empty lookups still get their watchlist created
+        if not chunks:
+            watchlist.raw_content = None
+            self.retry(
+                client.watchlists.create_or_update,
+                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                watchlist_alias=watchlist_alias,
+                watchlist=watchlist,
+            )
+
+        watchlist.raw_content = None
+        log("INFO", "Uploaded the lookup content", f"{chunks} chunks")
+
     def deploy_lookup(
         self, lookup_name: str, lookup_content: pd.DataFrame, client: SecurityInsights
     ):
@@ -64,7 +281,7 @@ class SentinelLookupsDeploy(DeployLookups):
         )
         watchlist.items_search_key = lookup_search_key or lookup_content.columns[0]
 
-        lookup_content.to_csv("test.csv", index=False)
+        watchlist_alias = lookup_watchlist_alias or lookup_name
 
         # Trigger deletion and recreation if alias or search key change
         existing_watchlist = client.watchlists.list(
@@ -72,86 +289,64 @@ class SentinelLookupsDeploy(DeployLookups):
             workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
         )
         delayed_deletion = False
+        watchlist_exists = False
         for existing in existing_watchlist:
             if existing.source == watchlist.source:
 
                 # If the search key changed, we need to delete synchronousely as it
                 # is an unmutable parameter.
                 if existing.items_search_key != watchlist.items_search_key:
-                    client.watchlists.delete(
-                        resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
-                        workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
-                        watchlist_alias=str(existing.watchlist_alias),
-                    )
-
-                    # Check that the watchlist is removed before moving on, else the creation
-                    # will be rejected if the alias stayed the same
-                    deleted = False
-                    while not deleted:
-                        try:
-                            client.watchlists.get(
-                                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
-                                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
-                                watchlist_alias=str(existing.watchlist_alias),
-                            )
-                        except:
-                            deleted = True
+                    self.delete_watchlist(client, str(existing.watchlist_alias))
 
                 # If the alias change, Sentinel will create a new watchlist. By safety,
                 # we can delete it async after the new watchlist is created to reduce the
                 # time where a watchlist is not available.
-                elif existing.watchlist_alias != watchlist.watchlist_alias:
+                elif existing.watchlist_alias != watchlist_alias:
                     delayed_deletion = existing.watchlist_alias
 
+                else:
+                    watchlist_exists = True
+
                 break
 
-        # Check if watchlist exists, else create
-        client.watchlists.create_or_update(
-            resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
-            workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
-            watchlist_alias=(lookup_watchlist_alias or lookup_name),
-            watchlist=watchlist,
-        )
+        # New watchlists are created with their content at once
+        if not watchlist_exists and self.BULK_UPLOAD:
+            log("ONGOING", "Creating the watchlist from the lookup content")
+            self.upload_watchlist(client, watchlist_alias, watchlist, lookup_content)
 
-        # Getting all current items
-        watchlist_items = client.watchlist_items.list(
-            resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
-            workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
-            watchlist_alias=(lookup_watchlist_alias or lookup_name),
-        )
+        else:
+            # Check if watchlist exists, else create
+            client.watchlists.create_or_update(
+                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                watchlist_alias=watchlist_alias,
+                watchlist=watchlist,
+            )
 
-        # Building Indexes
-        watchlist_content = []
-        watchlist_content_index = {}
-        for i in watchlist_items:
-            watchlist_content.append(i.items_key_value)
-            watchlist_content_index[i.watchlist_item_id] = i.items_key_value
-
-        csv_content = []
-        for index, row in lookup_content.iterrows():
-            csv_content.append(dict(row))
-
-        # If watchlist item not in lookup, we delete it
-        for watch_item_id in watchlist_content_index:
-            if watchlist_content_index[watch_item_id] not in csv_content:
-                client.watchlist_items.delete(
-                    resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
-                    workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
-                    watchlist_alias=(lookup_watchlist_alias or lookup_name),
-                    watchlist_item_id=watch_item_id,
-                )
-        # If lookup content not in lookup, we create it
-        for lookup_item in csv_content:
-            if lookup_item not in watchlist_content:
-                item_model = client.watchlists.models.WatchlistItem()
-                item_model.items_key_value = lookup_item
-                client.watchlist_items.create_or_update(
-                    resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
-                    workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
-                    watchlist_alias=(lookup_watchlist_alias or lookup_name),
-                    watchlist_item_id=str(uuid.uuid4()),
-                    watchlist_item=item_model,
-                )
+            # Getting all current items
+            watchlist_items = client.watchlist_items.list(
+                resource_group_name=self.AZURE_SENTINEL_RESOURCE_GROUP,
+                workspace_name=self.AZURE_SENTINEL_WORKSPACE_NAME,
+                watchlist_alias=watchlist_alias,
+            )
+
+            deletions, creations = self.reconcile_items(watchlist_items, lookup_content)
+            changes = len(deletions) + len(creations)
+            log(
+                "INFO",
+                f"{len(creations)} items to create, {len(deletions)} items to delete",
+                lookup_name,
+            )
+
+            # Past a certain amount of changes, rebuilding the watchlist from the
+            # lookup content is quicker than updating items one by one
+            rebuild = changes > self.REBUILD_THRESHOLD * max(len(lookup_content), 1)
+            if changes and rebuild and self.BULK_UPLOAD:
+                log("ONGOING", "Rebuilding the watchlist from the lookup content")
+                self.delete_watchlist(client, watchlist_alias)
+                self.upload_watchlist(client, watchlist_alias, watchlist, lookup_content)
+            elif changes:
+                self.write_items(client, watchlist_alias, deletions, creations)
 
         # Async deletion for watchlist alias change
         if delayed_deletion:
@@ -163,7 +358,17 @@ class SentinelLookupsDeploy(DeployLookups):
 
         return True
 
-    def deploy(self, deployment: list[str], DEBUG=False):
+    def deploy(
+        self,
+        deployment: list[str],
+        DEBUG=False,
+        client: SecurityInsights | None = None,
+    ):
+        """
+        Deploys the lookups as watchlists. `client` replaces the connection to
+        Sentinel, and allows running the deployment against a local fake
+        of the SecurityInsights client.
+        """
         log("ONGOING", "Sentinel Watchlist Deployer")
         log(
             "INFO",
@@ -174,7 +379,7 @@ class SentinelLookupsDeploy(DeployLookups):
         if DEBUG:
             deployment = ["TIDE_LD_999_Debug.csv"]
 
-        client = connect_to_sentinel(
+        client = client or connect_to_sentinel(
             self.AZURE_CLIENT_ID,
             self.AZURE_CLIENT_SECRET,
             self.AZURE_TENANT_ID,
@@ -186,7 +391,10 @@ class SentinelLookupsDeploy(DeployLookups):
             if lookup.endswith(".csv"):
                 lookup.removesuffix(".csv")
 
-            lookup_content = pd.read_csv(StringIO(self.LOOKUPS_INDEX[lookup]))
+            # Read as text, so values compare with watchlist items as written
+            lookup_content = pd.read_csv(
+                StringIO(self.LOOKUPS_INDEX[lookup]), dtype=str, keep_default_na=False
+            )
             lookup_name = "".join(c for c in lookup if (c.isalnum() or c in [" ", "_"]))
 
             if lookup not in self.LOOKUPS_INDEX:
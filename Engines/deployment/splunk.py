@@ -2,9 +2,14 @@ import os
 import git
 import sys
 import json
-from typing import Literal
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Callable
 
 import pandas as pd
+from splunklib import client
+from tabulate import tabulate
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
@@ -13,7 +18,9 @@ from Engines.modules.splunk import (
     cron_to_timeframe,
     create_query,
     splunk_timerange,
-    correct_timerange_mode
+    correct_timerange_mode,
+    same_frequency,
+    normalize_attribute,
 )
 from Engines.modules.framework import (
     get_value_metaschema,
@@ -21,11 +28,17 @@ from Engines.modules.framework import (
     get_vocab_entry,
 )
 from Engines.modules.deployment import fetch_config_envvar, Proxy
-from Engines.modules.logs import log
-from Engines.modules.tide import DataTide
+from Engines.modules.logs import log, in_log_context
+from Engines.modules.tide import DataTide, IndexTide
 
 from Engines.modules.plugins import DeployMDR
 
+# Saved searches listed per request when planning a bulk deployment
+SAVED_SEARCHES_PAGESIZE = 500
+
+# Deployment plan actions, in the order they are summarized
+PLAN_SYMBOLS = {"create": "+", "update": "~", "delete": "-", "unchanged": "="}
+
 
 class SplunkDeploy(DeployMDR):
 
@@ -55,6 +68,11 @@ class SplunkDeploy(DeployMDR):
         self.SPLUNK_PORT = SPLUNK_SETUP["port"]
         self.SPLUNK_APP = SPLUNK_SETUP["app"]
         self.SPLUNK_TOKEN = SPLUNK_SECRETS["token"]
+        self.SPLUNK_SCHEME = SPLUNK_SETUP.get("scheme") or "https"
+
+        # Bulk deployment lists saved searches once, then deploys with a pool of workers
+        self.BULK_DEPLOYMENT = SPLUNK_SETUP.get("bulk_deployment", False)
+        self.DEPLOYMENT_WORKERS = int(SPLUNK_SETUP.get("deployment_workers") or 4)
 
         if SPLUNK_SETUP["proxy"]:
             Proxy.set_proxy()
@@ -102,7 +120,8 @@ class SplunkDeploy(DeployMDR):
         uuid = mdr["uuid"]
         name = mdr["name"]
         description = mdr["description"]
-        mdr_splunk = mdr["configurations"]["splunk"]
+        # Copied as the configuration gets reshaped for Splunk below
+        mdr_splunk = IndexTide.writable(mdr["configurations"]["splunk"])
         advanced_config = mdr_splunk.pop(
             "advanced", None
         )  # Remove advanced config and keep it separate
@@ -246,9 +265,11 @@ class SplunkDeploy(DeployMDR):
         config["description"] = description
         return config
 
-    def deploy_mdr(self, mdr, service):
+    def compile_deployment(self, mdr) -> tuple[dict, dict]:
         """
-        Deployment routine, connecting to the platform and combining base and custom configurations
+        Combines base and custom configurations into the attributes written
+        to the saved search. Returns the attributes to deploy first, and
+        the ones depending on them which must be deployed after.
         """
 
         # Generate saved search configuration
@@ -264,7 +285,7 @@ class SplunkDeploy(DeployMDR):
         status_allowed_actions = self.SPLUNK_ACTIONS
 
         # Add status specific parameters
-        status_modifiers = self.STATUS_MODIFIERS.get(status) or {}
+        status_modifiers = IndexTide.writable(self.STATUS_MODIFIERS.get(status) or {})
 
         if status_modifiers:
             if "allowed_actions" in status_modifiers:
@@ -371,6 +392,88 @@ class SplunkDeploy(DeployMDR):
             if attribute in deploy_config:
                 second_stage[attribute] = deploy_config.pop(attribute)
 
+        return deploy_config, second_stage
+
+    def generated_frequency(self, mdr) -> str | None:
+        """
+        Returns the frequency of the MDR if its cron schedule is generated at
+        deployment time with a minute and hour that change between runs.
+        """
+        mdr_splunk = mdr["configurations"]["splunk"]
+        scheduling = mdr_splunk.get("scheduling") or {}
+        advanced = mdr_splunk.get("advanced") or {}
+
+        if (
+            self.TIMERANGE_MODE == "custom"
+            or scheduling.get("cron")
+            or scheduling.get("custom_time")
+            or "cron_schedule" in advanced
+        ):
+            return None
+
+        return scheduling.get("frequency")
+
+    def diff_deployment(self, mdr, entry: dict, current: dict) -> list[str]:
+        """
+        Compares the compiled configuration to the current attributes of the
+        saved search, and returns the attributes which would change.
+
+        Cron schedules generated from a frequency are considered unchanged as
+        long as the current one runs at the same frequency, and the current
+        schedule is kept so updates don't move the saved search around.
+        """
+        frequency = self.generated_frequency(mdr)
+        current_cron = current.get("cron_schedule")
+        if frequency and current_cron and same_frequency(current_cron, frequency):
+            for stage in [entry["config"], entry["second_stage"]]:
+                if "cron_schedule" in stage:
+                    stage["cron_schedule"] = current_cron
+
+        return [
+            attribute
+            for stage in [entry["config"], entry["second_stage"]]
+            for attribute, value in stage.items()
+            if normalize_attribute(attribute, value)
+            != normalize_attribute(attribute, current.get(attribute))
+        ]
+
+    def plan_summary(self, plan: list[dict]):
+        """
+        Prints the actions taken by the deployment, grouped by action.
+        """
+        counts = {
+            action: len([e for e in plan if e["action"] == action])
+            for action in PLAN_SYMBOLS
+        }
+        log(
+            "INFO",
+            "Splunk deployment plan",
+            f"{counts['create']} to create, {counts['update']} to update, "
+            f"{counts['unchanged']} unchanged, {counts['delete']} to delete",
+        )
+        for action, symbol in PLAN_SYMBOLS.items():
+            for entry in plan:
+                if entry["action"] == action and action != "unchanged":
+                    changes = entry.get("changes")
+                    detail = f" ({', '.join(changes)})" if changes else ""
+                    print(f"  {symbol} {entry['name']}{detail}")
+
+    def deploy_mdr(self, mdr, service) -> dict:
+        """
+        Deployment routine, connecting to the platform and combining base and custom configurations
+        """
+
+        name: str = mdr["name"].strip()
+        mdr_splunk: dict = mdr["configurations"]["splunk"]
+        query = create_query(mdr)
+        deploy_config, second_stage = self.compile_deployment(mdr)
+        entry = {
+            "name": name,
+            "action": "update",
+            "config": deploy_config,
+            "second_stage": second_stage,
+        }
+
         if not self.DEBUG:
             # Check if saved search already exists or create a new one
             search_exists = False
@@ -378,23 +481,33 @@ class SplunkDeploy(DeployMDR):
                 selected_search = service.saved_searches[name]
                 search_exists = True
             except:
-                selected_search = service.saved_searches.create(name, search=query)
-
-            if search_exists:
-                log("INFO", "✨ Found existing saved search")
-            else:
-                log("ONGOING", "🆕 Creating a new search...")
+                selected_search = None
 
             if mdr_splunk["status"] == "REMOVED":
                 if search_exists:
                     service.saved_searches.delete(name)
                     log("WARNING", f"🗑️ Deleted splunk alert: {name}")
-                    return None
-
+                    entry["action"] = "delete"
                 else:
                     log(
                         "SKIP", f"🗑️ [INFO] Saved search {name} was already non existent"
                     )
+                    entry["action"] = "absent"
+                return entry
+
+            if search_exists:
+                log("INFO", "✨ Found existing saved search")
+                entry["changes"] = self.diff_deployment(
+                    mdr, entry, selected_search.content
+                )
+                if not entry["changes"]:
+                    log("SKIP", "Saved search is already up to date", name)
+                    entry["action"] = "unchanged"
+                    return entry
+            else:
+                log("ONGOING", "🆕 Creating a new search...")
+                selected_search = service.saved_searches.create(name, search=query)
+                entry["action"] = "create"
 
             # Debugging output; sets attribute one by one
             if self.DEBUG_STEP:
@@ -415,7 +528,153 @@ class SplunkDeploy(DeployMDR):
                     selected_search.update(**second_stage)
         log("SUCCESS", "Deployed on Splunk", name)
 
-        return True
+        return entry
+
+    def connect(self, keepalive: bool = False) -> client.Service:
+        return connect_splunk(
+            host=self.SPLUNK_URL,
+            port=self.SPLUNK_PORT,
+            token=self.SPLUNK_TOKEN,
+            app=self.SPLUNK_APP,
+            scheme=self.SPLUNK_SCHEME,
+            keepalive=keepalive,
+        )
+
+    def plan_deployment(self, deployment: list[str], existing: dict) -> list[dict]:
+        """
+        Computes the action to take for each MDR against the saved searches
+        existing in the app : create, update, delete, or nothing when the
+        saved search is already up to date.
+        """
+        plan = list()
+
+        for mdr in deployment:
+            mdr_data = IndexTide.model("mdr", mdr)
+
+            if self.DEPLOYER_IDENTIFIER not in mdr_data["configurations"].keys():
+                log(
+                    "SKIP",
+                    f"🛑 Skipping {mdr_data.get('name')} as does not contain a Splunk rule",
+                )
+                continue
+
+            name: str = mdr_data["name"].strip()
+            entry = {"uuid": mdr, "name": name, "action": None}
+
+            if mdr_data["configurations"]["splunk"]["status"] == "REMOVED":
+                if name not in existing:
+                    log("SKIP", f"🗑️ Saved search {name} was already non existent")
+                    continue
+                entry["action"] = "delete"
+            else:
+                entry["action"] = "update" if name in existing else "create"
+                entry["query"] = create_query(mdr_data)
+                entry["config"], entry["second_stage"] = self.compile_deployment(
+                    mdr_data
+                )
+                if name in existing:
+                    entry["changes"] = self.diff_deployment(
+                        mdr_data, entry, existing[name].content
+                    )
+                    if not entry["changes"]:
+                        entry["action"] = "unchanged"
+
+            plan.append(entry)
+
+        return plan
+
+    def apply_deployment(self, entry: dict, service: client.Service, existing: dict):
+        name = entry["name"]
+
+        if entry["action"] == "delete":
+            service.saved_searches.delete(name)
+            return
+
+        if entry["action"] == "create":
+            selected_search = service.saved_searches.create(name, search=entry["query"])
+        else:
+            # Bound to the worker connection, without fetching the search again
+            selected_search = client.SavedSearch(service, existing[name].path)
+
+        selected_search.update(**entry["config"])
+        # Rolling out attributes with dependencies that will block the deployment if out of order.
+        if entry["second_stage"]:
+            selected_search.update(**entry["second_stage"])
+
+    def bulk_deploy(
+        self,
+        deployment: list[str],
+        connect: Callable[[], client.Service] | None = None,
+    ) -> list[dict]:
+        """
+        Deploys all MDRs at once. Saved searches of the app are listed in a
+        single pass to plan the actions, which are then run by a bounded
+        pool of workers. Each worker holds its own connection, kept alive
+        across the MDRs it deploys.
+
+        Failures are reported per MDR without interrupting the rest of the
+        deployment, and fail the deployment once it completed. `connect`
+        returns a connected service, and allows targeting another splunkd,
+        such as a local mock of the REST API.
+        """
+        connect = connect or (lambda: self.connect(keepalive=True))
+
+        service = connect()
+        existing = {
+            search.name: search
+            for search in service.saved_searches.iter(pagesize=SAVED_SEARCHES_PAGESIZE)
+        }
+        log("INFO", "Found existing saved searches in the app", str(len(existing)))
+
+        plan = self.plan_deployment(deployment, existing)
+        self.plan_summary(plan)
+        changes = [entry for entry in plan if entry["action"] != "unchanged"]
+
+        workers = threading.local()
+
+        def deploy_entry(entry: dict) -> dict:
+            if not hasattr(workers, "service"):
+                workers.service = connect()
+            start = time.perf_counter()
+            try:
+                self.apply_deployment(entry, workers.service, existing)
+                entry["error"] = None
+            except Exception as error:
+                entry["error"] = repr(error)
+            entry["seconds"] = time.perf_counter() - start
+            return entry
+
+        log(
+            "ONGOING",
+            f"Deploying {len(changes)} saved searches with a pool of workers",
+            str(self.DEPLOYMENT_WORKERS),
+        )
+        with ThreadPoolExecutor(max_workers=self.DEPLOYMENT_WORKERS) as pool:
+            results = list(pool.map(in_log_context(deploy_entry), changes))
+
+        report = [
+            [
+                entry["name"],
+                entry["action"],
+                "%.2f" % entry["seconds"],
+                "❌ " + entry["error"] if entry["error"] else "✅",
+            ]
+            for entry in results
+        ]
+        print(
+            tabulate(
+                report, headers=["MDR", "Action", "Seconds", "Result"], tablefmt="simple"
+            )
+        )
+
+        failures = [entry for entry in results if entry["error"]]
+        if failures:
+            for entry in failures:
+                log("FAILURE", f"Could not {entry['action']} {entry['name']}", entry["error"])
+            raise Exception(f"SPLUNK DEPLOYMENT FAILED FOR {len(failures)} MDR")
+
+        log("SUCCESS", "Deployed on Splunk", f"{len(results)} saved searches")
+        return results
 
     def deploy(self, deployment: list[str]):
 
@@ -424,31 +683,34 @@ class SplunkDeploy(DeployMDR):
         if not deployment:
             raise Exception("DEPLOYMENT NOT FOUND")
 
+        if self.BULK_DEPLOYMENT and not self.DEBUG:
+            self.bulk_deploy(deployment)
+            return
+
         if not self.DEBUG:
-            service = connect_splunk(
-                host=self.SPLUNK_URL,
-                port=self.SPLUNK_PORT,
-                token=self.SPLUNK_TOKEN,
-                app=self.SPLUNK_APP,
-            )
+            service = self.connect()
         else:
             service = "DEBUG"
 
         # Start deployment routine
+        plan = list()
         for mdr in deployment:
-            mdr_data = DataTide.Models.mdr[mdr]
+            mdr_data = IndexTide.model("mdr", mdr)
 
             # Check if modified MDR contains a platform entry (by safety, but should not happen since
             # the orchestrator will filter for the platform)
             if self.DEPLOYER_IDENTIFIER in mdr_data["configurations"].keys():
                 # Connection routine, if not connected yet.
                 log("ONGOING", f"🔥 Currently deploying MDR {mdr_data['name']}...")
-                self.deploy_mdr(mdr_data, service)
+                plan.append(self.deploy_mdr(mdr_data, service))
             else:
                 log(
                     "SKIP",
                     f"🛑 Skipping {mdr_data.get('name')} as does not contain a Splunk rule",
                 )
 
+        if not self.DEBUG:
+            self.plan_summary(plan)
+
 def declare():
     return SplunkDeploy()
\ No newline at end of file
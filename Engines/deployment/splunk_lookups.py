@@ -1,10 +1,7 @@
 import os
 import git
 import yaml
-import pandas as pd
-import json
 from splunklib import client
-from io import StringIO
 import time
 import sys
 
@@ -12,7 +9,12 @@ start_time = time.time()
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.splunk import connect_splunk
+from Engines.modules.splunk import (
+    connect_splunk,
+    lookup_records,
+    upload_lookup,
+    LOOKUP_CHUNK_SIZE,
+)
 from Engines.modules.logs import log
 from Engines.modules.deployment import fetch_config_envvar, Proxy
 from Engines.modules.tide import DataTide
@@ -36,29 +38,22 @@ class SplunkLookupsDeploy(DeployLookups):
         self.SPLUNK_PORT = SPLUNK_SETUP["port"]
         self.SPLUNK_APP = SPLUNK_SETUP["app"]
         self.SPLUNK_TOKEN = SPLUNK_SECRETS["token"]
+        self.LOOKUP_CHUNK_SIZE = int(
+            SPLUNK_CONFIG.lookups.get("chunk_size") or LOOKUP_CHUNK_SIZE
+        )
 
-    def deploy_lookup(
-        self, lookup_name: str, lookup_df: pd.DataFrame, service: client.Service
-    ):
-
-        log("DEBUG", "Compiling dataframe to a json-like data structure")
-        lookup_records = lookup_df.to_dict("records")
-
-        content = {"body": lookup_records}
-
-        log("DEBUG", "Double json dumping strategy to safely escape all quotes")
-        raw = json.dumps(json.dumps(content, default=str)).lstrip('"').rstrip('"')
-        query = f"""| makeresults
-        | eval _raw="{raw}"
-        | spath path=body{{}} output=temp 
-        | mvexpand temp 
-        | spath input=temp 
-        | fields - _raw _time temp
-        | outputlookup {lookup_name}
+    def deploy_lookup(self, lookup_name: str, lookup_content: str, service: client.Service):
+        """
+        Overrides the lookup with the content, streamed to Splunk in chunks
+        so large lookups stay within the search length limits.
         """
-
         log("ONGOING", "Overriding existing lookup from splunk", lookup_name)
-        service.jobs.oneshot(query)
+        upload_lookup(
+            service,
+            lookup_name,
+            lookup_records(lookup_content),
+            chunk_size=self.LOOKUP_CHUNK_SIZE,
+        )
 
         return True
 
@@ -82,9 +77,8 @@ class SplunkLookupsDeploy(DeployLookups):
                 log("FAILURE", f"Could not find lookup namein current index", lookup)
                 raise (Exception)
 
-            lookup_df = pd.read_csv(StringIO(self.LOOKUPS_INDEX[lookup]))
             log("INFO", "Lookup deployment started", lookup)
-            self.deploy_lookup(lookup, lookup_df, service)
+            self.deploy_lookup(lookup, self.LOOKUPS_INDEX[lookup], service)
             log("SUCCESS", "Lookup deployment successful", lookup)
 
 
@@ -1,7 +1,6 @@
 import os
 import git
 from pathlib import Path
-import json
 import time
 import sys
 
@@ -9,10 +8,16 @@ start_time = time.time()
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.splunk import connect_splunk
+from Engines.modules.splunk import (
+    connect_splunk,
+    lookup_upload_query,
+    record_chunks,
+    upload_lookup,
+    LOOKUP_CHUNK_SIZE,
+)
 from Engines.modules.framework import techniques_resolver
 from Engines.modules.deployment import fetch_config_envvar, Proxy
-from Engines.modules.tide import DataTide
+from Engines.modules.tide import DataTide, IndexTide
 from Engines.modules.plugins import DeployMetadata
 from Engines.modules.logs import log
 
@@ -37,6 +42,9 @@ class SplunkMetadataDeploy(DeployMetadata):
         self.SPLUNK_PORT = SPLUNK_SETUP["port"]
         self.SPLUNK_APP = SPLUNK_SETUP["app"]
         self.SPLUNK_TOKEN = SECRETS["token"]
+        self.LOOKUP_CHUNK_SIZE = int(
+            SPLUNK_CONFIG.lookups.get("chunk_size") or LOOKUP_CHUNK_SIZE
+        )
 
         if SPLUNK_SETUP["proxy"]:
             Proxy.set_proxy()
@@ -69,7 +77,7 @@ class SplunkMetadataDeploy(DeployMetadata):
         for mdr in deployment:
             entry = dict()
             # Could load from index, but this is fast enough for lookup update purposes
-            body = DataTide.Models.mdr[mdr]
+            body = IndexTide.model("mdr", mdr)
             log("ONGOING", "Generating Lookup entry", body["name"])
 
             techniques = techniques_resolver(body.get("uuid"))
@@ -104,23 +112,17 @@ class SplunkMetadataDeploy(DeployMetadata):
             mdr_to_update.append(entry)
 
 
-        # Splunk magic to build SPL that will update the query
-        content = {"body": mdr_to_update}
-        raw = json.dumps(json.dumps(content, default=str)).lstrip('"').rstrip('"')
-        query = f"""| makeresults
-        | eval _raw="{raw}"
-        | spath path=body{{}} output=temp 
-        | mvexpand temp 
-        | spath input=temp 
-        | fields - _raw _time temp
-        | inputlookup append=true {lookup_name}
-        | stats first(*) as * by MDR_UUID
-        | outputlookup {lookup_name}
-        """
-
         if self.DEBUG:
-            log("DEBUG", "Compiled lookup creation query")
-            print(query)
+            log("DEBUG", "Compiled lookup update queries")
+            for chunk in record_chunks(mdr_to_update, self.LOOKUP_CHUNK_SIZE):
+                print(
+                    lookup_upload_query(
+                        chunk,
+                        f"""| inputlookup append=true {lookup_name}
+        | stats first(*) as * by MDR_UUID
+        | outputlookup {lookup_name}""",
+                    )
+                )
 
         else:
             # Connect to splunk service
@@ -131,9 +133,15 @@ class SplunkMetadataDeploy(DeployMetadata):
                 app=self.SPLUNK_APP,
             )
 
-            # Deploy lookup in oneshot (executes immediately) job
+            # Entries are merged into the lookup by MDR UUID, chunk by chunk
             print("🥁 Exporting query to Splunk...")
-            service.jobs.oneshot(query)
+            upload_lookup(
+                service,
+                lookup_name,
+                mdr_to_update,
+                chunk_size=self.LOOKUP_CHUNK_SIZE,
+                key="MDR_UUID",
+            )
 
             time_to_execute = "%.2f" % (time.time() - start_time)
             print(f"\n⏱️ Exported lookup in {time_to_execute} seconds")
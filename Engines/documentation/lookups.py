@@ -1,14 +1,17 @@
 import pandas as pd
-import os
 import git
 from pathlib import Path
 import sys
-import shutil
 from io import StringIO
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.documentation import make_json_table
+from Engines.modules.documentation import (
+    make_json_table,
+    render_documents,
+    fingerprint,
+    toolchain_signature,
+)
 from Engines.modules.documentation_components import tlp_doc
 from Engines.modules.logs import log
 from Engines.modules.files import safe_file_name
@@ -94,12 +97,13 @@ def run():
     log("TITLE", "Lookups Documentation")
     log("INFO", "Create the documentation for lookups")
 
-    # Remove everything in  Doc Folder
-    if os.path.exists(LOOKUP_DOCS_FOLDER):
-        shutil.rmtree(LOOKUP_DOCS_FOLDER)
-    LOOKUP_DOCS_FOLDER.mkdir(parents=True)
+    # Pages are written with whitespace replaced in their whole path for Gitlab
+    lookup_docs_folder = LOOKUP_DOCS_FOLDER
+    if GLFM:
+        lookup_docs_folder = Path(str(LOOKUP_DOCS_FOLDER).replace(" ", "-"))
 
     log("INFO", "Systems supporting lookups enabled on this instance", ", ".join(ENABLED_LOOKUPS_SYSTEMS))
+    pages = list()
     for system_lookups in LOOKUPS_INDEX:
 
         log("INFO", "Now processing for lookups to document for", system_lookups)
@@ -107,7 +111,6 @@ def run():
             log("ONGOING", f"Generating lookup documentation for", lookup)
             lookup_file = LOOKUPS_INDEX[system_lookups][lookup]
             lookup_metadata = LOOKUPS_METADATA_INDEX.get(lookup) or None
-            doc = lookup_documentation(lookup_file, lookup_metadata, system_lookups)
 
             if lookup_metadata:
                 output_name = lookup_metadata["name"] + ".md"
@@ -118,16 +121,21 @@ def run():
                 LOOKUP_DOCS_FOLDER / system_lookups / safe_file_name(output_name)
             )
 
-            if not os.path.exists(LOOKUP_DOCS_FOLDER / system_lookups):
-                os.mkdir(LOOKUP_DOCS_FOLDER / system_lookups)
-
             if GLFM:
                 output_path = Path(str(output_path).replace(" ", "-"))
 
-            with open(output_path, "w+", encoding="utf-8") as output:
-                output.write(doc)
+            arguments = (lookup_file, lookup_metadata, system_lookups)
+            pages.append(
+                (
+                    output_path,
+                    lookup_documentation,
+                    arguments,
+                    fingerprint(toolchain_signature(), arguments),
+                )
+            )
 
-            log("SUCCESS", "Generated lookup documentation for all lookup files")
+    render_documents(pages, lookup_docs_folder)
+    log("SUCCESS", "Generated lookup documentation for all lookup files")
 
 
 if __name__ == "__main__":
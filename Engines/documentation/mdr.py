@@ -1,9 +1,7 @@
 import pandas as pd
-import os
 import git
 from pathlib import Path
 import sys
-import shutil
 import time
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
@@ -19,9 +17,11 @@ from Engines.modules.documentation import (
     rich_attack_links,
     get_vocab_description,
     model_value_doc,
+    render_documents,
+    model_fingerprint,
     FOLD,
 )
-from Engines.modules.files import safe_file_name
+from Engines.modules.files import safe_file_name, resolve_root
 from Engines.templates.mdr import TEMPLATEv3
 from Engines.modules.documentation_components import (
     tlp_doc,
@@ -32,7 +32,7 @@ from Engines.modules.tide import DataTide
 from Engines.modules.logs import log
 from Engines.modules.deployment import enabled_systems
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 DOCUMENTATION_TYPE = DataTide.Configurations.Documentation.documentation_type
 DEFAULT_RESPONDERS = DataTide.Configurations.Deployment.default_responders
@@ -285,13 +285,13 @@ def run():
     log("TITLE", "MDR Documentation")
     log("INFO", "Generates markdown documentation for Managed Detection Rules v3.")
 
-    # Remove all previous docs
-    if os.path.exists(MDR_WIKI_PATH):
-        shutil.rmtree(MDR_WIKI_PATH)
-    MDR_WIKI_PATH.mkdir(parents=True)
+    # Pages are written with whitespace replaced in their whole path for Gitlab
+    mdr_wiki_path = MDR_WIKI_PATH
+    if DOCUMENTATION_TYPE == "GLFM":
+        mdr_wiki_path = Path(str(MDR_WIKI_PATH).replace(" ", "-"))
 
-    # Initialize a counter of created documents
-    mdr_doc_count = 0
+    # Pages are collected first, then rendered together
+    pages = list()
 
     for mdr_uuid in MODELS_INDEX["mdr"]:
         if get_type(mdr_uuid, get_version=True) == "mdrv3":
@@ -304,15 +304,15 @@ def run():
             doc_path = MDR_WIKI_PATH / doc_file_name
             print(f"{MDR_ICON} Generating documentation for {doc_name}...")
 
-            document = documentation(mdr_data)
-
             # Replace whitespace in file name as it becomes a path in the Gitlab Wiki
             if DOCUMENTATION_TYPE == "GLFM":
                 doc_path = Path(str(doc_path).replace(" ", "-"))
 
-            with open(doc_path, "w+", encoding="utf-8") as output:
-                output.write(document)
-                mdr_doc_count += 1
+            pages.append(
+                (doc_path, documentation, (mdr_data,), model_fingerprint(mdr_uuid))
+            )
+
+    render_documents(pages, mdr_wiki_path)
 
 
 if __name__ == "__main__":
@@ -14,8 +14,9 @@ sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 from Engines.modules.documentation import get_icon, name_subschema_doc
 from Engines.modules.logs import log
 from Engines.modules.tide import DataTide
+from Engines.modules.files import resolve_root
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 METASCHEMAS_INDEX = DataTide.TideSchemas.Index
 SUBSCHEMAS_INDEX = DataTide.TideSchemas.subschemas
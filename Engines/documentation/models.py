@@ -1,8 +1,6 @@
-import os
 import git
 from pathlib import Path
 import sys
-import shutil
 import time
 
 start_time = time.time()
@@ -20,6 +18,8 @@ from Engines.modules.documentation import (
     rich_attack_links,
     GitlabMarkdown,
     sanitize_hover,
+    render_documents,
+    model_fingerprint,
     FOLD,
 )
 from Engines.modules.documentation_components import (
@@ -32,14 +32,14 @@ from Engines.modules.documentation_components import (
     cve_doc,
     model_data_table,
 )
-from Engines.modules.files import safe_file_name
+from Engines.modules.files import safe_file_name, resolve_root
 from Engines.modules.graphs import relationships_graph, chaining_graph
 from Engines.modules.tide import DataTide
 from Engines.modules.logs import log
 from Engines.modules.deployment import Proxy
 from Engines.templates.models import MODEL_DOC_TEMPLATE
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 MODELS_DOCS_PATH = Path(DataTide.Configurations.Global.Paths.Core.models_docs_folder)
 MODELS_SCOPE = DataTide.Configurations.Documentation.scope.copy()
 GLFM = DataTide.Configurations.Documentation.glfm_doc_target
@@ -195,15 +195,13 @@ def run():
         if DOCUMENTATION_TYPE == "GLFM":
             doc_type_path = Path(str(doc_type_path).replace(" ", "-"))
 
-        # Remove everything in the doc folder for the model
-        if os.path.exists(doc_type_path):
-            shutil.rmtree(doc_type_path)
         log(
             "INFO",
-            "📁 Creating documentation folder : {}... ".format(str(doc_type_path)),
+            "📁 Building documentation folder : {}... ".format(str(doc_type_path)),
         )
-        doc_type_path.mkdir(parents=True)
 
+        # Pages are collected first, then rendered together
+        pages = list()
         for model in MODELS_INDEX[model_type]:
 
             # Make a file name based on  data
@@ -221,11 +219,11 @@ def run():
                 doc_path = Path(str(doc_path).replace(" ", "-"))
 
             log("ONGOING", "Generating documentation", doc_file_name)
-            document = documentation(model_data)
+            pages.append(
+                (doc_path, documentation, (model_data,), model_fingerprint(model))
+            )
 
-            with open(doc_path, "w+", encoding="utf-8") as output:
-                output.write(document)
-                doc_count += 1
+        doc_count += render_documents(pages, doc_type_path)
 
     if DOCUMENTATION_TYPE == "MARKDOWN":
         doc_format_log = "✒️ standard markdown"
@@ -1,7 +1,5 @@
 import pandas as pd
-import os
 import git
-import shutil
 import time
 import sys
 from pathlib import Path
@@ -11,12 +9,19 @@ start_time = time.time()
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.documentation import get_icon, make_json_table
+from Engines.modules.documentation import (
+    get_icon,
+    make_json_table,
+    render_documents,
+    fingerprint,
+    toolchain_signature,
+)
 from Engines.modules.tide import DataTide
 from Engines.modules.logs import log
 from Engines.templates.models import VOCABS_DOC_TEMPLATE
+from Engines.modules.files import resolve_root
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 GLFM = DataTide.Configurations.Documentation.glfm_doc_target
 VOCAB_INDEX = DataTide.Vocabularies.Index
@@ -127,16 +132,24 @@ def make_vocab_doc(vocab_field, vocabulary):
     return documentation, name
 
 
+def vocab_documentation(vocab_field: str) -> str:
+    # Receives the vocabulary name rather than its data, so large vocabularies
+    # are not copied over to rendering workers
+    documentation, _ = make_vocab_doc(vocab_field, VOCAB_INDEX[vocab_field])
+    return documentation
+
+
 def run():
 
     log("TITLE", "Vocabulary Documentation")
     log("INFO", "Generates documentation for vocabulary files in the Tide Instance")
 
-    # Remove output folder if previously created
-    if os.path.exists(VOCAB_DOCS_PATH):
-        shutil.rmtree(VOCAB_DOCS_PATH)
-    VOCAB_DOCS_PATH.mkdir(parents=True)
+    # Pages are written with whitespace replaced in their whole path for Gitlab
+    vocab_docs_path = VOCAB_DOCS_PATH
+    if DOCUMENTATION_TYPE == "GLFM":
+        vocab_docs_path = Path(str(VOCAB_DOCS_PATH).replace(" ", "-"))
 
+    pages = list()
     for voc in VOCAB_INDEX:
 
         if voc in SKIP_VOCABS:
@@ -147,7 +160,7 @@ def run():
             if not VOCAB_INDEX[voc]["entries"]:
                 log("SKIP", "The vocabulary is empty, will not document", voc)
             else:
-                documentation, name = make_vocab_doc(voc, VOCAB_INDEX[voc])
+                name = VOCAB_INDEX[voc]["metadata"]["name"]
 
                 output_name = icon + " " + name + ".md"
                 output_path = VOCAB_DOCS_PATH / output_name
@@ -155,8 +168,16 @@ def run():
                 if DOCUMENTATION_TYPE == "GLFM":
                     output_path = Path(str(output_path).replace(" ", "-"))
 
-                with open(output_path, "w+", encoding="utf-8") as output:
-                    output.write(documentation)
+                pages.append(
+                    (
+                        output_path,
+                        vocab_documentation,
+                        (voc,),
+                        fingerprint(toolchain_signature(), VOCAB_INDEX[voc]),
+                    )
+                )
+
+    render_documents(pages, vocab_docs_path)
 
     doc_format_log = str()
     if GLFM:
@@ -5,15 +5,16 @@ import git
 import sys
 import re
 
+sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
+from Engines.modules.tide import DataTide
+from Engines.modules.files import load_yaml
+
 ra_vocab = []
-CONFIG = yaml.safe_load(open("../../Resources/config.yaml", encoding="utf-8"))
+CONFIG = load_yaml("../../Resources/config.yaml")
 actions_vocab = "RE&CT Response Actions.yaml"
 lib_folder = Path(CONFIG["paths"]["core"]["vocabularies"])
 out_file = lib_folder / actions_vocab
 
-sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
-from Engines.modules.tide import DataTide
-
 RESOURCES = Path(DataTide.Configurations.Global.Paths.Index["resources"])
 ATC_REACT = RESOURCES / "atc-react"
 
@@ -70,7 +71,7 @@ def normalize_react_title(
 
 
 for ra in os.listdir(ATC_REACT):
-    ra_body = yaml.safe_load(open(ATC_REACT / ra))
+    ra_body = load_yaml(ATC_REACT / ra)
     ra_entry = {}
     ra_entry["id"] = ra_body["id"]
     ra_entry["name"] = normalize_react_title(ra_body["title"])
@@ -88,7 +89,7 @@ for ra in os.listdir(ATC_REACT):
         ra_vocab.append(ra_entry)
 
 
-out_file_body = yaml.safe_load(open(out_file))
+out_file_body = load_yaml(out_file)
 out_file_body["keys"] = ra_vocab
 output = open(out_file, "w")
 yaml.dump(out_file_body, output, sort_keys=False, Dumper=IndentFullDumper)
@@ -7,6 +7,7 @@ from pathlib import Path
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 from Engines.modules.tide import DataTide
+from Engines.modules.files import load_yaml
 
 ATTACK_PATH = Path(DataTide.Configurations.Global.Paths.Index["att&ck"])
 ATTACK_RESOURCES = DataTide.Configurations.Resources.attack
@@ -51,7 +52,7 @@ def gen_techniques_vocab(attack_table, out_file, prefix=None):
             for tac in p["tide.vocab.stages"].split(", ")
         ]
 
-    out_file_body = yaml.safe_load(open(out_file, encoding="utf-8"))
+    out_file_body = load_yaml(out_file)
     out_file_body["keys"].extend(keys)
 
     output = open(out_file, "w", encoding="utf-8")
@@ -90,7 +91,7 @@ def gen_datasources_vocab(attack_table, out_file):
                     item["name"] = suffix
                     item["link"] = internal["link"]
 
-    out_file_body = yaml.safe_load(open(out_file, encoding="utf-8"))
+    out_file_body = load_yaml(out_file)
     out_file_body["keys"].extend(keys)
 
     output = open(out_file, "w", encoding="utf-8")
@@ -120,7 +121,7 @@ def gen_mitigations_vocab(attack_table, out_file, prefix=None):
     for p in keys:
         p["name"] = prefix + p["name"]
 
-    out_file_body = yaml.safe_load(open(out_file, encoding="utf-8"))
+    out_file_body = load_yaml(out_file)
     out_file_body["keys"].extend(keys)
 
     output = open(out_file, "w", encoding="utf-8")
@@ -151,7 +152,7 @@ def gen_group_vocab(attack_table: pd.DataFrame, prefix=""):
 
 enterprise_groups = pd.read_excel(enterprise, sheet_name="groups")
 data = gen_group_vocab(enterprise_groups)
-vocab_data = yaml.safe_load(open(groups_vocab, encoding="utf-8"))
+vocab_data = load_yaml(groups_vocab)
 vocab_data["keys"] = data
 with open(groups_vocab, "w", encoding="utf-8") as vocab:
     yaml.dump(
@@ -159,7 +160,7 @@ with open(groups_vocab, "w", encoding="utf-8") as vocab:
     )
 
 # Resets techniques table
-out_file_body = yaml.safe_load(open(vocab_folder / techniques_vocab, encoding="utf-8"))
+out_file_body = load_yaml(vocab_folder / techniques_vocab)
 out_file_body["keys"].clear()
 output = open(vocab_folder / techniques_vocab, "w", encoding="utf-8")
 yaml.dump(
@@ -178,7 +179,7 @@ gen_techniques_vocab(
 
 
 # Resets datasources
-out_file_body = yaml.safe_load(open(vocab_folder / datasources_vocab))
+out_file_body = load_yaml(vocab_folder / datasources_vocab)
 out_file_body["keys"].clear()
 output = open(vocab_folder / datasources_vocab, "w", encoding="utf-8")
 yaml.dump(
@@ -192,7 +193,7 @@ gen_datasources_vocab(enterprise, os.path.join(vocab_folder, datasources_vocab))
 
 
 # Resets Mitigations
-out_file_body = yaml.safe_load(open(vocab_folder / mitigations_vocab, encoding="utf-8"))
+out_file_body = load_yaml(vocab_folder / mitigations_vocab)
 out_file_body["keys"].clear()
 output = open(vocab_folder / mitigations_vocab, "w", encoding="utf-8")
 yaml.dump(
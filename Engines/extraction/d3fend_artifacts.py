@@ -7,6 +7,7 @@ from pathlib import Path
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 from Engines.modules.tide import DataTide
+from Engines.modules.files import load_yaml
 
 
 RESOURCES = Path(DataTide.Configurations.Global.Paths.Core.resources)
@@ -83,7 +84,7 @@ for i in D3FEND_ONTOLOGY["@graph"]:
                     entry["link"] = DAOLINK + entry["id"]
                     voc_artifacts.append(entry)
 
-vocab_file = yaml.safe_load(open(VOCABS_PATH / OUT_NAME, encoding="utf-8"))
+vocab_file = load_yaml(VOCABS_PATH / OUT_NAME)
 
 with open(VOCABS_PATH / OUT_NAME, "w+", encoding="utf-8") as out:
     vocab_file["keys"].clear()
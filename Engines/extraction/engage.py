@@ -7,6 +7,7 @@ from pathlib import Path
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 from Engines.modules.tide import DataTide
+from Engines.modules.files import load_yaml
 
 RESOURCE_PATH = Path(DataTide.Configurations.Global.Paths.Core.resources)
 ENGAGE_DATA = DataTide.Configurations.Resources.engage["matrix"]
@@ -34,7 +35,7 @@ for k in keys:
     k.pop("short description")
     k.pop("long description")
 
-out_file_body = yaml.safe_load(open(out_file))
+out_file_body = load_yaml(out_file)
 out_file_body["keys"] = keys
 
 output = open(out_file, "w")
@@ -8,6 +8,7 @@ import unicodedata
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 from Engines.modules.tide import DataTide
+from Engines.modules.files import load_yaml
 
 RESOURCES = DataTide.Configurations.Global.Paths.Core.resources
 NIST_DATA = DataTide.Configurations.Resources.nist["data"]
@@ -37,7 +38,7 @@ for k in keys:
     out.append(buf)
 
 
-out_file_body = yaml.safe_load(open(VOCABS_PATH / nist_vocab, encoding="utf-8"))
+out_file_body = load_yaml(VOCABS_PATH / nist_vocab)
 out_file_body["keys"] = out
 
 output = open(VOCABS_PATH / nist_vocab, "w", encoding="utf-8")
@@ -1,4 +1,3 @@
-import yaml
 import os
 import git
 import json
@@ -9,11 +8,11 @@ from typing import Literal, Tuple
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.framework import get_vocab_entry, get_type
+from Engines.modules.framework import get_vocab_entry, get_type, legacy_aliases
 from Engines.modules.documentation import get_icon
 from Engines.modules.logs import log
 from Engines.modules.tide import DataTide
-from Engines.modules.files import resolve_paths
+from Engines.modules.files import resolve_paths, load_yaml
 
 
 GLOBAL_CONFIG = DataTide.Configurations.Global
@@ -345,6 +344,21 @@ def gen_lib_schema(
                                 value,
                             )
 
+    # Legacy identifiers remain valid values, flagged as deprecated so
+    # editors point to the entry replacing them
+    if not scoped:
+        for alias, identifier in legacy_aliases(vocab).items():
+            if identifier in enum and alias not in enum:
+                deprecation = f"Legacy identifier, replaced by {identifier}"
+                buffer = {"const": alias}
+                if mode != "const":
+                    buffer["description"] = deprecation
+                    buffer["markdownDescription"] = f"⚠️ **{deprecation}**"
+                    buffer["deprecationMessage"] = deprecation
+                array.append(buffer)
+                enum.append(alias)
+                enum_description.append(f"⚠️ **{deprecation}**")
+
     if mode in ["anyOf", "const"]:
         return array
 
@@ -407,7 +421,7 @@ def recomposition_handler(entry_point):
             recomp_source = data["tide"]["subschema"] + ".yaml"
 
             recomp_source_path = SUBSCHEMAS_PATH / subschema_folder / recomp_source
-            recomp_data = yaml.safe_load(open(recomp_source_path, encoding="utf-8"))
+            recomp_data = load_yaml(recomp_source_path)
 
             recomposition[recomp_identifier].update(recomp_data)
 
@@ -417,7 +431,7 @@ def recomposition_handler(entry_point):
 def definition_handler(entry_point):
     DEFINITION_FOLDER = Path(PATHS["definitions"])
     definition_file = DEFINITION_FOLDER / (entry_point + ".meta.yaml")
-    definition = yaml.safe_load(open(definition_file, encoding="utf-8"))
+    definition = load_yaml(definition_file)
 
     return definition
 
@@ -571,7 +585,7 @@ def run():
 
             yaml_input = METASCHEMAS_FOLDER / GLOBAL_CONFIG.metaschemas[meta]
             json_output = JSON_SCHEMA_FOLDER / GLOBAL_CONFIG.json_schemas[meta]
-            parsing = yaml.safe_load(open(yaml_input, encoding="utf-8"))
+            parsing = load_yaml(yaml_input)
             log("ONGOING", "Generating json schema for : " + str(yaml_input))
             # Generate coretide fields
             generated = gen_json_schema(parsing)
@@ -0,0 +1,125 @@
+import os
+import git
+import sys
+import time
+import yaml
+from tabulate import tabulate
+
+sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
+
+from Engines.indexing.indexer import indexer
+from Engines.modules.files import resolve_paths, YamlLoader
+from Engines.modules.logs import log
+
+VOCABULARIES_PATH = resolve_paths()["vocabularies"]
+
+# Amount of times each configuration is measured, the best run is kept
+# to reduce the noise of shared CI runners
+REPETITIONS = int(os.getenv("BENCHMARK_REPETITIONS") or 3)
+
+
+def worker_counts() -> list[int]:
+    """
+    Powers of two up to the amount of cores available, always including
+    the total core count so the upper bound is measured.
+    """
+    cores = os.cpu_count() or 1
+    counts = []
+    count = 1
+    while count < cores:
+        counts.append(count)
+        count *= 2
+    counts.append(cores)
+    return counts
+
+
+def measure(function, *args, **kwargs) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def indexing_scaling():
+    log("TITLE", "Indexer Scaling Benchmark")
+    log(
+        "INFO",
+        "Measures indexing wall time against the amount of parsing workers",
+        f"Best of {REPETITIONS} runs",
+    )
+
+    results = [["Workers", "Seconds", "Speedup", "Identical to serial"]]
+    baseline_time = None
+    baseline_index = None
+
+    for workers in worker_counts():
+        elapsed, index = measure(indexer, workers=workers)
+        if baseline_time is None:
+            baseline_time, baseline_index = elapsed, index
+        results.append(
+            [
+                workers,
+                "%.3f" % elapsed,
+                "%.2fx" % (baseline_time / elapsed),
+                index == baseline_index,
+            ]
+        )
+
+    print(tabulate(results, headers="firstrow"))
+
+
+def parse_with(loader, contents: list[str]) -> list:
+    return [yaml.load(content, Loader=loader) for content in contents]
+
+
+def yaml_throughput():
+    log("TITLE", "YAML Parsing Throughput Benchmark")
+    log(
+        "INFO",
+        "Compares the pure Python loader against the one used by the toolchain "
+        f"({YamlLoader.__name__}) over the Framework vocabularies",
+        f"Best of {REPETITIONS} runs",
+    )
+
+    vocabularies = sorted(VOCABULARIES_PATH.glob("*.yaml"))
+    corpora = {
+        "ATT&CK": [v for v in vocabularies if v.name.startswith("ATT&CK")],
+        "All Vocabularies": vocabularies,
+    }
+
+    results = [["Corpus", "Loader", "MB", "Seconds", "MB/s", "Speedup", "Identical"]]
+    for corpus, files in corpora.items():
+        contents = [f.read_text(encoding="utf-8") for f in files]
+        size = sum(len(c.encode("utf-8")) for c in contents) / 1_000_000
+
+        baseline_time, baseline_data = measure(parse_with, yaml.SafeLoader, contents)
+        for loader in [yaml.SafeLoader, YamlLoader]:
+            if loader is yaml.SafeLoader:
+                elapsed, data = baseline_time, baseline_data
+            else:
+                elapsed, data = measure(parse_with, loader, contents)
+            results.append(
+                [
+                    corpus,
+                    loader.__name__,
+                    "%.2f" % size,
+                    "%.3f" % elapsed,
+                    "%.2f" % (size / elapsed),
+                    "%.2fx" % (baseline_time / elapsed),
+                    data == baseline_data,
+                ]
+            )
+
+    print(tabulate(results, headers="firstrow"))
+
+
+def run():
+    yaml_throughput()
+    indexing_scaling()
+
+
+if __name__ == "__main__":
+    run()
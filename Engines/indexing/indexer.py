@@ -1,7 +1,11 @@
 import os
 import git
-import yaml
 import json
+import base64
+import hashlib
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 import toml
@@ -10,66 +14,270 @@ from pprint import pprint
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.files import resolve_paths, resolve_configurations
+from Engines.modules.files import resolve_paths, resolve_configurations, load_yaml
 from Engines.modules.logs import log
+from Engines.indexing.snapshot import IndexSnapshot, write_snapshot
 from Engines.templates.tide_indexes import fetch_tide_index_template
 
 
-def indexer(write_index=False) -> dict:
-    SKIPS = ["logsources", "ram", "mdrv2", "lookup_metadata"]
-    RESOLVED_CONFIGURATIONS = resolve_configurations()
+def resolve_workers(workers: int | None, config: dict) -> int:
+    """
+    Returns the amount of processes to use when parsing files. Explicit
+    arguments take precedence over the `INDEX_WORKERS` environment variable,
+    which itself takes precedence over the `indexing.workers` configuration.
 
-    TIDE_CONFIG = RESOLVED_CONFIGURATIONS["global"]
+    A value of 0 uses all the cores available on the machine.
+    """
+    if workers is None:
+        workers = os.getenv("INDEX_WORKERS") or config.get("indexing", {}).get(
+            "workers", 1
+        )
+    workers = int(workers)  # type: ignore
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    return max(workers, 1)
+
+
+def parse_files(file_paths: list[Path], workers: int = 1) -> list:
+    """
+    Parses a list of YAML files and returns their content in the same order.
+
+    When more than one worker is requested, parsing is spread over a process pool.
+    The ordering guarantee means the resulting index is identical to a serial run.
+    Pools rely on the fork start method so execution contexts without a
+    `__main__` guard, like the Orchestration scripts, are not re-executed in
+    the workers. Platforms without fork fall back to serial parsing.
+    """
+    if workers <= 1 or len(file_paths) < 2:
+        return [load_yaml(path) for path in file_paths]
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        log("SKIP", "Parallel indexing requires the fork start method, parsing serially")
+        return [load_yaml(path) for path in file_paths]
+
+    # Large enough chunks to amortize inter-process communication, small enough
+    # that a few heavy files (such as ATT&CK vocabularies) don't starve the pool
+    chunksize = max(1, len(file_paths) // (workers * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork")
+    ) as pool:
+        return list(pool.map(load_yaml, file_paths, chunksize=chunksize))
+
+
+def encode_cached(data):
+    """
+    Converts a parsed YAML body into plain JSON data. Values JSON can't hold,
+    which safe-loaded YAML may still produce, such as dates or non string
+    keys, are tagged so `decode_cached()` restores them unchanged.
+    """
+    if isinstance(data, dict):
+        if all(type(key) is str for key in data) and "__tide__" not in data:
+            return {key: encode_cached(value) for key, value in data.items()}
+        return {
+            "__tide__": "dict",
+            "value": [[encode_cached(k), encode_cached(v)] for k, v in data.items()],
+        }
+    if isinstance(data, (list, tuple)):
+        return [encode_cached(value) for value in data]
+    if isinstance(data, datetime.datetime):
+        return {"__tide__": "datetime", "value": data.isoformat()}
+    if isinstance(data, datetime.date):
+        return {"__tide__": "date", "value": data.isoformat()}
+    if isinstance(data, bytes):
+        return {"__tide__": "bytes", "value": base64.b64encode(data).decode()}
+    if isinstance(data, set):
+        return {"__tide__": "set", "value": [encode_cached(v) for v in data]}
+    return data
+
+
+def decode_cached(data: dict):
+    """
+    JSON object hook reversing `encode_cached()`
+    """
+    match data.get("__tide__"):
+        case "dict":
+            return {key: value for key, value in data["value"]}
+        case "datetime":
+            return datetime.datetime.fromisoformat(data["value"])
+        case "date":
+            return datetime.date.fromisoformat(data["value"])
+        case "bytes":
+            return base64.b64decode(data["value"])
+        case "set":
+            return set(data["value"])
+    return data
+
+
+class IndexCache:
+    """
+    Persistent cache of the files parsed by the indexer.
+
+    Every entry records the modification time, size and content hash of a
+    source file alongside its parsed body. On the next run, files whose
+    signature did not change are served from the cache and only added or
+    modified files are parsed again. When the cache is saved, entries of
+    files which were not seen in a folder parsed during the run, as they were
+    deleted, are pruned. Entries of folders which were not parsed, as their
+    section was not indexed, are kept for later runs.
+
+    The cache is stored as JSON, as it may be shared between jobs through a
+    CI cache: reading it back never executes code, unlike a pickle.
+    """
+
+    VERSION = 2
+
+    def __init__(self, cache_path: Path):
+        self.path = Path(cache_path)
+        self.entries: dict[str, tuple[int, int, str, object]] = dict()
+        self.seen: set[str] = set()
+        self.reused = 0
+        self.changed = False
+        self.parsed = 0
+
+        if self.path.is_file():
+            try:
+                with open(self.path, encoding="utf-8") as cache_file:
+                    cached = json.load(cache_file, object_hook=decode_cached)
+                if cached.get("version") == self.VERSION:
+                    self.entries = {
+                        key: tuple(entry) for key, entry in cached["files"].items()
+                    }
+                else:
+                    log("SKIP", "Index cache was built by another version, rebuilding it")
+            except Exception as error:
+                log("WARNING", "Could not read the index cache, rebuilding it", repr(error))
+
+    @staticmethod
+    def default_path(paths: dict) -> Path:
+        """
+        Location of the cache, from the `INDEX_CACHE_PATH` environment
+        variable or the `paths.core.index_cache` configuration.
+        """
+        return Path(os.getenv("INDEX_CACHE_PATH") or paths["index_cache"])
+
+    @staticmethod
+    def enabled(config: dict) -> bool:
+        """
+        Whether the cache should be used, from the `INDEX_CACHE` environment
+        variable or the `indexing.cache` configuration.
+        """
+        if (env := os.getenv("INDEX_CACHE")) is not None:
+            return env.lower() in ["1", "true"]
+        return bool(config.get("indexing", {}).get("cache", False))
+
+    def parse(self, file_paths: list[Path], workers: int = 1) -> list:
+        """
+        Drop-in replacement of `parse_files()` which only parses files
+        that changed since the cache was last saved.
+        """
+        bodies: list = [None] * len(file_paths)
+        stale = list()
+
+        for position, file_path in enumerate(file_paths):
+            key = str(file_path)
+            self.seen.add(key)
+            stat = os.stat(file_path)
+            entry = self.entries.get(key)
+
+            if entry and (entry[0], entry[1]) == (stat.st_mtime_ns, stat.st_size):
+                bodies[position] = entry[3]
+                self.reused += 1
+                continue
+
+            # Timestamps change on checkout or when a file is touched, the hash
+            # confirms whether the content actually needs to be parsed again.
+            digest = hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+            if entry and entry[2] == digest:
+                self.entries[key] = (stat.st_mtime_ns, stat.st_size, digest, entry[3])
+                self.changed = True
+                bodies[position] = entry[3]
+                self.reused += 1
+                continue
+
+            stale.append((position, key, stat.st_mtime_ns, stat.st_size, digest))
+
+        parsed_bodies = parse_files([file_paths[s[0]] for s in stale], workers)
+        for (position, key, mtime, size, digest), body in zip(stale, parsed_bodies):
+            self.entries[key] = (mtime, size, digest, body)
+            bodies[position] = body
+        self.parsed += len(stale)
+        self.changed = self.changed or bool(stale)
+
+        return bodies
+
+    def save(self):
+        folders = {os.path.dirname(key) for key in self.seen}
+        removed = [
+            key
+            for key in self.entries
+            if key not in self.seen
+            and (os.path.dirname(key) in folders or not os.path.exists(key))
+        ]
+        for key in removed:
+            del self.entries[key]
+
+        if not (self.changed or removed):
+            log("INFO", "Index cache up to date", f"{self.reused} reused")
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside then swapped, so a job interrupted mid-write
+        # can't leave a truncated cache behind
+        temporary_path = self.path.with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {"version": self.VERSION, "files": encode_cached(self.entries)},
+                cache_file,
+            )
+        os.replace(temporary_path, self.path)
+        self.changed = False
 
-    DATA_FIELD = TIDE_CONFIG["data_fields"]
+        log(
+            "INFO",
+            "Updated index cache",
+            f"{self.reused} reused, {self.parsed} parsed, {len(removed)} removed",
+        )
 
-    RAW_TIDE_PATHS = TIDE_CONFIG["paths"]["tide"]
-    RAW_CORE_PATHS = TIDE_CONFIG["paths"]["core"]
-    RAW_PATHS = RAW_CORE_PATHS | RAW_TIDE_PATHS
 
-    TIDE_PATHS, CORE_PATHS = resolve_paths(separate=True)
-    PATHS = TIDE_PATHS | CORE_PATHS
-
-    log("DEBUG", "Loaded all paths")
-    VOCABULARIES_PATH = PATHS["vocabularies"]
-    METASCHEMA_PATH = PATHS["metaschemas"]
-    METASCHEMAS = TIDE_CONFIG["metaschemas"]
-    JSONSCHEMAS_PATH = PATHS["json_schemas"]
-    JSONSCHEMAS = TIDE_CONFIG["json_schemas"]
-    SUBSCHEMAS_PATH = PATHS["subschemas"]
-    DEFINITIONS_PATH = PATHS["definitions"]
-    RECOMPOSITION = TIDE_CONFIG["recomposition"]
-    TEMPLATES_PATH = PATHS["templates"]
-    TEMPLATES = TIDE_CONFIG["templates"]
-    LOOKUPS_PATH = PATHS["lookups"]
-    TIDE_INDEXES_PATH = PATHS["tide_indexes"]
-    OUTPUT_PATH = PATHS["index_output"]
-    # Controls whether the index should keep in memory or export to a file
-    # In-memory is helpful when index is used to accelerate functions, like
-    # for example to enrich deployment tags.
+# Sections of the index, in the order they are built and exported
+INDEX_SECTIONS = [
+    "paths",
+    "configurations",
+    "vocabs",
+    "json_schemas",
+    "metaschemas",
+    "definitions",
+    "templates",
+    "subschemas",
+    "models",
+    "files",
+    "lookups",
+]
+
+
+def index_paths(tide_config: dict, tide_paths: dict, core_paths: dict) -> dict:
+    RAW_TIDE_PATHS = tide_config["paths"]["tide"]
+    RAW_CORE_PATHS = tide_config["paths"]["core"]
+    RAW_PATHS = RAW_CORE_PATHS | RAW_TIDE_PATHS
 
-    index = dict()
-    obj_counter = 0
+    log("INFO", "Resolving and indexing", "paths")
+    paths_index = dict()
+    paths_index.update(tide_paths | core_paths)
+    paths_index["tide"] = tide_paths
+    paths_index["core"] = core_paths
+    paths_index["raw"] = RAW_PATHS
+    paths_index["raw"]["tide"] = RAW_TIDE_PATHS
+    paths_index["raw"]["core"] = RAW_CORE_PATHS
 
-    log("TITLE", "Tide Indexer")
-    log("INFO", "Seeks all Tide related data and stores it for direct access")
-    # Vocab Indexer
+    return paths_index
 
-    log("INFO", "Resolving and indexing", "paths")
-    index["paths"] = dict()
-    index["paths"].update(PATHS)
-    index["paths"]["tide"] = TIDE_PATHS
-    index["paths"]["core"] = CORE_PATHS
-    index["paths"]["raw"] = RAW_PATHS
-    index["paths"]["raw"]["tide"] = RAW_TIDE_PATHS
-    index["paths"]["raw"]["core"] = RAW_CORE_PATHS
-
-    log("INFO", "Resolving and index", "configurations")
-    # Config Indexer
-    # Configurations resolve by merging the default Core configs
-    # with custom ones defined in the user space
 
-    index["configurations"] = RESOLVED_CONFIGURATIONS
+def index_vocabularies(paths: dict, parse=parse_files, workers: int = 1) -> dict:
+    VOCABULARIES_PATH = paths["vocabularies"]
+    TIDE_INDEXES_PATH = paths["tide_indexes"]
 
     print("📒 Indexing Vocabularies...")
 
@@ -77,10 +285,9 @@ def indexer(write_index=False) -> dict:
     # indexed from different locations
 
     voc_index = dict()
-    for voc_file in os.listdir(VOCABULARIES_PATH):
-        obj_counter += 1
-
-        voc_body = yaml.safe_load(open(VOCABULARIES_PATH / voc_file, encoding="utf-8"))
+    voc_files = os.listdir(VOCABULARIES_PATH)
+    voc_bodies = parse([VOCABULARIES_PATH / f for f in voc_files], workers)
+    for voc_file, voc_body in zip(voc_files, voc_bodies):
 
         if not voc_body:
             log("WARNING", "Could not find data in vocabulary/index", voc_file)
@@ -102,9 +309,38 @@ def indexer(write_index=False) -> dict:
 
             voc_index[voc_body["field"]] = voc_entry
 
-    index["vocabs"] = voc_index
+    # Tide Indexes retrieval (injected into )
+    log("INFO", "Retrieving all Tide Indexes built on the Tide Instance",
+        "Injected onto vocabulary index to be retrieved in generation jobs")
+    
+    if not os.path.exists(TIDE_INDEXES_PATH/"models.json"):
+        log("SKIP", "Not able to find a models.json index in Tide instance",
+            "Should be generated in the next Framework generation pipeline run")
+    else:
+        tide_model_index = json.load(open(TIDE_INDEXES_PATH/"models.json", encoding="utf-8"))
+
+        if tide_model_index:
+            if ("cdm" in tide_model_index) and ("bdr" in tide_model_index):
+                log("INFO", "Appending BDR to CDM in Model index as options")
+                tide_model_index["cdm"]["entries"].update(tide_model_index["bdr"]["entries"])
+            voc_index.update(tide_model_index)
+
+    if not os.path.exists(TIDE_INDEXES_PATH/"reports.json"):
+        log("SKIP", "Not able to find a reports.json index in Tide instance",
+            "Should be generated in the next Framework generation pipeline run")
+    else:
+        tide_reports_index = json.load(open(TIDE_INDEXES_PATH/"reports.json", encoding="utf-8"))
+
+        if tide_reports_index:
+            voc_index.update(tide_reports_index)
+
+    return voc_index
+
+
+def index_json_schemas(tide_config: dict, paths: dict) -> dict:
+    JSONSCHEMAS_PATH = paths["json_schemas"]
+    JSONSCHEMAS = tide_config["json_schemas"]
 
-    # JSON Schemas Indexer
     print("🛠️ Indexing JSON Schemas...")
 
     json_index = dict()
@@ -116,39 +352,46 @@ def indexer(write_index=False) -> dict:
         ):  # In case we are generating the json for the first time
             json_schema_body = json.load(open(json_schema_path, encoding="utf-8"))
             json_index[meta_name] = json_schema_body
-            obj_counter += 1
 
-    index["json_schemas"] = json_index
+    return json_index
+
+
+def index_metaschemas(tide_config: dict, paths: dict) -> dict:
+    METASCHEMA_PATH = paths["metaschemas"]
+    METASCHEMAS = tide_config["metaschemas"]
 
-    # Metaschema Indexer
     print("🛠️ Indexing Metaschemas...")
 
     meta_index = dict()
 
     for meta_name in METASCHEMAS:
-        obj_counter += 1
-
-        meta_body = yaml.safe_load(
-            open(METASCHEMA_PATH / METASCHEMAS[meta_name], encoding="utf-8")
-        )
+        meta_body = load_yaml(METASCHEMA_PATH / METASCHEMAS[meta_name])
         meta_index[meta_name] = meta_body
 
-    index["metaschemas"] = meta_index
+    return meta_index
+
+
+def index_definitions(paths: dict) -> dict:
+    DEFINITIONS_PATH = paths["definitions"]
 
-    # Definitions Indexer
     print("🛠️ Indexing Definitions...")
 
     definition_index = dict()
 
     for definition in os.listdir(DEFINITIONS_PATH):
 
-        definition_body = yaml.safe_load(
-            open(DEFINITIONS_PATH / definition, encoding="utf-8")
-        )
+        definition_body = load_yaml(DEFINITIONS_PATH / definition)
         definition_name = definition.split(".")[0]
         definition_index[definition_name] = definition_body
 
-    index["definitions"] = definition_index
+    return definition_index
+
+
+def index_templates(configurations: dict, paths: dict) -> dict:
+    TEMPLATES_PATH = paths["templates"]
+    TEMPLATES = configurations["global"]["templates"]
+    RECOMPOSITION = configurations["global"]["recomposition"]
+    SUBSCHEMAS_PATH = paths["subschemas"]
 
     print("📐 Indexing Templates")
 
@@ -161,93 +404,94 @@ def indexer(write_index=False) -> dict:
         if os.path.isfile(template_path):
             template = open(template_path, encoding="utf-8").read()
             template_index[cat] = template
-            obj_counter += 1
 
-    # Template indexer and Subschema indexer (as dependent on recomposition)
     print("📐 Indexing Recomposition Templates")
-    print("🧩 Indexing Subschemas")
 
-    subschemas_index = dict()
     for recomp in RECOMPOSITION:
         template_index[recomp] = {}
-        subschemas_index[recomp] = {}
-        sub_folder = RECOMPOSITION[recomp]
-        subchemas_path = SUBSCHEMAS_PATH / sub_folder
-        sub_templates_path = SUBSCHEMAS_PATH / sub_folder / "Templates"
+        sub_templates_path = SUBSCHEMAS_PATH / RECOMPOSITION[recomp] / "Templates"
 
-        recomp_data = index["configurations"][recomp]
+        recomp_data = configurations[recomp]
 
         for data in recomp_data:
-            obj_counter += 1
             sub_name = recomp_data[data]["tide"]["name"]
-            subschema_name = recomp_data[data]["tide"]["subschema"]
-
-            sub_body = yaml.safe_load(
-                open(subchemas_path / (subschema_name + ".yaml"), encoding="utf-8")
-            )
-            subschemas_index[recomp][data] = sub_body
 
             template_body = open(
                 sub_templates_path / (sub_name + " Template.yaml"), encoding="utf-8"
             ).read()
             template_index[recomp][data] = template_body
 
-    index["templates"] = template_index
-    index["subschemas"] = subschemas_index
+    return template_index
 
-    # Models Indexer
+
+def index_subschemas(configurations: dict, paths: dict) -> dict:
+    RECOMPOSITION = configurations["global"]["recomposition"]
+    SUBSCHEMAS_PATH = paths["subschemas"]
+
+    # Subschemas are dependent on recomposition, like their templates
+    print("🧩 Indexing Subschemas")
+
+    subschemas_index = dict()
+    for recomp in RECOMPOSITION:
+        subschemas_index[recomp] = {}
+        subchemas_path = SUBSCHEMAS_PATH / RECOMPOSITION[recomp]
+
+        recomp_data = configurations[recomp]
+
+        for data in recomp_data:
+            subschema_name = recomp_data[data]["tide"]["subschema"]
+
+            sub_body = load_yaml(subchemas_path / (subschema_name + ".yaml"))
+            subschemas_index[recomp][data] = sub_body
+
+    return subschemas_index
+
+
+def index_models(
+    tide_config: dict, paths: dict, parse=parse_files, workers: int = 1
+) -> tuple[dict, dict]:
+    """
+    Returns the models index, alongside the index of the files they were
+    read from, so later changes to a file can be mapped back to its model.
+    """
+    SKIPS = ["logsources", "ram", "mdrv2", "lookup_metadata"]
+    METASCHEMAS = tide_config["metaschemas"]
 
     print("📊 Indexing Models...")
 
     models_index = dict()
 
+    # All model files are gathered first so they can be parsed in a single
+    # pass, which balances the load better across workers than per category
+    model_files: list[tuple[str, Path]] = list()
     for meta_name in METASCHEMAS:
         if meta_name not in SKIPS:
-            model_cat_index = dict()
-            for model in os.listdir(PATHS[meta_name]):
-                model_path = Path(PATHS[meta_name]) / model
+            models_index[meta_name] = dict()
+            for model in os.listdir(paths[meta_name]):
+                model_path = Path(paths[meta_name]) / model
                 if (not os.path.isdir(model_path)) and (str(model_path).endswith(".yaml")):
-                    obj_counter += 1
-
                     if "[DEBUG]" not in model:
-                        model_body = yaml.safe_load(open(model_path, encoding="utf-8"))
+                        model_files.append((meta_name, model_path))
 
-                        if "uuid" in model_body.keys():
-                            identifier = model_body["uuid"]
-                        else:
-                            identifier = model_body["id"]
+    model_bodies = parse([path for _, path in model_files], workers)
+    files_index = dict()
 
-                        model_cat_index[identifier] = model_body
-            models_index[meta_name] = model_cat_index
+    for (meta_name, model_path), model_body in zip(model_files, model_bodies):
+        identifier = model_identifier(model_body)
+        models_index[meta_name][identifier] = model_body
+        files_index[str(model_path.resolve())] = {"type": meta_name, "id": identifier}
 
-    index["models"] = models_index
+    return models_index, files_index
 
-    # Tide Indexes retrieval (injected into )
-    log("INFO", "Retrieving all Tide Indexes built on the Tide Instance",
-        "Injected onto vocabulary index to be retrieved in generation jobs")
-    
-    if not os.path.exists(TIDE_INDEXES_PATH/"models.json"):
-        log("SKIP", "Not able to find a models.json index in Tide instance",
-            "Should be generated in the next Framework generation pipeline run")
-    else:
-        tide_model_index = json.load(open(TIDE_INDEXES_PATH/"models.json", encoding="utf-8"))
 
-        if tide_model_index:
-            if ("cdm" in tide_model_index) and ("bdr" in tide_model_index):
-                log("INFO", "Appending BDR to CDM in Model index as options")
-                tide_model_index["cdm"]["entries"].update(tide_model_index["bdr"]["entries"])
-            index["vocabs"].update(tide_model_index)
+def model_identifier(model_body: dict) -> str:
+    if "uuid" in model_body.keys():
+        return model_body["uuid"]
+    return model_body["id"]
 
-    if not os.path.exists(TIDE_INDEXES_PATH/"reports.json"):
-        log("SKIP", "Not able to find a reports.json index in Tide instance",
-            "Should be generated in the next Framework generation pipeline run")
-    else:
-        tide_reports_index = json.load(open(TIDE_INDEXES_PATH/"reports.json", encoding="utf-8"))
 
-        if tide_reports_index:
-            index["vocabs"].update(tide_reports_index)
-    
-    # Lookups indexer
+def index_lookups(paths: dict) -> dict:
+    LOOKUPS_PATH = paths["lookups"]
 
     print("🔎 Indexing Lookups...")
 
@@ -266,17 +510,88 @@ def indexer(write_index=False) -> dict:
                 lookup_index["lookups"][system.lower().replace(" ", "_")][
                     lookup_name
                 ] = lookup_content
-                obj_counter += 1
 
             elif lookup.endswith(".metadata.yaml"):
                 metadata_name = lookup.replace(".metadata.yaml", "")
-                metadata_content = yaml.safe_load(
-                    open(LOOKUPS_PATH / system / lookup, encoding="utf-8")
-                )
+                metadata_content = load_yaml(LOOKUPS_PATH / system / lookup)
                 lookup_index["metadata"][metadata_name] = metadata_content
-                obj_counter += 1
 
-    index["lookups"] = lookup_index
+    return lookup_index
+
+
+def indexer(
+    write_index=False,
+    workers: int | None = None,
+    cache: bool | IndexCache | None = None,
+    sections: list[str] | None = None,
+) -> dict:
+    """
+    Builds the index of the Tide instance. `sections` restricts indexing to
+    a subset of `INDEX_SECTIONS`, so callers only needing part of the
+    instance, for example the models, don't pay for reading everything else.
+
+    `cache` may be an `IndexCache` already opened by the caller, which is
+    then in charge of saving it, so a process indexing several times only
+    reads and writes the cache once.
+    """
+    RESOLVED_CONFIGURATIONS = resolve_configurations()
+
+    TIDE_CONFIG = RESOLVED_CONFIGURATIONS["global"]
+    WORKERS = resolve_workers(workers, TIDE_CONFIG)
+    SECTIONS = [s for s in INDEX_SECTIONS if s in (sections or INDEX_SECTIONS)]
+
+    TIDE_PATHS, CORE_PATHS = resolve_paths(separate=True)
+    PATHS = TIDE_PATHS | CORE_PATHS
+
+    log("DEBUG", "Loaded all paths")
+    OUTPUT_PATH = PATHS["index_output"]
+    CACHE_PATH = IndexCache.default_path(PATHS)
+    SNAPSHOT_PATH = PATHS["index_snapshot"]
+    # Controls whether the index should keep in memory or export to a file
+    # In-memory is helpful when index is used to accelerate functions, like
+    # for example to enrich deployment tags.
+
+    index = dict()
+
+    log("TITLE", "Tide Indexer")
+    log("INFO", "Seeks all Tide related data and stores it for direct access")
+    if SECTIONS != INDEX_SECTIONS:
+        log("INFO", "Only indexing the requested sections", ", ".join(SECTIONS))
+    if WORKERS > 1:
+        log("INFO", "Parsing files in parallel with a process pool of", str(WORKERS))
+
+    index_cache = None
+    parse = parse_files
+    if isinstance(cache, IndexCache):
+        parse = cache.parse
+    elif cache if cache is not None else IndexCache.enabled(TIDE_CONFIG):
+        log("INFO", "Reusing unchanged files from the index cache", str(CACHE_PATH))
+        index_cache = IndexCache(CACHE_PATH)
+        parse = index_cache.parse
+
+    # Configurations resolve by merging the default Core configs
+    # with custom ones defined in the user space
+    SECTION_INDEXERS = {
+        "paths": lambda: index_paths(TIDE_CONFIG, TIDE_PATHS, CORE_PATHS),
+        "configurations": lambda: RESOLVED_CONFIGURATIONS,
+        "vocabs": lambda: index_vocabularies(PATHS, parse, WORKERS),
+        "json_schemas": lambda: index_json_schemas(TIDE_CONFIG, PATHS),
+        "metaschemas": lambda: index_metaschemas(TIDE_CONFIG, PATHS),
+        "definitions": lambda: index_definitions(PATHS),
+        "templates": lambda: index_templates(RESOLVED_CONFIGURATIONS, PATHS),
+        "subschemas": lambda: index_subschemas(RESOLVED_CONFIGURATIONS, PATHS),
+        "lookups": lambda: index_lookups(PATHS),
+    }
+
+    for section in SECTIONS:
+        if section in ["models", "files"]:
+            # Both are built in the same pass over model files
+            if "models" not in index:
+                index["models"], index["files"] = index_models(
+                    TIDE_CONFIG, PATHS, parse, WORKERS
+                )
+        else:
+            index[section] = SECTION_INDEXERS[section]()
 
     # Security Stack Mapping Indexer
 
@@ -343,11 +658,20 @@ def indexer(write_index=False) -> dict:
     #
     #
 
-    if write_index or os.getenv("WRITE_INDEX"):
+    if index_cache:
+        index_cache.save()
+
+    if (write_index or os.getenv("WRITE_INDEX")) and SECTIONS != INDEX_SECTIONS:
+        log("SKIP", "Partial indexes are not exported to the index file")
+    elif write_index or os.getenv("WRITE_INDEX"):
         print("📝 Exporting Index file to : {} ...".format(OUTPUT_PATH))
         with open(OUTPUT_PATH, "w+", encoding="utf-8") as index_file:
             json.dump(index, index_file, default=str)
 
+        if IndexSnapshot.enabled(TIDE_CONFIG):
+            print("📝 Exporting Index snapshot to : {} ...".format(SNAPSHOT_PATH))
+            write_snapshot(index, SNAPSHOT_PATH, OUTPUT_PATH)
+
     return index
 
 
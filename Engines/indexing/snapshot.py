@@ -0,0 +1,163 @@
+import os
+import git
+import sys
+import mmap
+import json
+import struct
+import hashlib
+from pathlib import Path
+
+sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
+
+from Engines.modules.logs import log
+
+# File layout : header, table of contents, then every encoded block back to back.
+# The header holds a magic string, the format version and the size of the
+# table of contents, which maps sections (and each model individually) to the
+# offset and length of their block, and records the index file it was built with.
+# Blocks are JSON encoded as the index file is, so decoding them never executes
+# code and yields the same data as reading the index file.
+MAGIC = b"TIDESNAP"
+VERSION = 2
+HEADER = struct.Struct("<8sHQ")
+
+# Sections stored as one block per model rather than one block for the section
+PER_MODEL_SECTIONS = ["models"]
+
+
+def encode(data) -> bytes:
+    return json.dumps(data, default=str).encode("utf-8")
+
+
+def file_digest(file_path: Path) -> str | None:
+    if not os.path.isfile(file_path):
+        return None
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as index_file:
+        while chunk := index_file.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_snapshot(index: dict, snapshot_path: Path, index_path: Path):
+    """
+    Exports the index as a binary snapshot, readable with `IndexSnapshot`.
+    The snapshot is bound to the index file written alongside it.
+    """
+    blocks = list()
+    offset = 0
+    toc = {"sections": {}, "models": {}, "index": file_digest(index_path)}
+
+    def add_block(data) -> tuple[int, int]:
+        nonlocal offset
+        block = encode(data)
+        blocks.append(block)
+        location = (offset, len(block))
+        offset += len(block)
+        return location
+
+    for section, content in index.items():
+        if section in PER_MODEL_SECTIONS:
+            toc["sections"][section] = None
+            for model_type, models in content.items():
+                toc["models"][model_type] = {
+                    identifier: add_block(body) for identifier, body in models.items()
+                }
+        else:
+            toc["sections"][section] = add_block(content)
+
+    encoded_toc = encode(toc)
+    snapshot_path = Path(snapshot_path)
+    temporary_path = snapshot_path.with_suffix(".tmp")
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, VERSION, len(encoded_toc)))
+        snapshot_file.write(encoded_toc)
+        for block in blocks:
+            snapshot_file.write(block)
+    os.replace(temporary_path, snapshot_path)
+
+
+class IndexSnapshot:
+    """
+    Read interface to an index snapshot. The file is memory-mapped, and only
+    the table of contents is decoded when opening it: sections and models
+    are decoded from the mapping as they are requested, so short jobs don't
+    pay for materializing the whole index.
+    """
+
+    def __init__(self, snapshot_path: Path):
+        self.path = Path(snapshot_path)
+        with open(self.path, "rb") as snapshot_file:
+            self.map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, toc_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"Unsupported index snapshot format : {self.path}")
+
+        toc_start = HEADER.size
+        self.toc = json.loads(self.map[toc_start : toc_start + toc_length])
+        self.data_start = toc_start + toc_length
+
+    @staticmethod
+    def enabled(config: dict) -> bool:
+        """
+        Whether exporting the index should also write a snapshot, from the
+        `INDEX_SNAPSHOT` environment variable or the `indexing.snapshot`
+        configuration.
+        """
+        if (env := os.getenv("INDEX_SNAPSHOT")) is not None:
+            return env.lower() in ["1", "true"]
+        return bool(config.get("indexing", {}).get("snapshot", False))
+
+    @staticmethod
+    def open(snapshot_path: Path, index_path: Path) -> "IndexSnapshot | None":
+        """
+        Returns the snapshot at the path, or None if there is none, it can't
+        be read, or it was not built with the current index file, for example
+        when the index was exported again with snapshots disabled.
+        """
+        if not os.path.isfile(snapshot_path):
+            return None
+        try:
+            snapshot = IndexSnapshot(snapshot_path)
+        except Exception as error:
+            log("WARNING", "Could not read the index snapshot", repr(error))
+            return None
+
+        if snapshot.toc.get("index") != file_digest(index_path):
+            log(
+                "SKIP",
+                "Index snapshot does not match the index file, ignoring it",
+                str(snapshot_path),
+            )
+            snapshot.map.close()
+            return None
+
+        return snapshot
+
+    def decode(self, location: tuple[int, int]):
+        offset, length = location
+        start = self.data_start + offset
+        return json.loads(self.map[start : start + length])
+
+    def sections(self) -> list[str]:
+        return list(self.toc["sections"])
+
+    def section(self, name: str):
+        if self.toc["sections"][name] is None:
+            return {
+                model_type: {
+                    identifier: self.decode(location)
+                    for identifier, location in models.items()
+                }
+                for model_type, models in self.toc["models"].items()
+            }
+        return self.decode(self.toc["sections"][name])
+
+    def model(self, model_type: str, identifier: str):
+        """
+        Decodes a single model, without decoding the rest of the models section.
+        """
+        location = self.toc["models"].get(model_type, {}).get(identifier)
+        return self.decode(location) if location else None
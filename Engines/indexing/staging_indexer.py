@@ -1,9 +1,7 @@
-import yaml
 import json
 from pathlib import Path
 import os
 import git
-import toml
 from datetime import datetime
 import sys
 import traceback
@@ -14,14 +12,10 @@ sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.logs import log
 from Engines.modules.deployment import modified_mdr_files
-
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
-TIDE_CONFIG = toml.load(
-    open(ROOT / "Configurations/global.toml", encoding="utf-8")
-)
+from Engines.modules.files import load_yaml, resolve_paths
 
 PROJECT_NAME = os.getenv("CI_PROJECT_NAME")
-STG_INDEX_PATH = ROOT / TIDE_CONFIG["paths"]["core"]["staging_index_output"]
+STG_INDEX_PATH = resolve_paths()["staging_index_output"]
 
 DEPLOYMENT_PLAN = os.getenv("DEPLOYMENT_PLAN")
 
@@ -52,7 +46,7 @@ current_stg_index = dict()
 
 # In this context, the deployment give the absolute path to each modified files
 for mdr in mdr_to_index:
-    mdr_data = yaml.safe_load(open(mdr, encoding="utf-8"))
+    mdr_data = load_yaml(mdr)
     mdr_name = mdr_data.get("name") or mdr_data["title"]
     log("ONGOING", "Updating the staging index", mdr_name)
     uuid = mdr_data["uuid"]
@@ -1,22 +1,30 @@
 import sys
 import os
 import git
+import time
+import threading
+import traceback
 from git.repo import Repo
 import re
-from typing import Literal
+from typing import Literal, Mapping, Callable
 from pathlib import Path
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.logs import log
-from Engines.modules.tide import DataTide
+from Engines.modules.logs import log, LOG_PREFIX, PrefixedStream
+from Engines.modules.tide import DataTide, IndexTide
 
 
 SYSTEMS_CONFIGS_INDEX = DataTide.Configurations.Systems.Index
 
+# Files changed between two commits, by pair of resolved commit SHAs
+DIFF_CACHE: dict[tuple[str, str], dict[str, list]] = dict()
 
-def fetch_config_envvar(config_secrets: dict[str,str]) -> dict[str,str]:
-    # Replace placeholder variables with environment
+
+def fetch_config_envvar(config_secrets: Mapping[str,str]) -> dict[str,str]:
+    # Replace placeholder variables with environment, on a copy
+    # as configurations are read-only views over the index
+    config_secrets = dict(config_secrets)
     for sec in config_secrets.copy():
         if type(config_secrets[sec]) == str:
             if config_secrets[sec][0] == "$":
@@ -52,29 +60,120 @@ def modified_mdr_files(stage: Literal["STAGING", "PRODUCTION"])->list[Path]:
 
     mdr_files = [(MDR_PATH / f) for f in mdr_files]
     log("INFO", "Computed modified MDR Files", str(mdr_files))
+
+    # Removed MDR can't be deployed anymore, their rule has to be removed
+    # from the systems by deploying them with a REMOVED status beforehand
+    deleted_files = diff_changes(*diff_endpoints(stage))["deleted"]
+    for mdr in deleted_files:
+        if re.match(mdr_path_regex, mdr):
+            log(
+                "WARNING",
+                "MDR file was deleted and will not be deployed",
+                mdr,
+                "Set the MDR status to REMOVED before deleting its file to remove its rules",
+            )
+
     return mdr_files
 
 
-def diff_calculation(stage: Literal["STAGING", "PRODUCTION"]) -> list:
+def status_eligible(plan: str, status: str) -> bool:
     """
-    Calculates the files in scope of deployment based on the execution context.
-    
-    Limitation: Tied to certain Gitlab CI variables, need more separation
-    to work in other environments
+    Whether a MDR with this status on a system can deploy in the plan.
+    """
+    production_status = DataTide.Configurations.Deployment.status["production"]
+    safe_status = DataTide.Configurations.Deployment.status["safe"]
 
-    In a Merge Request, the calculation will take in consideration
-    the root of the MR and tip of the branch. In a direct commit to main, it will
-    instead take the difference between the two last commits.
+    if plan == "PRODUCTION":
+        return status in production_status
+    if plan == "STAGING":
+        return status not in production_status and status not in safe_status
+    return False
 
-    stage: used to filter the paths computed
 
+def deployment_plan(plan: str, mdr_files: list[Path] | None = None) -> dict:
+    """
+    Computes the MDR to deploy on each system from the index. MDR files are
+    resolved to their UUID through the files index, or every indexed MDR is
+    in scope when no files are given.
+
+    Returns a JSON serializable plan, holding the UUIDs to deploy per system,
+    the MDR skipped with the reason, and the files which are not indexed
+    MDR, for instance as they were deleted.
     """
-    scope = list()
+    mdr_index = IndexTide.section("models")["mdr"]
+    files_index = IndexTide.section("files")
+    systems = enabled_systems()
+
+    deployment_plan = {"plan": plan, "systems": {}, "skipped": [], "unresolved": []}
+
+    if mdr_files is None:
+        mdr_uuids = list(mdr_index)
+    else:
+        mdr_uuids = list()
+        for mdr_file in mdr_files:
+            entry = files_index.get(str(Path(mdr_file).resolve()))
+            if entry and entry["type"] == "mdr":
+                mdr_uuids.append(entry["id"])
+            else:
+                deployment_plan["unresolved"].append(str(mdr_file))
+                log("SKIP", "File is not an indexed MDR", str(mdr_file))
+
+    for mdr_uuid in mdr_uuids:
+        data = mdr_index[mdr_uuid]
+        name = data["name"]
+
+        for system, configuration in data["configurations"].items():
+            platform_status = configuration["status"]
+
+            if system not in systems:
+                reason = "System is disabled"
+                log(
+                    "FAILURE",
+                    f"[{system.upper()}] is disabled and cannot be deployed to for",
+                    name,
+                )
+            elif not status_eligible(plan, platform_status):
+                reason = f"Status cannot be deployed in {plan}"
+                log(
+                    "WARNING",
+                    f"[{system.upper()}][{platform_status}] Skipping as cannot be deployed in {plan}",
+                    name,
+                )
+            else:
+                deployment_plan["systems"].setdefault(system, []).append(mdr_uuid)
+                log(
+                    "SUCCESS",
+                    f"[{system.upper()}][{platform_status}] Identified MDR to deploy in {plan}",
+                    name,
+                )
+                continue
+
+            deployment_plan["skipped"].append(
+                {
+                    "uuid": mdr_uuid,
+                    "name": name,
+                    "system": system,
+                    "status": platform_status,
+                    "reason": reason,
+                }
+            )
 
-    REPO_DIR = os.getenv("CI_PROJECT_DIR")
-    repo = Repo(REPO_DIR, search_parent_directories=True)
+    return deployment_plan
 
+
+def diff_endpoints(stage: Literal["STAGING", "PRODUCTION"]) -> tuple[str, str]:
+    """
+    Returns the source and target commits of the diff calculation from the
+    CI context.
+
+    In a Merge Request, the calculation will take in consideration
+    the root of the MR and tip of the branch. For merged results pipelines,
+    the tip of the branch is the second parent of the merge commit. In a
+    direct commit to main, it will instead take the difference between the
+    two last commits.
+    """
     TARGET = os.getenv("CI_COMMIT_SHA")
+    SOURCE = None
 
     if stage == "PRODUCTION":
         SOURCE = os.getenv("CI_COMMIT_BEFORE_SHA")
@@ -82,75 +181,193 @@ def diff_calculation(stage: Literal["STAGING", "PRODUCTION"]) -> list:
         SOURCE = os.getenv("CI_MERGE_REQUEST_DIFF_BASE_SHA")
         if os.getenv("CI_MERGE_REQUEST_EVENT_TYPE") == "merged_result":
             log("INFO", "Currently running a diff calculation for merge results")
-            for commit in repo.iter_commits():
-                if commit.hexsha == os.getenv("CI_COMMIT_BEFORE_SHA"):
-                    mr_correct_parent = commit.parents[1]
-                    log(
-                        "INFO",
-                        "Current evaluating commit and found parent",
-                        f"{commit.hexsha} | {commit.message}",
-                        str(mr_correct_parent),
-                    )
-                    TARGET = mr_correct_parent
-                    break
+            merge_commit = resolve_commit(str(os.getenv("CI_COMMIT_BEFORE_SHA")))
+            TARGET = merge_commit.parents[1].hexsha
+            log(
+                "INFO",
+                "Resolved the merge result parent",
+                f"{merge_commit.hexsha} | {TARGET}",
+            )
+
+    if not SOURCE or not TARGET:
+        log("FATAL", "No Source Commit could be identified")
+        raise Exception("No Source Commit Found")
 
-    log(
-        "INFO",
-        "Setting source and target commit for the diff calculation to",
-        f"{SOURCE} | {TARGET}",
-    )
+    return SOURCE, TARGET
 
-    source_commit = None
+
+def resolve_commit(sha: str):
+    """
+    Resolves a commit by its SHA, fetching it from origin when it is not
+    available locally, for instance in shallow CI clones.
+    """
+    repo = Repo(os.getenv("CI_PROJECT_DIR"), search_parent_directories=True)
     try:
-        source_commit = repo.commit(SOURCE)
+        return repo.commit(sha)
     except Exception:
-        log(
-            "INFO",
-            "Could not find source commit in current branch, trying iter_commits method",
-        )
-        remote_refs = repo.remote().refs
-
-        for refs in remote_refs:
-            log("INFO", refs.name)
-
-        for commit in repo.iter_commits("origin/main"):
-            log("INFO", "Currently Evaluating", f"{commit.message}")
-            if commit.hexsha == SOURCE:
-                source_commit = commit
-                log(
-                    "SUCCESS",
-                    "Found source commit",
-                    f"{commit.hexsha} | {commit.message}",
-                )
-                break
+        log("INFO", "Commit not found locally, fetching it from origin", sha)
+        try:
+            repo.git.fetch("origin", sha)
+            return repo.commit(sha)
+        except Exception:
+            log("FATAL", "Could not resolve commit", sha)
+            raise Exception("No Source Commit Found")
 
-    if not source_commit:
-        log("FATAL", "No Source Commit could be identified")
-        raise Exception("No Source Commit Found")
 
-    target_commit = repo.commit(TARGET)
-    diff = source_commit.diff(target_commit)
+def diff_changes(source: str, target: str) -> dict[str, list]:
+    """
+    Lists the files changed between two commits by type of change : added,
+    modified, deleted, and renamed as (previous, new) paths. Results are
+    cached per pair of commits, as several stages compute the same diff.
+    """
+    source_sha = resolve_commit(source).hexsha
+    target_sha = resolve_commit(target).hexsha
+
+    if (source_sha, target_sha) not in DIFF_CACHE:
+        repo = Repo(os.getenv("CI_PROJECT_DIR"), search_parent_directories=True)
+        output = repo.git.diff("--name-status", "-M", "-z", source_sha, target_sha)
+
+        changes = {"added": [], "modified": [], "deleted": [], "renamed": []}
+        entries = iter(output.split("\0"))
+        for status in entries:
+            if not status:
+                continue
+            match status[0]:
+                case "A":
+                    changes["added"].append(next(entries))
+                case "M" | "T":
+                    changes["modified"].append(next(entries))
+                case "D":
+                    changes["deleted"].append(next(entries))
+                case "R":
+                    changes["renamed"].append((next(entries), next(entries)))
+                case "C":
+                    next(entries)
+                    changes["added"].append(next(entries))
+                case _:
+                    next(entries)
+
+        DIFF_CACHE[(source_sha, target_sha)] = changes
+
+    return DIFF_CACHE[(source_sha, target_sha)]
 
+
+def diff_calculation(stage: Literal["STAGING", "PRODUCTION"]) -> list:
+    """
+    Calculates the files in scope of deployment based on the execution context.
+    
+    Limitation: Tied to certain Gitlab CI variables, need more separation
+    to work in other environments
+
+    stage: used to filter the paths computed
+
+    """
+    SOURCE, TARGET = diff_endpoints(stage)
     log(
-        "DEBUG",
-        "Preliminary diff calculation completed, returned with",
-        ", ".join([f.b_path for f in diff]),
+        "INFO",
+        "Setting source and target commit for the diff calculation to",
+        f"{SOURCE} | {TARGET}",
     )
 
+    changes = diff_changes(SOURCE, TARGET)
+
     # Computing diff for added/renamed paths and modified files.
     # Deleted files are explicitely excluded to avoid attempting to deploy
     # something that is not material anymore.
-    added_files = [f.b_path for f in diff.iter_change_type("A")]
-    renamed_files = [f.b_path for f in diff.iter_change_type("R")]
-    modified_files = [f.b_path for f in diff.iter_change_type("M")]
-
-    scope = added_files + renamed_files + modified_files
+    scope = (
+        changes["added"]
+        + [new for _, new in changes["renamed"]]
+        + changes["modified"]
+    )
 
     log("INFO", "Computed diff scope", ", ".join(scope))
+    if changes["deleted"]:
+        log("INFO", "Deleted files left out of scope", ", ".join(changes["deleted"]))
 
     return scope
 
 
+def deploy_concurrently(
+    deployments: Mapping[str, Callable[[], None]],
+    workers: int = 0,
+    timeouts: Mapping[str, float] | None = None,
+) -> dict[str, dict]:
+    """
+    Runs the deployment of each system in its own thread, at most `workers`
+    at a time, or all at once when 0. All output, logs or prints, is
+    prefixed by the system while the deployments run.
+
+    A failure only affects the system it happened on. A system still running
+    past its timeout, counted from when it started, is reported as timed out.
+    Threads can't be stopped, so it keeps its slot until it actually exits,
+    and no more than `workers` systems ever run at once. Returns the status,
+    duration and error of every system.
+    """
+    timeouts = timeouts or {}
+    slots = threading.Semaphore(workers or len(deployments) or 1)
+    lock = threading.Lock()
+    results = {
+        system: {"status": "PENDING", "start": None, "seconds": 0.0, "error": None}
+        for system in deployments
+    }
+
+    def settle(system: str, status: str, error: str | None = None) -> bool:
+        # Only the first outcome counts
+        with lock:
+            result = results[system]
+            if result["status"] != "RUNNING":
+                return False
+            result["status"] = status
+            result["error"] = error
+            result["seconds"] = time.monotonic() - result["start"]
+        return True
+
+    def run(system: str):
+        slots.acquire()
+        LOG_PREFIX.set(system.upper())
+        with lock:
+            results[system]["status"] = "RUNNING"
+            results[system]["start"] = time.monotonic()
+        try:
+            deployments[system]()
+            settle(system, "SUCCESS")
+        except BaseException as error:
+            traceback.print_exc()
+            if settle(system, "FAILURE", repr(error)):
+                log("FAILURE", "Deployment failed", repr(error))
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            slots.release()
+
+    threads = {
+        system: threading.Thread(target=run, args=(system,), daemon=True)
+        for system in deployments
+    }
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = PrefixedStream(stdout), PrefixedStream(stderr)
+    try:
+        for thread in threads.values():
+            thread.start()
+
+        while any(
+            result["status"] in ["PENDING", "RUNNING"] for result in results.values()
+        ):
+            for system, thread in threads.items():
+                thread.join(timeout=0.1)
+                start = results[system]["start"]
+                timeout = timeouts.get(system)
+                if timeout and start and time.monotonic() - start > timeout:
+                    if settle(system, "TIMEOUT", f"Exceeded {timeout} seconds"):
+                        log("FAILURE", "Deployment timed out for system", system)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = stdout, stderr
+
+    return results
+
+
 def enabled_lookup_systems() -> list[str]:
     enabled_lookup_systems = list()
     for system in SYSTEMS_CONFIGS_INDEX:
@@ -1,8 +1,16 @@
 import pandas as pd
+import os
 import git
 import sys
 import json
-from typing import Literal
+import shutil
+import hashlib
+import multiprocessing
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Literal, Callable
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
@@ -11,6 +19,9 @@ from Engines.modules.framework import (
     model_value,
     get_value_metaschema,
     get_vocab_entry,
+    legacy_aliases,
+    relations_list,
+    vocab_references,
 )
 from Engines.modules.logs import log
 from Engines.modules.tide import DataTide
@@ -22,6 +33,8 @@ DOCUMENTATION_CONFIG = DataTide.Configurations.Documentation
 CONFIG_INDEX = DataTide.Configurations.Index
 DEFINITIONS_INDEX = DataTide.TideSchemas.definitions
 MODELS_INDEX = DataTide.Models.Index
+CHAINING_INDEX = DataTide.Models.chaining
+ENGINES_PATH = Path(__file__).resolve().parents[1]
 
 FOLD = """
 <details>
@@ -159,10 +172,8 @@ def get_icon(
         elif parent_icon is True:
             return VOCAB_INDEX[vocab]["metadata"].get("icon") or ""
 
-        elif legacy:
-            for v in vocab_data:
-                if vocab_data[v].get("legacy") == value:
-                    return vocab_data[v].get("icon") or ""
+        elif legacy and value in legacy_aliases(vocab):
+            return vocab_data[legacy_aliases(vocab)[value]].get("icon") or ""
         else:
             return ""
     else:
@@ -589,3 +600,278 @@ def name_subschema_doc(
         subschema_name = str(ICONS.get("subschemas")) + " " + subschema_name
 
     return subschema_name
+
+
+def rendering_workers(workers: int | None = None) -> int:
+    """
+    Returns the amount of processes rendering documentation pages. Explicit
+    arguments take precedence over the `DOCUMENTATION_WORKERS` environment
+    variable, which itself takes precedence over the `rendering.workers`
+    configuration in documentation.toml.
+
+    A value of 0 uses all the cores available on the machine.
+    """
+    if workers is None:
+        workers = os.getenv("DOCUMENTATION_WORKERS") or (
+            DOCUMENTATION_CONFIG.rendering.get("workers", 1)
+        )
+    workers = int(workers)  # type: ignore
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    return max(workers, 1)
+
+
+def fingerprint(*parts) -> str:
+    """
+    Content hash of the data a page is rendered from.
+    """
+    serialized = json.dumps(
+        parts, default=lambda o: dict(o) if isinstance(o, Mapping) else str(o)
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+@cache
+def toolchain_signature() -> str:
+    """
+    Fingerprint of what every page depends on beside its own data : the
+    toolchain code, the configurations, the metaschemas and the subschemas
+    and definitions they reference. Any change to them renders all pages again.
+    """
+    digest = hashlib.sha256()
+    for source in sorted(ENGINES_PATH.rglob("*.py")):
+        digest.update(source.read_bytes())
+    digest.update(
+        fingerprint(
+            CONFIG_INDEX,
+            DataTide.TideSchemas.Index,
+            DataTide.TideSchemas.subschemas,
+            DataTide.TideSchemas.definitions,
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def system_vocab_references(body: dict) -> list[tuple[str, str, str]]:
+    """
+    Returns the vocabulary values held in the system configurations of
+    a model, which are described by the system subschemas rather than the
+    model metaschema. Fields named after a vocabulary, such as the status,
+    are enriched from it in the documentation as well.
+    """
+    references = list()
+    subschemas = DataTide.TideSchemas.subschemas.get("systems", {})
+
+    def named_references(data):
+        if isinstance(data, list):
+            for item in data:
+                named_references(item)
+        elif isinstance(data, dict):
+            for field, value in data.items():
+                if field in VOCAB_INDEX:
+                    for v in value if type(value) is list else [value]:
+                        if type(v) is str:
+                            references.append((field, field, v))
+                named_references(value)
+
+    for system, system_data in (body.get("configurations") or {}).items():
+        subschema = subschemas.get(system, {}).get("properties") or {}
+        references.extend(vocab_references(system_data, subschema))
+        named_references(system_data)
+
+    return references
+
+
+def model_fingerprint(model_id: str) -> str:
+    """
+    Fingerprint of the data a model page is rendered from : the model itself,
+    the models it is related to and the vocabulary entries it references.
+    """
+    model_type = get_type(model_id)
+    body = MODELS_INDEX[model_type][model_id]
+
+    related = dict()
+    for related_type, related_ids in relations_list(model_id, direction="both").items():
+        for related_id in sorted(related_ids):
+            related[related_id] = MODELS_INDEX.get(related_type, {}).get(related_id)
+
+    metaschema = getattr(DataTide.TideSchemas, model_type, {}).get("properties") or {}
+    references = vocab_references(body, metaschema) + system_vocab_references(body)
+    # Legacy identifiers are documented from the entry replacing them
+    entries = {
+        f"{vocab}::{identifier}": VOCAB_INDEX.get(vocab, {})
+        .get("entries", {})
+        .get(legacy_aliases(vocab).get(identifier, identifier))
+        for _, vocab, identifier in references
+    }
+
+    # Chaining graphs span every vector of the chain the model is part of
+    chaining = None
+    if model_type == "tvm" and any(
+        vector == model_id or any(model_id in links for links in chains.values())
+        for vector, chains in CHAINING_INDEX.items()
+    ):
+        chaining = {
+            vector: MODELS_INDEX["tvm"].get(vector) for vector in CHAINING_INDEX
+        }, CHAINING_INDEX
+
+    return fingerprint(toolchain_signature(), body, related, entries, chaining)
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class DocumentationManifest:
+    """
+    Record of the fingerprint of every page written in a documentation
+    folder by the last build, and of the content it was written with, stored
+    along the pages. Pages with a matching fingerprint, whose file still holds
+    that content, are up to date and don't need to be rendered again. Checking
+    the content keeps a manifest restored apart from the pages, for example
+    from a CI cache, from skipping pages the wiki never received.
+    """
+
+    FILE_NAME = ".tide_manifest.json"
+    VERSION = 2
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self.path = self.folder / self.FILE_NAME
+        self.pages: dict[str, str] = dict()
+
+        if self.path.is_file():
+            try:
+                manifest = json.loads(self.path.read_text(encoding="utf-8"))
+                if manifest.get("version") == self.VERSION:
+                    self.pages = manifest["pages"]
+            except Exception as error:
+                log("WARNING", "Could not read documentation manifest", repr(error))
+
+    def key(self, target: Path) -> str:
+        return Path(target).relative_to(self.folder).as_posix()
+
+    def unchanged(self, target: Path, page_fingerprint: str | None) -> bool:
+        entry = self.pages.get(self.key(target)) or {}
+        return (
+            page_fingerprint is not None
+            and entry.get("fingerprint") == page_fingerprint
+            and Path(target).is_file()
+            and entry.get("digest") == file_digest(target)
+        )
+
+    def prune(self, targets: list[Path]) -> int:
+        """
+        Deletes the files of the folder which are not a target of the
+        build anymore, and the folders left empty. Returns the amount
+        of deleted files.
+        """
+        kept = {self.key(target) for target in targets} | {self.FILE_NAME}
+        deleted = 0
+        for path in sorted(self.folder.rglob("*"), reverse=True):
+            if path.is_file() and self.key(path) not in kept:
+                path.unlink()
+                deleted += 1
+            elif path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+        return deleted
+
+    def save(self, pages: dict[Path, str | None]):
+        manifest = {
+            "version": self.VERSION,
+            "pages": {
+                self.key(target): {
+                    "fingerprint": page_fingerprint,
+                    "digest": file_digest(target),
+                }
+                for target, page_fingerprint in pages.items()
+                if page_fingerprint is not None and Path(target).is_file()
+            },
+        }
+        temporary_path = self.path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(temporary_path, self.path)
+
+
+def write_document(target: Path, render: Callable[..., str], arguments: tuple) -> Path:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    document = render(*arguments)
+    with open(target, "w+", encoding="utf-8") as output:
+        output.write(document)
+    return target
+
+
+def write_documents(
+    pages: list[tuple[Path, Callable[..., str], tuple]], workers: int
+) -> None:
+    if workers <= 1 or len(pages) < 2:
+        for page in pages:
+            write_document(*page)
+        return
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        log("SKIP", "Parallel rendering requires fork, rendering serially")
+        return write_documents(pages, workers=1)
+
+    log("INFO", "Rendering documentation with a process pool of", str(workers))
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork")
+    ) as pool:
+        futures = [pool.submit(write_document, *page) for page in pages]
+        # Surfaces the first failure in page order, as a serial run would
+        for future in futures:
+            future.result()
+
+
+def render_documents(
+    pages: list[tuple[Path, Callable[..., str], tuple, str | None]],
+    folder: Path,
+    workers: int | None = None,
+) -> int:
+    """
+    Renders documentation pages and writes them to their target path, within
+    the documentation folder. Each page is described by its target, a module
+    level function returning the document, the arguments to call it with and
+    the fingerprint of the data it is rendered from.
+
+    With more than one worker, pages are rendered by a process pool. Workers
+    are forked once the index is loaded, so they share it read-only instead
+    of each loading it again. When multiple pages share a target, only the last
+    one is rendered, as it would be the one kept by a serial run, so the
+    output does not depend on the order workers complete in.
+
+    Incremental builds, enabled with `rendering.incremental` in documentation.toml,
+    skip pages whose fingerprint matches the last build, and only delete the
+    pages which are not generated anymore. Otherwise, the folder is cleared
+    and every page is rendered.
+
+    Returns the amount of written documents.
+    """
+    workers = rendering_workers(workers)
+    folder = Path(folder)
+    targets = {str(page[0]): page for page in pages}
+    pages = list(targets.values())
+
+    if not DOCUMENTATION_CONFIG.rendering.get("incremental", False):
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        folder.mkdir(parents=True)
+        write_documents([page[:3] for page in pages], workers)
+        return len(pages)
+
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest = DocumentationManifest(folder)
+    deleted = manifest.prune([page[0] for page in pages])
+    outdated = [page for page in pages if not manifest.unchanged(page[0], page[3])]
+
+    log(
+        "INFO",
+        f"Incremental build of {folder.name} : {len(outdated)} pages to render",
+        f"{len(pages) - len(outdated)} unchanged, {deleted} orphaned pages deleted",
+    )
+    write_documents([page[:3] for page in outdated], workers)
+    manifest.save({page[0]: page[3] for page in pages})
+
+    return len(outdated)
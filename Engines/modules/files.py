@@ -2,16 +2,65 @@ import sys
 import git
 import os
 import toml
+import yaml
 from pathlib import Path
 from collections.abc import MutableMapping as Map
-from typing import overload, Tuple, Literal
+from functools import cache
+from typing import overload, Tuple, Literal, Any
 
+# libyaml bindings parse several times faster than the pure Python loader,
+# but are an optional part of PyYAML builds, so we fall back when missing.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader  # type: ignore
 
+
+def load_yaml(file_path: Path | str) -> Any:
+    """
+    Single entry point to read YAML files across the Tide toolchain.
+    Uses the libyaml C loader when available, with the same safe
+    semantics as `yaml.safe_load`.
+    """
+    with open(file_path, encoding="utf-8") as yaml_file:
+        return yaml.load(yaml_file, Loader=YamlLoader)
+
+
+def parse_yaml(content: str) -> Any:
+    """
+    Counterpart of `load_yaml()` for YAML content already held in memory.
+    """
+    return yaml.load(content, Loader=YamlLoader)
+
+
+@cache
+def resolve_root() -> Path:
+    """
+    Returns the root of the CoreTIDE repository. The git repository is only
+    discovered once per process.
+    """
+    return Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+
+
+def invalidate_configurations():
+    """
+    Drops the configurations and repository root cached in the process, so
+    they are resolved again on next use. Call after configuration files
+    were modified.
+    """
+    resolve_configurations.cache_clear()
+    resolve_root.cache_clear()
+
+
+@cache
 def resolve_configurations() -> dict[str, dict]:
     """
     Interface to provide a single point of truth for all configurations in the
     Tide infrastructure. Custom configurations at the top level are seeked and merged
     into the base configurations using a deep merge algorithm.
+
+    Configurations are resolved once per process and shared by all callers,
+    which should treat them as read-only. See `invalidate_configurations()`.
     """
     
     def deep_merge(source_dict, merge_dict):
@@ -54,7 +103,7 @@ def resolve_configurations() -> dict[str, dict]:
 
         return config_index
 
-    ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+    ROOT = resolve_root()
 
     # We need to hardcode these paths as they aer static, and must be 
     # used as a final reference point to prevent circular executions 
@@ -89,7 +138,7 @@ def resolve_paths(separate:bool=False):
     When `separate=False`, returns a flattened dict of all paths for easier consumption
     """
     
-    ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+    ROOT = resolve_root()
     # Fetch configs, as paths may have been modified by the custom config
     CONFIGS = resolve_configurations()
     TIDE_CONFIG = CONFIGS["global"]
@@ -3,10 +3,11 @@ import git
 import uuid
 import sys
 from typing import Literal
+from collections.abc import Mapping
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.tide import DataTide
+from Engines.modules.tide import DataTide, IndexTide
 from Engines.modules.logs import log
 
 DEFINITIONS_INDEX = DataTide.TideSchemas.definitions
@@ -14,6 +15,33 @@ VOCAB_INDEX = DataTide.Vocabularies.Index
 MODELS_INDEX = DataTide.Models.Index
 CHAINING_INDEX = DataTide.Models.chaining
 
+# Where models reference their parents. Legacy MDR hold the reference
+# to their parent in their tags when looking for childs.
+PARENT_MAPPINGS = {
+    "tvm": {"data": "threat", "reference": "actors"},
+    "cdm": {"data": "detection", "reference": "vectors"},
+    "mdr": {"reference": "detection_model"},
+}
+CHILD_MAPPINGS = {
+    "tvm": {"data": "threat", "reference": "actors"},
+    "cdm": {"data": "detection", "reference": "vectors"},
+    "mdr": {"reference": "detection_model", "legacy_data": "tags"},
+}
+CHILD_TYPES = {"tam": "tvm", "tvm": "cdm", "cdm": "mdr", "bdr": "mdr"}
+
+# Populated on first use by relations_index()
+RELATIONS_INDEX = dict()
+
+# Compiled metaschemas, see metaschema_table()
+METASCHEMA_TABLES = dict()
+
+# Legacy identifiers of each vocabulary, see legacy_aliases()
+LEGACY_INDEX = dict()
+
+# Techniques and tactics resolved for each model, filled as models are resolved
+TECHNIQUES_CLOSURE = dict()
+TACTICS_CLOSURE = dict()
+
 
 def unroll_dot_dict(dot_dict, separator="."):
     """
@@ -90,6 +118,83 @@ def key_value_transform(kv_store_list: list) -> dict:
 #    return nest
 
 
+def compile_metaschema(metaschema: dict, definitions_stack=()) -> dict:
+    """
+    Flattens a metaschema into a table of every field it holds at any depth,
+    to the schemas of the field in the order a depth-first search through the
+    metaschema finds them. Nested properties, properties of array items and
+    referenced definitions are all followed. Scalar values, such as the type
+    of a definition, are kept in the table but not searched.
+    """
+    table = {field: [metaschema[field]] for field in metaschema.keys()}
+    nested = dict()
+
+    for key in metaschema.keys():
+        if not isinstance(metaschema[key], Mapping):
+            continue
+        searched = []
+        if metadef := metaschema[key].get("tide.meta.definition"):
+            definition_name = key if metadef is True else metadef
+            # Guards against definitions referencing themselves
+            if definition_name not in definitions_stack:
+                searched.append(
+                    (
+                        DEFINITIONS_INDEX.get(definition_name, {}).get("properties"),
+                        definitions_stack + (definition_name,),
+                    )
+                )
+
+        if (
+            metaschema[key].get("type") == "object"
+            and "recomposition" not in metaschema[key].keys()
+            and "additionalProperties" not in metaschema[key].keys()
+        ):
+            searched.append((metaschema[key].get("properties"), definitions_stack))
+
+        if (
+            metaschema[key].get("type") == "array"
+            and isinstance(metaschema[key].get("items"), Mapping)
+            and "properties" in metaschema[key]["items"].keys()
+        ):
+            searched.append(
+                (metaschema[key]["items"].get("properties"), definitions_stack)
+            )
+
+        for properties, stack in searched:
+            if properties and isinstance(properties, Mapping):
+                for field, schemas in compile_metaschema(properties, stack).items():
+                    nested.setdefault(field, []).extend(schemas)
+
+    # Fields found at the current level shadow the ones found deeper
+    for field, schemas in nested.items():
+        table.setdefault(field, schemas)
+
+    return table
+
+
+def metaschema_table(metaschema: dict, scope=None) -> dict:
+    """
+    Returns the compiled table of a metaschema, compiled on first use
+    and cleared when the index is refreshed.
+    """
+    key = (id(metaschema), scope)
+    if key not in METASCHEMA_TABLES:
+        if scope:
+            scoped_meta = {scope: metaschema_table(metaschema)[scope][0]}
+            table = compile_metaschema(scoped_meta)
+        else:
+            table = compile_metaschema(metaschema)
+        # The metaschema is kept along its table, so its id can't be reused
+        METASCHEMA_TABLES[key] = (metaschema, table)
+
+    return METASCHEMA_TABLES[key][1]
+
+
+@IndexTide.subscribe
+def invalidate_metaschema_tables(delta: dict):
+    METASCHEMA_TABLES.clear()
+
+
 def get_value_metaschema(
     field, metaschema: dict, retrieve: str | Literal["tide.meta"], scope=None
 ):
@@ -112,66 +217,26 @@ def get_value_metaschema(
     if not metaschema:
         return None
 
-    if scope:
-        scoped_meta = get_value_metaschema(scope, metaschema, retrieve="tide.meta")
-        if scope == "threat_objects":
-            return get_value_metaschema(field, scoped_meta, retrieve)  # type: ignore
+    if scope == "threat_objects":
+        if scope not in metaschema_table(metaschema):
+            return None
+        table = metaschema_table(metaschema, scope)
+        top_level = field == scope
+    else:
+        table = metaschema_table(metaschema)
+        top_level = field in metaschema.keys()
 
-    if field in metaschema.keys():
+    # First schema holding the retrieved key, as a depth-first search would
+    # return, except at the top level where the field is returned as is.
+    for schema in table.get(field, []):
         if retrieve == "tide.meta":
-            return {field: metaschema[field]}
-        else:
-            return metaschema[field].get(retrieve)
+            return {field: schema}
+        elif not isinstance(schema, Mapping):
+            continue
+        elif (value := schema.get(retrieve)) is not None or top_level:
+            return value
 
-    else:
-        for key in metaschema.keys():
-            if metadef := metaschema[key].get("tide.meta.definition"):
-                if metadef is True:
-                    definition = DEFINITIONS_INDEX[key]
-                else:
-                    definition = DEFINITIONS_INDEX[metadef]
-                if field == key:
-                    return DEFINITIONS_INDEX[key].get(retrieve)
-                elif (
-                    get_value_metaschema(field, definition.get("properties"), retrieve)
-                    != None
-                ):
-                    return get_value_metaschema(
-                        field, definition.get("properties"), retrieve
-                    )
-
-            if (
-                metaschema[key].get("type") == "object"
-                and "recomposition" not in metaschema[key].keys()
-            ):
-                if "additionalProperties" not in metaschema[key].keys():
-                    # Trick since recursive function would not return for all
-                    # occurence, would break on first return. If the return is not
-                    # None, it means it's the title and thus returns.
-                    if (
-                        get_value_metaschema(
-                            field, metaschema[key].get("properties"), retrieve
-                        )
-                        != None
-                    ):
-                        return get_value_metaschema(
-                            field, metaschema[key].get("properties"), retrieve
-                        )
-
-            # Handle case for arrays of items
-            if (
-                metaschema[key].get("type") == "array"
-                and "properties" in metaschema[key].get("items", {}).keys()
-            ):
-                if (
-                    get_value_metaschema(
-                        field, metaschema[key]["items"].get("properties"), retrieve
-                    )
-                    != None
-                ):
-                    return get_value_metaschema(
-                        field, metaschema[key]["items"].get("properties"), retrieve
-                    )
+    return None
 
 
 def rename_param_nest(nest, schema, scope=None):
@@ -243,17 +308,70 @@ def vocab_metadata(vocab: str, field=None) -> str | dict:
         return vocab_data
 
 
+def legacy_aliases(vocab: str) -> dict:
+    """
+    Returns the legacy identifiers of a vocabulary, mapped to the identifier
+    of the entry which replaced them. Built on first use for each vocabulary,
+    and cleared when the index is refreshed.
+    """
+    if vocab not in LEGACY_INDEX:
+        aliases = dict()
+        for identifier, entry in VOCAB_INDEX.get(vocab, {}).get("entries", {}).items():
+            legacy = entry.get("legacy") or []
+            for alias in [legacy] if type(legacy) is str else legacy:
+                aliases.setdefault(alias, identifier)
+        LEGACY_INDEX[vocab] = aliases
+
+    return LEGACY_INDEX[vocab]
+
+
+@IndexTide.subscribe
+def invalidate_legacy_aliases(delta: dict):
+    LEGACY_INDEX.clear()
+
+
+def vocab_references(body, metaschema: dict) -> list[tuple[str, str, str]]:
+    """
+    Returns the field, vocabulary and identifier of every vocabulary
+    value held in a model body, following the vocabularies its
+    metaschema assigns to each field.
+    """
+    references = list()
+
+    if type(body) is list:
+        for item in body:
+            references.extend(vocab_references(item, metaschema))
+
+    elif type(body) is dict:
+        for field, value in body.items():
+            vocab = get_value_metaschema(field, metaschema, "tide.vocab")
+            if vocab:
+                vocab = field if vocab is True else vocab
+                values = value if type(value) is list else [value]
+                for v in values:
+                    if type(v) is str:
+                        references.append((field, vocab, v))
+            else:
+                references.extend(vocab_references(value, metaschema))
+
+    return references
+
+
 def get_vocab_entry(vocab, identifier, field=None, newlines=False):
     """
     Returns data for a particular entry of a voacbulary.
     Supports two modes : if field is None, will return all data from
     the entry as a dict, else will fetch the data for the given
-    identifier.
+    identifier. Legacy identifiers resolve to the entry replacing them.
     """
 
     if vocab not in VOCAB_INDEX.keys():
         return ""
 
+    # Lookup for legacy entries in vocab if the identifier is unknown
+    if identifier not in VOCAB_INDEX[vocab]["entries"].keys():
+        identifier = legacy_aliases(vocab).get(identifier, identifier)
+
     if identifier in VOCAB_INDEX[vocab]["entries"].keys():
         entry_data = VOCAB_INDEX[vocab]["entries"][identifier]
 
@@ -272,25 +390,6 @@ def get_vocab_entry(vocab, identifier, field=None, newlines=False):
             )
             return ""
 
-    # Lookup for legacy entries in vocab if all things fail
-    else:
-        vocab_data = VOCAB_INDEX[vocab]["entries"]
-        for v in vocab_data:
-            if vocab_data[v].get("legacy") == identifier:
-                entry_data = VOCAB_INDEX[vocab]["entries"][identifier]
-                if field is None:
-                    return entry_data
-
-                if field is None:
-                    return entry_data
-
-                elif field in entry_data.keys():
-                    data = entry_data[field]
-                    if newlines is False:
-                        return data.replace("\n", "")
-                    else:
-                        return data
-
     print(
         f"⚠️ Could not retrieve identifier [ {identifier} ] from vocabulary data of : {vocab}"
     )
@@ -322,6 +421,70 @@ def model_value(id, key):
     return value
 
 
+def resolve_references(model_type: str, model_body: dict, locations: dict) -> list:
+    """
+    Reads the identifiers a model references to its parents, at the location
+    configured for its type.
+    """
+    location = locations[model_type]
+    data = location.get("data")
+    if model_type == "mdr" and "configurations" not in model_body:
+        data = location.get("legacy_data")
+
+    if data:
+        references = (model_body.get(data) or {}).get(location["reference"])
+    else:
+        references = model_body.get(location["reference"])
+
+    references = references or []
+    if type(references) is str:
+        references = [references]
+
+    return list(dict.fromkeys(references))
+
+
+def build_relations_index() -> dict:
+    """
+    Builds the adjacency index of the relationships between models, in both
+    directions, so looking up the parents or the childs of a model
+    does not require a search through the models index.
+    """
+    relations = {"parents": {}, "childs": {}}
+
+    for model_type in PARENT_MAPPINGS:
+        for model_id, model_body in MODELS_INDEX.get(model_type, {}).items():
+            relations["parents"][model_id] = resolve_references(
+                model_type, model_body, PARENT_MAPPINGS
+            )
+
+    # Childs are keyed by their type, so a model is only returned as a child of
+    # a parent of the expected type, as with a search through the child index
+    for child_type in set(CHILD_TYPES.values()):
+        childs_index = relations["childs"].setdefault(child_type, {})
+        for child_id, child_body in MODELS_INDEX.get(child_type, {}).items():
+            for parent_id in resolve_references(
+                child_type, child_body, CHILD_MAPPINGS
+            ):
+                childs_index.setdefault(parent_id, []).append(child_id)
+
+    return relations
+
+
+def relations_index() -> dict:
+    """
+    Returns the relationships adjacency index, built on first use
+    and cleared when the index is refreshed.
+    """
+    if not RELATIONS_INDEX:
+        RELATIONS_INDEX.update(build_relations_index())
+    return RELATIONS_INDEX
+
+
+@IndexTide.subscribe
+def invalidate_relations_index(delta: dict):
+    RELATIONS_INDEX.clear()
+
+
 def parents(id: str) -> list:
     """
     Returns the list of parents for any given CoreTIDE Object.
@@ -330,74 +493,29 @@ def parents(id: str) -> list:
     """
 
     model_type = get_type(id)
-    parents = []
-    parent_mappings = {
-        "tvm": {"data": "threat", "parent": "actors"},
-        "cdm": {"data": "detection", "parent": "vectors"},
-        "mdr": {"parent": "detection_model"},
-    }
-
-    if model_type not in parent_mappings:
-        return []
 
-    model_data = MODELS_INDEX[model_type][id]
-    parent_loc = parent_mappings[model_type]
-
-    if "data" in parent_loc:
-        parents = model_data[parent_loc["data"]].get(parent_loc["parent"]) or []
-
-    else:
-        parents = model_data.get(parent_loc["parent"]) or []
-
-    if type(parents) is str:
-        parents = [parents]
+    if model_type not in PARENT_MAPPINGS:
+        return []
 
-    return parents
+    return list(relations_index()["parents"][id])
 
 
 def childs(model_id: str) -> list:
     """
     Returns the list of direct descendants for any given CoreTIDE Object,
-    by performing a forward search.
+    from the relationships adjacency index.
 
     If the object can not have descendants, or in other word is a last-line
     Object (such as MDRs), will return an empty dictionary
     """
 
-    implementations = []
-
-    mappings = {
-        "tam": {"child_type": "tvm", "data": "threat", "reference": "actors"},
-        "tvm": {"child_type": "cdm", "data": "detection", "reference": "vectors"},
-        "cdm": {"child_type": "mdr", "reference": "detection_model"},
-        "bdr": {"child_type": "mdr", "reference": "detection_model"},
-    }
-
     model_type = get_type(model_id)
 
-    if model_type not in mappings.keys():
+    if model_type not in CHILD_TYPES:
         return []
 
-    child_type = mappings[model_type]["child_type"]
-    data = mappings[model_type].get("data", None)
-    reference = mappings[model_type]["reference"]
-
-    CHILDS_INDEX = MODELS_INDEX[child_type]
-    for child in CHILDS_INDEX:
-        if child_type == "mdr":
-            child_version = get_type(child, get_version=True)
-            if child_version == "mdrv2":
-                data = "tags"
-            else:
-                data = None
-        if data:
-            if model_id in CHILDS_INDEX[child].get(data, {}).get(reference, []):
-                implementations.append(child)
-        else:
-            if model_id in CHILDS_INDEX[child].get(reference, []):
-                implementations.append(child)
-
-    return implementations
+    child_type = CHILD_TYPES[model_type]
+    return list(relations_index()["childs"][child_type].get(model_id, []))
 
 
 def get_type(model_id: str, get_version=False):
@@ -435,11 +553,17 @@ def techniques_resolver(model_id: str, recursive=True) -> list:
     and its parent properties. WARNING : only works when index is loaded
     in memory.
 
+    Recursive resolutions are memoized, and shared across callers until
+    the index is refreshed.
+
     Returns
     -------
     techniques: List of resolved techniques.
     """
 
+    if recursive and model_id in TECHNIQUES_CLOSURE:
+        return list(TECHNIQUES_CLOSURE[model_id])
+
     techniques = []
 
     # Find the model_type
@@ -483,7 +607,39 @@ def techniques_resolver(model_id: str, recursive=True) -> list:
     # across multiple
     techniques = list(dict.fromkeys(techniques))
 
-    return techniques
+    if recursive:
+        TECHNIQUES_CLOSURE[model_id] = techniques
+
+    return list(techniques)
+
+
+def tactics_resolver(model_id: str) -> list:
+    """
+    Returns the ATT&CK tactics of an object, from the stages of its
+    resolved techniques in the ATT&CK vocabulary. Memoized in the same
+    way as techniques_resolver.
+    """
+
+    if model_id in TACTICS_CLOSURE:
+        return list(TACTICS_CLOSURE[model_id])
+
+    tactics = []
+    for technique in techniques_resolver(model_id):
+        stages = get_vocab_entry("att&ck", technique, "tide.vocab.stages") or []
+        if type(stages) is str:
+            stages = [stages]
+        tactics.extend(stages)
+
+    tactics = list(dict.fromkeys(tactics))
+    TACTICS_CLOSURE[model_id] = tactics
+
+    return list(tactics)
+
+
+@IndexTide.subscribe
+def invalidate_techniques_closure(delta: dict):
+    TECHNIQUES_CLOSURE.clear()
+    TACTICS_CLOSURE.clear()
 
 
 def relations_downstream(id):
@@ -1,7 +1,58 @@
-from typing import Literal
+from typing import Literal, Callable, TextIO
+from contextvars import ContextVar, copy_context
 import os
+import threading
 import git
 
+# Prefix of the output lines, set per thread when several deployments run
+# concurrently so their logs can be told apart
+LOG_PREFIX: ContextVar[str] = ContextVar("LOG_PREFIX", default="")
+
+
+def in_log_context(function: Callable) -> Callable:
+    """
+    Binds the function to the context it is wrapped in, so the workers of a
+    nested pool keep the log prefix of the thread that started them. Each
+    call runs in its own copy, as a context can't be entered concurrently.
+    """
+    context = copy_context()
+    return lambda *args, **kwargs: context.copy().run(function, *args, **kwargs)
+
+
+class PrefixedStream:
+    """
+    Wraps an output stream so every line is prefixed with the LOG_PREFIX of
+    the thread writing it, including plain print() calls. Lines are buffered
+    per thread and written whole, so concurrent threads don't interleave.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.buffers = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.buffers, "text", "") + text
+        *lines, self.buffers.text = buffer.split("\n")
+        if lines:
+            self._emit(lines)
+        return len(text)
+
+    def flush(self):
+        if remainder := getattr(self.buffers, "text", ""):
+            self.buffers.text = ""
+            self._emit([remainder], newline=False)
+        self.stream.flush()
+
+    def _emit(self, lines: list[str], newline: bool = True):
+        prefix = f"[{LOG_PREFIX.get()}] " if LOG_PREFIX.get() else ""
+        output = "\n".join(prefix + line for line in lines)
+        with self.lock:
+            self.stream.write(output + ("\n" if newline else ""))
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
 
 class Colors:
     PURPLE = "\033[95m"
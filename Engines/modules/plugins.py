@@ -1,8 +1,13 @@
 import importlib
+import importlib.util
 import sys
 import git
+import time
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import ClassVar, Mapping
+from tabulate import tabulate
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
@@ -32,8 +37,12 @@ class DeployLookups(DeployEngine):
         """Deploy Lookups onto target systems"""
 
 
+# Import and declaration time of every plugin loaded, by module name
+PLUGINS_COSTS: dict[str, dict[str, float]] = dict()
+
+
 class DeployEnginesLoader:
-    """Return Deployer Classes for all available Deployment Engines"""
+    """Discovers, imports and declares deployment engine plugins"""
 
     class PluginInterface:
         """Represents a plugin interface. A plugin has a single declare function."""
@@ -47,48 +56,143 @@ class DeployEnginesLoader:
     def import_plugin(plugin: str) -> PluginInterface:
         return importlib.import_module(plugin)  # type: ignore
 
-    def _generic_loader(self, identifier: str = ""):
-        log("ONGOING", "Initiating deployment plugin routine")
-        available_plugins: dict = {}
-        CONFIGURATIONS: dict[str, dict] = DataTide.Configurations.Systems.Index
-        for system in CONFIGURATIONS:
-            plugin_name: str = system + identifier
+    @staticmethod
+    def plugin_exists(plugin: str) -> bool:
+        """Whether the plugin module can be found, without importing it"""
+        try:
+            return importlib.util.find_spec(plugin) is not None
+        except ModuleNotFoundError:
+            return False
+
+    @staticmethod
+    def load_plugin(plugin_name: str) -> DeployEngine:
+        """
+        Imports a plugin and declares its deploy engine, recording the time
+        spent on both in PLUGINS_COSTS.
+        """
+        start = time.perf_counter()
+        plugin = DeployEnginesLoader.import_plugin("Engines.deployment." + plugin_name)
+        imported = time.perf_counter()
+        try:
+            engine = plugin.declare()
+        except Exception as e:
+            log(
+                "FATAL",
+                "Was able to import module but couldn't declare the plugin",
+                plugin_name,
+                "The plugin should contain a declare() function returning"
+                "the deploy engine Class",
+            )
+            log("FATAL", repr(e))
+            raise Exception("DEPLOYMENT ENGINE PLUGIN IMPORT ERROR")
+
+        PLUGINS_COSTS[plugin_name] = {
+            "import": imported - start,
+            "declare": time.perf_counter() - imported,
+        }
+        log("SUCCESS", "Found deployment plugin for", plugin_name)
+        return engine
+
+
+class DeployEngines(Mapping):
+    """
+    Deploy engines of the configured systems, by system. Plugins are
+    discovered by module name, and only imported and declared when their
+    system is first accessed, so deployments don't pay for the SDKs and
+    secrets of the systems they don't target.
+    """
+
+    def __init__(self, identifier: str = ""):
+        self.identifier = identifier
+        self.engines: dict[str, DeployEngine] = dict()
+        self.failures: dict[str, str] = dict()
+        # One lock per system, so plugins of different systems load concurrently
+        self.locks: dict[str, threading.Lock] = dict()
+        self.lock = threading.Lock()
+
+    def plugin_name(self, system: str) -> str:
+        return system + self.identifier
+
+    def __iter__(self):
+        return (
+            system
+            for system in DataTide.Configurations.Systems.Index
+            if DeployEnginesLoader.plugin_exists(
+                "Engines.deployment." + self.plugin_name(system)
+            )
+        )
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __contains__(self, system) -> bool:
+        # Plugins which failed to import are not available anymore
+        return (
+            system in DataTide.Configurations.Systems.Index
+            and system not in self.failures
+            and DeployEnginesLoader.plugin_exists(
+                "Engines.deployment." + self.plugin_name(system)
+            )
+        )
+
+    def __getitem__(self, system: str) -> DeployEngine:
+        with self.lock:
+            lock = self.locks.setdefault(system, threading.Lock())
+
+        with lock:
+            if system in self.engines:
+                return self.engines[system]
+            if system in self.failures:
+                raise Exception("DEPLOYMENT ENGINE PLUGIN IMPORT ERROR")
+            if system not in self:
+                raise KeyError(system)
+
+            plugin_name = self.plugin_name(system)
             try:
-                plugin = self.import_plugin(
-                    str("Engines.deployment." + plugin_name)
-                )
-                try:
-                    available_plugins[system] = plugin.declare()
-                except Exception as e:
+                self.engines[system] = DeployEnginesLoader.load_plugin(plugin_name)
+            except Exception as e:
+                # Remembered, so the system is reported as unavailable from now on
+                self.failures[system] = repr(e)
+                if isinstance(e, ImportError):
                     log(
                         "FATAL",
-                        "Was able to import module but couldn't declare the plugin",
+                        "Could not import the deployment plugin",
                         plugin_name,
-                        "The plugin should contain a declare() function returning"
-                        "the deploy engine Class",
+                        f"Ensure the dependencies of the plugin are installed : {e!r}",
                     )
-                    log("FATAL", repr(e))
-                    raise Exception("DEPLOYMENT ENGINE PLUGIN IMPORT ERROR")
-                log("SUCCESS", "Found deployment plugin for", plugin_name)
-            except:
-                log("SKIP", "No deployment plugin found for", plugin_name)
-
-        return available_plugins
-
-    def mdr_deployers(self) -> dict[str, DeployMDR]:
-        return self._generic_loader()
-
-    def lookups_deployers(self) -> dict[str, DeployLookups]:
-        return self._generic_loader(identifier="_lookups")
-
-    def metadata_deployers(self) -> dict[str, DeployMetadata]:
-        return self._generic_loader(identifier="_metadata")
+                    raise Exception("DEPLOYMENT ENGINE PLUGIN IMPORT ERROR") from e
+                raise
+            return self.engines[system]
+
+    def __repr__(self):
+        loaded = ", ".join(self.engines) or "none"
+        return f"DeployEngines({', '.join(self)} | loaded : {loaded})"
+
+
+def plugins_report():
+    """
+    Prints the time spent importing and declaring each plugin loaded.
+    """
+    if not PLUGINS_COSTS:
+        return
+    print(
+        tabulate(
+            [
+                [plugin, "%.3f" % cost["import"], "%.3f" % cost["declare"]]
+                for plugin, cost in sorted(
+                    PLUGINS_COSTS.items(), key=lambda p: -sum(p[1].values())
+                )
+            ],
+            headers=["Plugin", "Import (s)", "Declare (s)"],
+            tablefmt="simple",
+        )
+    )
 
 
 @dataclass
 class DeployTide:
     """Unified interface to interact with deployment engines plugins"""
 
-    mdr = DeployEnginesLoader().mdr_deployers()
-    lookups = DeployEnginesLoader().lookups_deployers()
-    metadata = DeployEnginesLoader().metadata_deployers()
+    mdr: ClassVar[DeployEngines] = DeployEngines()
+    lookups: ClassVar[DeployEngines] = DeployEngines(identifier="_lookups")
+    metadata: ClassVar[DeployEngines] = DeployEngines(identifier="_metadata")
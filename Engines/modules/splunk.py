@@ -1,19 +1,38 @@
 from random import randrange
 from datetime import datetime
 import urllib.request
+import urllib.parse
+import http.client
+import threading
+import json
+import csv
 import sys
+import uuid
 import ssl
 from splunklib import client
 import os
 import git
 from io import BytesIO
-from typing import Literal
+from typing import Literal, Iterable, Iterator
 
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.logs import log
 
+# Maximum characters of JSON encoded records embedded in a single lookup upload
+# search, kept well under the length splunkd accepts for a search string
+LOOKUP_CHUNK_SIZE = 500_000
+
+# Maximum documents splunkd accepts in a single KV store batch save
+KVSTORE_BATCH_SIZE = 1000
+
+# Documents deleted by a single KV store query, which is sent in the URL
+KVSTORE_DELETE_SIZE = 100
+
+# Suffix of the temporary lookup a lookup is built into before replacing it
+LOOKUP_UPLOAD_SUFFIX = "_tide_upload"
+
 def correct_timerange_mode(timerange:str)->Literal["random", "current", "custom"]:
     corrected_timerange:Literal["random", "current", "custom"]
     if timerange not in ["random", "current", "custom"]:
@@ -111,6 +130,197 @@ def cron_to_timeframe(
     return cron
 
 
+def same_frequency(cron: str, frequency: str) -> bool:
+    """
+    Whether a cron expression could have been generated by cron_to_timeframe()
+    for a frequency, whichever minute and hour were picked at the time.
+    """
+    fields = str(cron).split()
+    expected = cron_to_timeframe(frequency, mode="custom", custom_time="0h0").split()
+    if len(fields) != len(expected):
+        return False
+
+    # Leading fields picked when generating the expression : none for minutes,
+    # the minute for hours, and both minute and hour for days
+    picked = {"m": 0, "h": 1, "d": 2}[frequency[-1]]
+
+    return fields[picked:] == expected[picked:] and all(
+        field.isdigit() for field in fields[:picked]
+    )
+
+
+def normalize_attribute(attribute: str, value) -> str:
+    """
+    Normalizes a saved search attribute value, so values read from splunkd
+    compare equal to the ones deployed when they have the same meaning.
+    """
+    value = str(value).strip() if value is not None else ""
+
+    if value.lower() in ["true", "false"]:
+        value = "1" if value.lower() == "true" else "0"
+
+    if attribute == "actions":
+        value = ",".join(a.strip() for a in value.split(",") if a.strip())
+
+    return value
+
+
+def lookup_records(content: str) -> Iterator[dict]:
+    """
+    Reads the rows of a CSV lookup one by one, as records, without copying
+    the content.
+    """
+
+    def lines() -> Iterator[str]:
+        start = 0
+        while start < len(content):
+            end = content.find("\n", start)
+            end = len(content) if end == -1 else end + 1
+            yield content[start:end]
+            start = end
+
+    return csv.DictReader(lines())
+
+
+def record_chunks(
+    records: Iterable[dict], size: int, count: int | None = None
+) -> Iterator[list[dict]]:
+    """
+    Groups records into chunks of at most `size` characters once JSON encoded,
+    and optionally at most `count` records, so only one chunk is held in
+    memory at a time.
+    """
+    chunk, chunk_size = [], 0
+    for record in records:
+        record_size = len(json.dumps(record, default=str))
+        if chunk and (
+            chunk_size + record_size > size or (count and len(chunk) >= count)
+        ):
+            yield chunk
+            chunk, chunk_size = [], 0
+        chunk.append(record)
+        chunk_size += record_size
+
+    if chunk:
+        yield chunk
+
+
+def lookup_upload_query(records: list[dict], output: str) -> str:
+    """
+    Builds a search generating the records as events, piped into the
+    `output` commands writing them to the lookup.
+    """
+    content = {"body": records}
+    # Double json dumping strategy to safely escape all quotes
+    raw = json.dumps(json.dumps(content, default=str)).lstrip('"').rstrip('"')
+    return f"""| makeresults
+        | eval _raw="{raw}"
+        | spath path=body{{}} output=temp 
+        | mvexpand temp 
+        | spath input=temp 
+        | fields - _raw _time temp
+        {output}
+        """
+
+
+def kvstore_keys(collection) -> list[str]:
+    """
+    Returns the keys of every document of a KV store collection, page by page.
+    """
+    keys, skip = list(), 0
+    while page := collection.data.query(
+        fields="_key", limit=KVSTORE_BATCH_SIZE, skip=skip
+    ):
+        keys.extend(document["_key"] for document in page)
+        skip += len(page)
+    return keys
+
+
+def upload_lookup(
+    service: client.Service,
+    lookup_name: str,
+    records: Iterable[dict],
+    chunk_size: int = LOOKUP_CHUNK_SIZE,
+    key: str | None = None,
+):
+    """
+    Uploads records to a lookup, chunk by chunk. A failure part-way never
+    leaves the lookup truncated.
+
+    If the app holds a KV store collection named after the lookup, records
+    are written through the KV store REST endpoints. With a `key`, records
+    are upserted on that field. Otherwise, records are inserted alongside
+    the existing documents, which are only deleted once all records are in.
+
+    Otherwise, each chunk is written by a search which embeds it. Small
+    tables fit a single search, which overrides the lookup. Larger ones are
+    built into a temporary lookup, which replaces the lookup in a single
+    search once complete. With a `key`, records are merged into the lookup,
+    taking precedence over the rows sharing the same key.
+    """
+    collection_name = lookup_name.removesuffix(".csv")
+    if collection_name in service.kvstore:
+        collection = service.kvstore[collection_name]
+        stale = [] if key else kvstore_keys(collection)
+        batches = 0
+        for chunk in record_chunks(records, chunk_size, count=KVSTORE_BATCH_SIZE):
+            if key:
+                chunk = [{**record, "_key": record[key]} for record in chunk]
+            collection.data.batch_save(*chunk)
+            batches += 1
+        for position in range(0, len(stale), KVSTORE_DELETE_SIZE):
+            batch = stale[position : position + KVSTORE_DELETE_SIZE]
+            collection.data.delete(
+                query=json.dumps({"$or": [{"_key": k} for k in batch]})
+            )
+        log(
+            "INFO",
+            "Uploaded lookup to the KV store",
+            f"{batches} batches, {len(stale)} previous documents deleted",
+        )
+        return
+
+    def write(target: str) -> str:
+        if key:
+            return f"""| inputlookup append=true {target}
+        | stats first(*) as * by {key}
+        | outputlookup {target}"""
+        return f"| outputlookup {target}"
+
+    chunks = record_chunks(records, chunk_size)
+    first, second = next(chunks, None), next(chunks, None)
+
+    if second is None:
+        if first:
+            service.jobs.oneshot(lookup_upload_query(first, write(lookup_name)))
+        elif not key:
+            # An empty lookup still overrides the existing content
+            service.jobs.oneshot(
+                f"| makeresults | where false() | outputlookup {lookup_name}"
+            )
+        log("INFO", "Uploaded lookup through searches", f"{int(bool(first))} chunks")
+        return
+
+    upload_name = f"{collection_name}{LOOKUP_UPLOAD_SUFFIX}_{uuid.uuid4().hex[:8]}.csv"
+    searches = 0
+    try:
+        for chunk in [first, second, *chunks]:
+            append = " append=true" if searches else ""
+            service.jobs.oneshot(
+                lookup_upload_query(chunk, f"| outputlookup{append} {upload_name}")
+            )
+            searches += 1
+        # Swaps the complete content in, so the lookup is replaced at once
+        service.jobs.oneshot(f"| inputlookup {upload_name} {write(lookup_name)}")
+    finally:
+        try:
+            service.delete(f"data/lookup-table-files/{upload_name}")
+        except Exception as error:
+            log("WARNING", "Could not delete the temporary lookup", upload_name, repr(error))
+
+    log("INFO", "Uploaded lookup through searches", f"{searches} chunks")
+
+
 def request(url, message, **kwargs):
     method = message["method"].lower()
     data = message.get("body", "") if method == "post" else None
@@ -142,28 +352,107 @@ def handler(proxy):
     return request
 
 
+def keepalive_handler(proxy: str | None = None):
+    """
+    Returns a request handler keeping a persistent connection to splunkd for
+    each thread, so consecutive REST calls don't each pay for a new TCP and
+    TLS handshake. When a proxy is used, connections are tunneled through it.
+    Certificates are not verified, as with the default splunklib handler.
+    """
+    connections = threading.local()
+
+    def open_connection(scheme: str, host: str, port: int):
+        if scheme == "https":
+            connection_class = http.client.HTTPSConnection
+            options = {"context": ssl._create_unverified_context()}
+        else:
+            connection_class = http.client.HTTPConnection
+            options = {}
+
+        if proxy:
+            proxy_url = urllib.parse.urlsplit(proxy)
+            connection = connection_class(
+                proxy_url.hostname, proxy_url.port, **options
+            )
+            connection.set_tunnel(host, port)
+        else:
+            connection = connection_class(host, port, **options)
+
+        return connection
+
+    def keepalive_request(url, message, **kwargs):
+        target = urllib.parse.urlsplit(url)
+        scheme = target.scheme or "https"
+        port = target.port or (443 if scheme == "https" else 80)
+        key = (scheme, target.hostname, port)
+        path = target.path + (f"?{target.query}" if target.query else "")
+
+        method = message["method"].upper()
+        body = message.get("body") if method == "POST" else None
+        if type(body) is str:
+            body = body.encode("utf-8")
+        # Length is computed from the encoded body by the connection
+        headers = {
+            k: v
+            for k, v in message.get("headers", [])
+            if k.lower() != "content-length"
+        }
+
+        if not hasattr(connections, "pool"):
+            connections.pool = dict()
+
+        # A kept alive connection may have been closed by the server
+        # in between two requests, in which case it is opened again once.
+        for attempt in range(2):
+            if key not in connections.pool:
+                connections.pool[key] = open_connection(*key)
+            connection = connections.pool[key]
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                content = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                connections.pool.pop(key).close()
+                if attempt:
+                    raise
+
+        return {
+            "status": response.status,
+            "reason": response.reason,
+            "headers": response.getheaders(),
+            "body": BytesIO(content),
+        }
+
+    return keepalive_request
+
+
 def connect_splunk(
     host: str,
     port: str | int,
     token: str,
     app: str,
+    scheme: str = "https",
+    keepalive: bool = False,
 ) -> client.Service:
     port = int(port)
     proxy_data = os.getenv("https_proxy") or os.getenv("http_proxy")
-    if proxy_data:
-        service = client.connect(
-            handler=handler(proxy_data),
-            host=host,
-            port=port,
-            token=token,
-            autologin=True,
-            app=app,
-            sharing="app",
-        )
-    else:
-        service = client.connect(
-            host=host, port=port, token=token, autologin=True, app=app, sharing="app"
-        )
+    options = dict()
+    if keepalive:
+        options["handler"] = keepalive_handler(proxy_data)
+    elif proxy_data:
+        options["handler"] = handler(proxy_data)
+
+    service = client.connect(
+        host=host,
+        port=port,
+        scheme=scheme,
+        token=token,
+        autologin=True,
+        app=app,
+        sharing="app",
+        **options,
+    )
 
     print("\n🔗 Successfully connected to Splunk ! ")
 
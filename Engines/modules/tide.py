@@ -1,75 +1,372 @@
 import os
 import git
 import sys
+import atexit
 from pathlib import Path
 import json
-from typing import Literal, Dict, Tuple
-from functools import cache
+import threading
+from types import MappingProxyType
+from typing import Literal, Dict, Tuple, Callable, Any, Mapping
 
 from dataclasses import dataclass
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.indexing.indexer import indexer
+from Engines.indexing.indexer import (
+    indexer,
+    model_identifier,
+    IndexCache,
+    INDEX_SECTIONS,
+)
+from Engines.indexing.snapshot import IndexSnapshot
+from Engines.modules.files import (
+    resolve_configurations,
+    resolve_paths,
+    invalidate_configurations,
+    load_yaml,
+    resolve_root,
+)
 from Engines.modules.logs import log
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
+
+
+class Lazy:
+    """
+    Class attribute resolved on first access, then cached on the class
+    owning it so later reads are plain attribute lookups. The loader
+    receives the owning class, to build upon sibling attributes like `Index`.
+    """
+
+    resolved: list[tuple[type, "Lazy"]] = list()
+    """Attributes resolved so far, in resolution order"""
+
+    def __init__(self, loader: Callable[[type], Any]):
+        self.loader = loader
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.loader(owner)
+        setattr(owner, self.name, value)
+        Lazy.resolved.append((owner, self))
+        return value
+
+    @staticmethod
+    def recompute():
+        """
+        Computes again all the attributes already resolved, after the index
+        was refreshed. Dictionaries and lists are updated in place, so modules
+        which bound them at import time see the new values.
+        """
+        for owner, attribute in Lazy.resolved:
+            current = owner.__dict__[attribute.name]
+            value = attribute.loader(owner)
+            # Some loaders return the object already cached, which is up to
+            # date and would be emptied by updating it from itself
+            if value is current:
+                continue
+            if type(current) is dict and type(value) is dict:
+                current.clear()
+                current.update(value)
+            elif type(current) is list and type(value) is list:
+                current[:] = value
+            else:
+                setattr(owner, attribute.name, value)
+
 
 class IndexTide:
     """
     Helper class for callable Index related functions. Designed to power
     `DataTide` initialization routine.
     """
+
+    _index: Dict[str, dict] = dict()
+    """Sections of the index loaded so far"""
+    _lock = threading.RLock()
+    _subscribers: list[Callable[[dict], None]] = list()
+    _snapshot: IndexSnapshot | None | Literal[False] = False
+    """Index snapshot in use, False until it was seeked"""
+    _cache: IndexCache | None | Literal[False] = False
+    """Index cache in use, False until it was opened"""
+
     @staticmethod
     def reload():
         """
-        Due to the execution model of DataTide, the dataclass gets initialized 
-        immediately with current index, and the class can't be updated dynamically
-        with index changes.
+        Re-indexes every section loaded so far and applies it in place.
 
-        Calling this function hard removes the module from `sys.modules` and reimports
-        it in the execution context calling the module. This is intended to be used in 
-        Orchestration chains where the index has to be updated at some point between two steps,
-        for example as framework elements gets updated, and should be reinjected in a later
-        toolchain stage.
+        Prefer `IndexTide.refresh()` with the files or sections which
+        actually changed, which avoids indexing the whole repository again.
         """
         log("WARNING", "DataTide re-indexation")
         log("INFO", "The repository will be reindexed to update DataTide")
-        del sys.modules["Engines.modules.tide"]
-        from Engines.modules.tide import DataTide
+        IndexTide.refresh(sections=list(IndexTide._index))
+
+    @staticmethod
+    def subscribe(callback: Callable[[dict], None]) -> Callable[[dict], None]:
+        """
+        Registers a function called with the delta applied each time the
+        index is refreshed, so caches derived from index data can invalidate
+        themselves. Returns the callback, to be usable as a decorator.
+        """
+        IndexTide._subscribers.append(callback)
+        return callback
+
+    @staticmethod
+    def refresh(
+        files: list[Path | str] | None = None, sections: list[str] | None = None
+    ) -> dict:
+        """
+        Updates the live index in place, as data changes between two
+        toolchain stages. `files` are model files which were created,
+        modified or deleted, and are applied individually onto the models
+        index. `sections` are indexed again entirely. Sections which were
+        not loaded yet are skipped, as they will be read fresh on first access.
+
+        As DataTide exposes views over the index, modules which bound DataTide
+        data at import time see the changes. Subscribers registered with
+        `IndexTide.subscribe()` are then notified with the applied delta.
+        """
+        delta = {"sections": [], "updated": {}, "removed": {}}
+
+        with IndexTide._lock:
+            # Files are indexed alongside models, and stay consistent with them
+            sections = list(sections or [])
+            if "models" in sections:
+                sections.append("files")
+            sections = [
+                s for s in INDEX_SECTIONS if s in sections and s in IndexTide._index
+            ]
+            if sections:
+                log("ONGOING", "Refreshing index sections", ", ".join(sections))
+                # Configurations files may have changed as well
+                invalidate_configurations()
+                _tide_index = indexer(cache=IndexTide.cache(), sections=sections)
+                if "models" in sections:
+                    _tide_index = IndexTide.reconcile_staging(_tide_index)
+                for section in sections:
+                    IndexTide.merge(IndexTide._index[section], _tide_index[section])
+                delta["sections"] = sections
+
+            if files and "models" not in sections:
+                # Models read later from an index file or snapshot
+                # would not reflect the changes, so they are loaded first
+                IndexTide.require("models", "files")
+                IndexTide.apply_files(files, delta)
+
+            Lazy.recompute()
+
+        for callback in IndexTide._subscribers:
+            callback(delta)
+
+        return delta
+
+    @staticmethod
+    def apply_files(files: list[Path | str], delta: dict):
+        """
+        Helper function of `IndexTide.refresh()` reading model files
+        again, or removing their model from the index if they were deleted.
+        """
+        models_index = IndexTide._index["models"]
+        files_index = IndexTide.section("files")
+        model_folders = {
+            Path(IndexTide.section("paths")[model_type]).resolve(): model_type
+            for model_type in models_index
+        }
+
+        for model_file in files:
+            model_file = Path(model_file).resolve()
+            model_type = model_folders.get(model_file.parent)
+            if (
+                not model_type
+                or not model_file.name.endswith(".yaml")
+                or "[DEBUG]" in model_file.name
+            ):
+                continue
+
+            # Drops the previous entry first, in case the identifier changed
+            if previous := files_index.pop(str(model_file), None):
+                models_index[previous["type"]].pop(previous["id"], None)
+
+            if model_file.is_file():
+                model_body = load_yaml(model_file)
+                identifier = model_identifier(model_body)
+                models_index[model_type][identifier] = model_body
+                files_index[str(model_file)] = {"type": model_type, "id": identifier}
+                delta["updated"].setdefault(model_type, []).append(identifier)
+            elif previous:
+                delta["removed"].setdefault(previous["type"], []).append(previous["id"])
+
+        log(
+            "INFO",
+            "Applied model changes onto the index",
+            f"{sum(len(u) for u in delta['updated'].values())} updated, "
+            f"{sum(len(r) for r in delta['removed'].values())} removed",
+        )
+
+    @staticmethod
+    def merge(current: dict, new: dict):
+        """
+        Updates a dictionary in place to match a new one, recursing into
+        nested dictionaries so any view or reference held over them stays valid.
+        """
+        for key in [k for k in current if k not in new]:
+            del current[key]
+        for key, value in new.items():
+            if type(current.get(key)) is dict and type(value) is dict:
+                IndexTide.merge(current[key], value)
+            else:
+                current[key] = value
 
-    @cache #Memoization as load() is called multiple times as DataTide initializes
     @staticmethod
     def load() -> Dict[str, dict]:
         """
-        Resolves the current index from a local index json or dynamically. 
+        Resolves the complete index from a local index json or dynamically. 
         
-        Once DataTide is initialized, it becomes a static object containing all
-        of the Tide Instance data at the time the object is created. To update DataTide,
-        call `IndexTide.reload()` to return the latest DataTide object.
+        Once loaded, the index reflects the Tide Instance data at the time it
+        was read. To apply later changes, call `IndexTide.refresh()`.
+        """
+        IndexTide.require(*INDEX_SECTIONS)
+        return IndexTide._index
+
+    @staticmethod
+    def section(name: str) -> dict:
+        """
+        Returns a single section of the index, only indexing it
+        if it was not loaded yet.
+        """
+        if name not in IndexTide._index:
+            IndexTide.require(name)
+        return IndexTide._index[name]
+
+    @staticmethod
+    def require(*sections: str):
+        """
+        Declares the index sections an execution context needs, so they are
+        all indexed in a single pass instead of one at a time as DataTide
+        attributes are first accessed. Sections already loaded are skipped.
+        """
+        with IndexTide._lock:
+            missing = [
+                s for s in INDEX_SECTIONS
+                if s in sections and s not in IndexTide._index
+            ]
+            if not missing:
+                return
+
+            _tide_index = IndexTide.fetch(missing)
+            if "models" in _tide_index and "models" not in IndexTide._index:
+                _tide_index = IndexTide.reconcile_staging(_tide_index)
+
+            for section in _tide_index:
+                IndexTide._index.setdefault(section, _tide_index[section])
+
+            # Index files written by older versions may lack newer sections
+            if outdated := [s for s in missing if s not in IndexTide._index]:
+                _tide_index = indexer(sections=outdated)
+                for section in _tide_index:
+                    IndexTide._index.setdefault(section, _tide_index[section])
+
+    @staticmethod
+    def fetch(sections: list[str]) -> Dict[str, dict]:
+        """
+        Helper function of `IndexTide.require()` retrieving index sections
+        from the index cache, a local index snapshot or file, or by indexing
+        them in memory. Snapshots only decode the requested sections, while
+        an index file is read entirely, and all its sections are returned.
         """
         EXPECTED_INDEX_PATH = ROOT / "index.json"
         INDEX_PATH = Path(os.getenv("INDEX_PATH") or EXPECTED_INDEX_PATH)
 
+        # An index file may be stale, while the cache revalidates every
+        # source file and only parses what changed since the last run.
+        if index_cache := IndexTide.cache():
+            print("🗃️ Index cache enabled, refreshing index from cached files...")
+            return indexer(cache=index_cache, sections=sections)
+
+        if snapshot := IndexTide.snapshot():
+            print("🗜️ Decoding index sections from snapshot...")
+            return {
+                section: snapshot.section(section)
+                for section in sections
+                if section in snapshot.sections()
+            }
+
         print("📂 Index not found in memory, first seeking index file...")
         if os.path.isfile(INDEX_PATH):
-            _tide_index = json.load(open(INDEX_PATH))
-            _tide_index = IndexTide.reconcile_staging(_tide_index)
-            return _tide_index
+            return json.load(open(INDEX_PATH))
         else:
             # Generate index in memory
             print("💽 Could not find index file, generating it in memory")
-            _tide_index = indexer()
-            _tide_index = IndexTide.reconcile_staging(_tide_index)
+            _tide_index = indexer(sections=sections)
             if not _tide_index:
                 raise Exception("INDEX COULD NOT BE LOADED IN MEMORY")
             return _tide_index
 
+    @staticmethod
+    def cache() -> IndexCache | None:
+        """
+        Returns the index cache when it is enabled, read once per execution
+        context and shared by every section indexed in it. The cache is
+        written once, when the execution context exits.
+        """
+        if IndexTide._cache is False:
+            if IndexCache.enabled(resolve_configurations()["global"]):
+                IndexTide._cache = IndexCache(IndexCache.default_path(resolve_paths()))
+                atexit.register(IndexTide._cache.save)
+            else:
+                IndexTide._cache = None
+        return IndexTide._cache
+
+    @staticmethod
+    def snapshot() -> IndexSnapshot | None:
+        """
+        Returns the local index snapshot, opened once per execution context.
+        Snapshots are not used with the index cache enabled, as the cache
+        revalidates source files instead, nor when they were not built with
+        the index file in place.
+        """
+        if IndexTide._snapshot is False:
+            EXPECTED_SNAPSHOT_PATH = ROOT / "index.snapshot"
+            SNAPSHOT_PATH = os.getenv("INDEX_SNAPSHOT_PATH") or EXPECTED_SNAPSHOT_PATH
+            EXPECTED_INDEX_PATH = ROOT / "index.json"
+            INDEX_PATH = os.getenv("INDEX_PATH") or EXPECTED_INDEX_PATH
+            if IndexCache.enabled(resolve_configurations()["global"]):
+                IndexTide._snapshot = None
+            else:
+                IndexTide._snapshot = IndexSnapshot.open(
+                    Path(SNAPSHOT_PATH), Path(INDEX_PATH)
+                )
+        return IndexTide._snapshot
+
+    @staticmethod
+    def model(model_type: str, identifier: str) -> dict:
+        """
+        Returns the body of a single model. When the models are not loaded
+        yet and an index snapshot is available, only this model is decoded,
+        which suits jobs addressing a handful of models such as deployments.
+        """
+        if "models" not in IndexTide._index:
+            EXPECTED_STAGING_INDEX_PATH = ROOT / "staging_index.json"
+            STAGING_INDEX_PATH = (
+                os.getenv("STAGING_INDEX_PATH") or EXPECTED_STAGING_INDEX_PATH
+            )
+            # Staging data overrides models once reconciled into the section
+            if (
+                not os.path.exists(STAGING_INDEX_PATH)
+                and (snapshot := IndexTide.snapshot())
+                and (model_body := snapshot.model(model_type, identifier))
+            ):
+                return model_body
+
+        return IndexTide.section("models")[model_type][identifier]
+
     @staticmethod
     def reconcile_staging(index):
         """
-        Helper function of `IndexTide.load()` designed to seek a staging index
-        and dynamically reconcile in flight.
+        Helper function of `IndexTide.require()` designed to seek a staging index
+        and dynamically reconcile in flight with the MDR models.
         """
 
         log("INFO", "Entering staging index reconciliation routine")
@@ -82,7 +379,9 @@ class IndexTide:
 
         RECONCILED_INDEX = index.copy()
         STG_INDEX = json.load(open(Path(STAGING_INDEX_PATH)))
-        MDR_INDEX = RECONCILED_INDEX
+        RECONCILED_INDEX["models"] = RECONCILED_INDEX["models"].copy()
+        RECONCILED_INDEX["models"]["mdr"] = RECONCILED_INDEX["models"]["mdr"].copy()
+        MDR_INDEX = RECONCILED_INDEX["models"]["mdr"]
         BANNER_MESSAGE = "⚠️ This documentation reflects the latest staging deployment from this MDR. Production status on mainline is, but staging deployment is currently overriding it"
         added_mdr = list()
         updated_mdr = list()
@@ -113,7 +412,7 @@ class IndexTide:
                         f" staging : v{stg_version})"
                     )
 
-                    updated_mdr = list()
+                    updated_mdr.append(mdr)
                     MDR_INDEX[mdr] = STG_INDEX[mdr]
                     if MDR_INDEX[mdr].get("meta"):
                         MDR_INDEX[mdr]["metadata"] = MDR_INDEX[mdr].pop(
@@ -128,6 +427,21 @@ class IndexTide:
         log("INFO", "New MDR added from Staging Data ", str(len(added_mdr)))
         return RECONCILED_INDEX
 
+    @staticmethod
+    def writable(data: Any) -> Any:
+        """
+        Copy-on-write interface to DataTide. Returns a mutable deep copy
+        of the data, as plain dictionaries and lists, which can be
+        modified without altering the index shared across the execution
+        context. DataTide views only guard their top level, so this is the
+        only safe way to modify nested data.
+        """
+        if isinstance(data, Mapping):
+            return {key: IndexTide.writable(value) for key, value in data.items()}
+        if isinstance(data, list):
+            return [IndexTide.writable(value) for value in data]
+        return data
+
     @staticmethod
     def compute_doc_target() -> Tuple[Literal["GLFM", "MARKDOWN"], bool, bool]:
         if (glfm := os.environ.get("DOCUMENTATION_TYPE")) == "GLFM":
@@ -158,14 +472,25 @@ class IndexTide:
 
         return chain
 
+    @staticmethod
+    def compute_models_docs_folder(glfm_doc_target: bool) -> Path:
+        models_docs_folder = Path(
+            IndexTide.section("configurations")["global"]["paths"]["core"][
+                "models_docs_folder"
+            ]
+        )
+        if glfm_doc_target:
+            return Path(str(models_docs_folder).replace(" ", "-"))
+        return models_docs_folder
+
     @staticmethod
     def return_paths(tier: Literal["all", "core", "tide"]) -> dict[str, Path]:
         if tier == "all":
-            return IndexTide.load()["paths"]
+            return IndexTide.section("paths")
         if tier == "core":
-            return IndexTide.load()["paths"]["core"]
+            return IndexTide.section("paths")["core"]
         if tier == "tide":
-            return IndexTide.load()["paths"]["tide"]
+            return IndexTide.section("paths")["tide"]
 
     @staticmethod
     def is_debug()->bool:
@@ -184,20 +509,25 @@ class IndexTide:
 
 class DataTide:
     """Unified programmatic interface to access all data in the
-    TIDE instance. Calling this class triggers an indexation of the
-    entire repository and stores it in memory.
-
-    DataTide execution model as a self-initializing dataclass means
-    it will fetch all index data dynamically when the tide module is first
-    imported in the execution environment, then freeze this state. To
-    refresh DataTide, call `IndexTide.reload()` , a new DataTide object
-    will be initialized. 
+    TIDE instance.
+
+    DataTide sections are materialized on first access: importing the
+    tide module is cheap, and a job only pays for indexing the parts of
+    the repository it actually reads. Jobs which know upfront what they
+    need can declare it with `IndexTide.require()` so the sections are
+    indexed in a single pass. Changes made to the repository by earlier
+    toolchain stages are applied with `IndexTide.refresh()`.
+
+    Sections are exposed as views over a single index shared across the
+    execution context, rather than copies. Only the top level of a view is
+    read-only: nested dictionaries and lists, such as a model body, are the
+    ones held by the index, and writing to them alters the data every other
+    caller reads. Callers which need to modify data, at any depth, must work
+    on a copy from `IndexTide.writable()`.
     """
 
-    # Index = _retrieve_index
+    Index = Lazy(lambda cls: MappingProxyType(IndexTide.load()))
     """Return the raw index content"""
-
-    Index = IndexTide.load()
     
     @dataclass(frozen=True)
     class Models:
@@ -205,19 +535,19 @@ class DataTide:
 
         Exposes all the configurations of the instance
         """
-        Index = dict(IndexTide.load()["models"])
+        Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("models")))
         """All Models Data Index"""
-        tam = dict(Index["tam"])
+        tam = Lazy(lambda cls: MappingProxyType(cls.Index["tam"]))
         """Threat Actor Models Data Index"""
-        tvm = dict(Index["tvm"])
+        tvm = Lazy(lambda cls: MappingProxyType(cls.Index["tvm"]))
         """Threat Vector Models Data Index"""
-        cdm = dict(Index["cdm"])
+        cdm = Lazy(lambda cls: MappingProxyType(cls.Index["cdm"]))
         """Cyber Detection Models Data Index"""
-        mdr = dict(Index["mdr"])
+        mdr = Lazy(lambda cls: MappingProxyType(cls.Index["mdr"]))
         """Managed Detection Rules Data Index"""
-        bdr = dict(Index["bdr"])
+        bdr = Lazy(lambda cls: MappingProxyType(cls.Index["bdr"]))
         """Business Detection Rules Data Index"""
-        chaining = IndexTide.compute_chains(tvm)
+        chaining = Lazy(lambda cls: IndexTide.compute_chains(cls.tvm))
         """Index of all chaining relationships"""
 
     @dataclass(frozen=True)
@@ -227,7 +557,7 @@ class DataTide:
         Exposes the vocabularies used across the instance
         """
 
-        Index = dict(IndexTide.load()["vocabs"])
+        Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("vocabs")))
 
     @dataclass(frozen=True)
     class JsonSchemas:
@@ -235,16 +565,16 @@ class DataTide:
         Interface to all the JSON Schemas generated from TideS
         """
 
-        Index = dict(IndexTide.load()["json_schemas"])
-        tam = dict(Index.get("tam", {}))
+        Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("json_schemas")))
+        tam = Lazy(lambda cls: MappingProxyType(cls.Index.get("tam", {})))
         """Threat Actor Model JSON Schema"""
-        tvm = dict(Index.get("tvm", {}))
+        tvm = Lazy(lambda cls: MappingProxyType(cls.Index.get("tvm", {})))
         """Threat Vector Model JSON Schema"""
-        cdm = dict(Index.get("cdm", {}))
+        cdm = Lazy(lambda cls: MappingProxyType(cls.Index.get("cdm", {})))
         """Cyber Detection Model JSON Schema"""
-        mdr = dict(Index.get("mdr", {}))
+        mdr = Lazy(lambda cls: MappingProxyType(cls.Index.get("mdr", {})))
         """Managed Detection Rule JSON Schema"""
-        bdr = dict(Index.get("bdr", {}))
+        bdr = Lazy(lambda cls: MappingProxyType(cls.Index.get("bdr", {})))
         """Business Detection Request JSON Schema"""
 
     @dataclass(frozen=True)
@@ -253,16 +583,16 @@ class DataTide:
         Interface to all the templates generated from TideSchemas
         """
 
-        Index = dict(IndexTide.load()["templates"])
-        tam = str(Index.get("tam"))
+        Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("templates")))
+        tam = Lazy(lambda cls: str(cls.Index.get("tam")))
         """Threat Actor Model Object Template"""
-        tvm = str(Index.get("tvm"))
+        tvm = Lazy(lambda cls: str(cls.Index.get("tvm")))
         """Threat Vector Model Object Template"""
-        cdm = str(Index.get("cdm"))
+        cdm = Lazy(lambda cls: str(cls.Index.get("cdm")))
         """Cyber Detection Model Object Template"""
-        mdr = str(Index.get("mdr"))
+        mdr = Lazy(lambda cls: str(cls.Index.get("mdr")))
         """Managed Detection Rule Object Template"""
-        bdr = str(Index.get("bdr"))
+        bdr = Lazy(lambda cls: str(cls.Index.get("bdr")))
         """Business Detection Request Object Template"""
 
     @dataclass(frozen=True)
@@ -272,21 +602,21 @@ class DataTide:
         Exposes the different schemas used across the instance
         """
 
-        Index = dict(IndexTide.load()["metaschemas"])
-        subschemas = dict(IndexTide.load()["subschemas"])
-        definitions = dict(IndexTide.load()["definitions"])
-        templates = dict(IndexTide.load()["templates"])
-        tam = dict(Index["tam"])
+        Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("metaschemas")))
+        subschemas = Lazy(lambda cls: MappingProxyType(IndexTide.section("subschemas")))
+        definitions = Lazy(lambda cls: MappingProxyType(IndexTide.section("definitions")))
+        templates = Lazy(lambda cls: MappingProxyType(IndexTide.section("templates")))
+        tam = Lazy(lambda cls: MappingProxyType(cls.Index["tam"]))
         """Threat Actor Model Tide Schema"""
-        tvm = dict(Index["tvm"])
+        tvm = Lazy(lambda cls: MappingProxyType(cls.Index["tvm"]))
         """Threat Vector Model Tide Schema"""
-        cdm = dict(Index["cdm"])
+        cdm = Lazy(lambda cls: MappingProxyType(cls.Index["cdm"]))
         """Cyber Detection Model Tide Schema"""
-        mdr = dict(Index["mdr"])
+        mdr = Lazy(lambda cls: MappingProxyType(cls.Index["mdr"]))
         """Managed Detection Rule Tide Schema"""
-        mdrv2 = dict(Index.get("mdrv2", {}))
+        mdrv2 = Lazy(lambda cls: MappingProxyType(cls.Index.get("mdrv2", {})))
         """DEPRECATED - Legacy MDR Version for backward compatibility use cases"""
-        bdr = dict(Index["bdr"])
+        bdr = Lazy(lambda cls: MappingProxyType(cls.Index["bdr"]))
         """Business Detection Request Tide Schema"""
 
     @dataclass(frozen=True)
@@ -296,30 +626,29 @@ class DataTide:
         Exposes the lookups data within of the instance
         """
 
-        lookups = dict(IndexTide.load()["lookups"]["lookups"])
-        metadata = dict(IndexTide.load()["lookups"]["metadata"])
+        lookups = Lazy(lambda cls: MappingProxyType(IndexTide.section("lookups")["lookups"]))
+        metadata = Lazy(lambda cls: MappingProxyType(IndexTide.section("lookups")["metadata"]))
 
     @dataclass(frozen=True)
     class Configurations:
-        Index = dict(IndexTide.load()["configurations"])
         DEBUG = IndexTide.is_debug()
         """Discovers whether the current execution context is considered
         to be a debugging one"""
         
         @dataclass(frozen=True)
         class Global:
-            Index = dict(IndexTide.load()["configurations"]["global"])
-            models = Index["models"]
-            metaschemas = dict(Index["metaschemas"])
-            recomposition = dict(Index["recomposition"])
-            json_schemas = dict(Index["json_schemas"])
-            data_fields = dict(Index["data_fields"])
-            templates = dict(Index["templates"])
+            Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("configurations")["global"]))
+            models = Lazy(lambda cls: cls.Index["models"])
+            metaschemas = Lazy(lambda cls: MappingProxyType(cls.Index["metaschemas"]))
+            recomposition = Lazy(lambda cls: MappingProxyType(cls.Index["recomposition"]))
+            json_schemas = Lazy(lambda cls: MappingProxyType(cls.Index["json_schemas"]))
+            data_fields = Lazy(lambda cls: MappingProxyType(cls.Index["data_fields"]))
+            templates = Lazy(lambda cls: MappingProxyType(cls.Index["templates"]))
 
             @dataclass(frozen=True)
             class Paths:
-                Index = IndexTide.return_paths(tier="all")
-                _raw = dict(IndexTide.load()["paths"]["raw"])
+                Index = Lazy(lambda cls: IndexTide.return_paths(tier="all"))
+                _raw = Lazy(lambda cls: MappingProxyType(IndexTide.section("paths")["raw"]))
                 """Paths without the proper absolute calculation.
                 Only use for specific use cases, for any others prefer
                 the other attributes which are precomputed"""
@@ -328,138 +657,159 @@ class DataTide:
                 class Core:
                     """Paths to Tide Internals"""
 
-                    Index = IndexTide.return_paths(tier="core")
-                    _raw = dict(IndexTide.load()["paths"]["raw"]["core"])
+                    Index = Lazy(lambda cls: IndexTide.return_paths(tier="core"))
+                    _raw = Lazy(
+                        lambda cls: MappingProxyType(IndexTide.section("paths")["raw"]["core"])
+                    )
                     """Paths without the proper absolute calculation.
                     Only use for specific use cases, for any others prefer
                     the other attributes which are precomputed"""
-                    vocabularies = Index["vocabularies"]
-                    configurations = Index["configurations"]
-                    metaschemas = Index["configurations"]
-                    subschemas = Index["subschemas"]
-                    definitions = Index["definitions"]
-                    wiki_docs_folder = Index["wiki_docs_folder"]
-                    models_docs_folder = Index["models_docs_folder"]
-                    lookup_docs = Index["lookup_docs"]
-                    schemas_docs_folder = Index["schemas_docs_folder"]
-                    vocabularies_docs = Index["vocabularies_docs"]
-                    resources = Index["resources"]
+                    vocabularies = Lazy(lambda cls: cls.Index["vocabularies"])
+                    configurations = Lazy(lambda cls: cls.Index["configurations"])
+                    metaschemas = Lazy(lambda cls: cls.Index["configurations"])
+                    subschemas = Lazy(lambda cls: cls.Index["subschemas"])
+                    definitions = Lazy(lambda cls: cls.Index["definitions"])
+                    wiki_docs_folder = Lazy(lambda cls: cls.Index["wiki_docs_folder"])
+                    models_docs_folder = Lazy(lambda cls: cls.Index["models_docs_folder"])
+                    lookup_docs = Lazy(lambda cls: cls.Index["lookup_docs"])
+                    schemas_docs_folder = Lazy(lambda cls: cls.Index["schemas_docs_folder"])
+                    vocabularies_docs = Lazy(lambda cls: cls.Index["vocabularies_docs"])
+                    resources = Lazy(lambda cls: cls.Index["resources"])
 
                 @dataclass(frozen=True)
                 class Tide:
                     """Paths to Tide Content, Models, and Artifacts at
                     the top level directory"""
 
-                    Index = IndexTide.return_paths(tier="tide")
-                    _raw = dict(IndexTide.load()["paths"]["raw"]["tide"])
+                    Index = Lazy(lambda cls: IndexTide.return_paths(tier="tide"))
+                    _raw = Lazy(
+                        lambda cls: MappingProxyType(IndexTide.section("paths")["raw"]["tide"])
+                    )
                     """Paths without the proper absolute calculation.
                     Only use for specific use cases, for any others prefer
                     the other attributes which are precomputed"""
                     
-                    tam = Index["tam"]
-                    tvm = Index["tvm"]
-                    cdm = Index["cdm"]
-                    mdr = Index["mdr"]
-                    bdr = Index["bdr"]
-                    reports = Index["reports"]
-                    lookups = Index["lookups"]
-                    analytics = Index["analytics"]
-                    snippet_file = Index["snippet_file"]
-                    json_schemas = Index["json_schemas"]
-                    templates = Index["templates"]
-                    tide_indexes = Index["tide_indexes"]
+                    tam = Lazy(lambda cls: cls.Index["tam"])
+                    tvm = Lazy(lambda cls: cls.Index["tvm"])
+                    cdm = Lazy(lambda cls: cls.Index["cdm"])
+                    mdr = Lazy(lambda cls: cls.Index["mdr"])
+                    bdr = Lazy(lambda cls: cls.Index["bdr"])
+                    reports = Lazy(lambda cls: cls.Index["reports"])
+                    lookups = Lazy(lambda cls: cls.Index["lookups"])
+                    analytics = Lazy(lambda cls: cls.Index["analytics"])
+                    snippet_file = Lazy(lambda cls: cls.Index["snippet_file"])
+                    json_schemas = Lazy(lambda cls: cls.Index["json_schemas"])
+                    templates = Lazy(lambda cls: cls.Index["templates"])
+                    tide_indexes = Lazy(lambda cls: cls.Index["tide_indexes"])
 
         @dataclass(frozen=True)
         class Systems:
-            Index = dict(IndexTide.load()["configurations"]["systems"])
+            Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("configurations")["systems"]))
 
             @dataclass(frozen=True)
             class Splunk:
-                Index = dict(IndexTide.load()["configurations"]["systems"]["splunk"])
-                tide = dict(Index["tide"])
-                setup = dict(Index["setup"])
-                secrets = dict(Index["secrets"])
-                defaults = dict(Index["defaults"])
-                lookups = dict(Index.get("lookups", {}))
-                modifiers = dict(Index.get("modifiers", {}))
+                Index = Lazy(
+                    lambda cls: MappingProxyType(
+                        IndexTide.section("configurations")["systems"]["splunk"]
+                    )
+                )
+                tide = Lazy(lambda cls: MappingProxyType(cls.Index["tide"]))
+                setup = Lazy(lambda cls: MappingProxyType(cls.Index["setup"]))
+                secrets = Lazy(lambda cls: MappingProxyType(cls.Index["secrets"]))
+                defaults = Lazy(lambda cls: MappingProxyType(cls.Index["defaults"]))
+                lookups = Lazy(lambda cls: MappingProxyType(cls.Index.get("lookups", {})))
+                modifiers = Lazy(lambda cls: MappingProxyType(cls.Index.get("modifiers", {})))
 
             @dataclass(frozen=True)
             class Sentinel:
-                Index = dict(IndexTide.load()["configurations"]["systems"]["sentinel"])
-                tide = dict(Index["tide"])
-                setup = dict(Index["setup"])
-                secrets = dict(Index["secrets"])
-                defaults = dict(Index["defaults"])
-                lookups = dict(Index["lookups"])
+                Index = Lazy(
+                    lambda cls: MappingProxyType(
+                        IndexTide.section("configurations")["systems"]["sentinel"]
+                    )
+                )
+                tide = Lazy(lambda cls: MappingProxyType(cls.Index["tide"]))
+                setup = Lazy(lambda cls: MappingProxyType(cls.Index["setup"]))
+                secrets = Lazy(lambda cls: MappingProxyType(cls.Index["secrets"]))
+                defaults = Lazy(lambda cls: MappingProxyType(cls.Index["defaults"]))
+                lookups = Lazy(lambda cls: MappingProxyType(cls.Index["lookups"]))
 
             @dataclass(frozen=True)
             class CarbonBlackCloud:
-                Index = dict(
-                    IndexTide.load()["configurations"]["systems"]["carbon_black_cloud"]
+                Index = Lazy(
+                    lambda cls: MappingProxyType(
+                        IndexTide.section("configurations")["systems"][
+                            "carbon_black_cloud"
+                        ]
+                    )
                 )
-                tide = dict(Index["tide"])
-                setup = dict(Index["setup"])
-                secrets = dict(Index["secrets"])
+                tide = Lazy(lambda cls: MappingProxyType(cls.Index["tide"]))
+                setup = Lazy(lambda cls: MappingProxyType(cls.Index["setup"]))
+                secrets = Lazy(lambda cls: MappingProxyType(cls.Index["secrets"]))
 
         @dataclass(frozen=True)
         class Documentation:
             """Parameters describing how documentation should be generated."""
 
-            Index = dict(IndexTide.load()["configurations"]["documentation"])
-            scope = list(Index["scope"])
-            skip_model_keys = list(Index["skip_model_keys"])
-            skip_vocabularies = list(Index["skip_model_keys"])
-            cve = dict(Index["cve"])
-            wiki = dict(Index.get("wiki",{}))
-            object_names = dict(Index["object_names"])
-            titles = dict(Index["titles"])
-            icons = dict(Index["icons"])
-            indexes = dict(Index["indexes"])
+            Index = Lazy(
+                lambda cls: MappingProxyType(IndexTide.section("configurations")["documentation"])
+            )
+            scope = Lazy(lambda cls: list(cls.Index["scope"]))
+            skip_model_keys = Lazy(lambda cls: list(cls.Index["skip_model_keys"]))
+            skip_vocabularies = Lazy(lambda cls: list(cls.Index["skip_model_keys"]))
+            cve = Lazy(lambda cls: MappingProxyType(cls.Index["cve"]))
+            wiki = Lazy(lambda cls: MappingProxyType(cls.Index.get("wiki",{})))
+            object_names = Lazy(lambda cls: MappingProxyType(cls.Index["object_names"]))
+            titles = Lazy(lambda cls: MappingProxyType(cls.Index["titles"]))
+            icons = Lazy(lambda cls: MappingProxyType(cls.Index["icons"]))
+            indexes = Lazy(lambda cls: MappingProxyType(cls.Index["indexes"]))
+            rendering = Lazy(lambda cls: MappingProxyType(cls.Index.get("rendering", {})))
             (documentation_type, glfm_doc_target, raw_md_doc_target) = (
                 IndexTide.compute_doc_target()
             )
-            models_docs_folder: Path = Path(
-                IndexTide.load()["configurations"]["global"]["paths"]["core"][
-                    "models_docs_folder"
-                ]
-            )
-            models_docs_folder = (
-                Path(str(models_docs_folder).replace(" ", "-"))
-                if glfm_doc_target
-                else models_docs_folder
+            models_docs_folder = Lazy(
+                lambda cls: IndexTide.compute_models_docs_folder(cls.glfm_doc_target)
             )
 
         @dataclass(frozen=True)
         class Resources:
             """Parameters pointing to External resources used by engines."""
 
-            Index = dict(IndexTide.load()["configurations"]["resources"])
-            attack = dict(Index["attack"])
-            d3fend = dict(Index["d3fend"])
-            engage = dict(Index["engage"])
-            nist = dict(Index["nist"])
+            Index = Lazy(
+                lambda cls: MappingProxyType(IndexTide.section("configurations")["resources"])
+            )
+            attack = Lazy(lambda cls: MappingProxyType(cls.Index["attack"]))
+            d3fend = Lazy(lambda cls: MappingProxyType(cls.Index["d3fend"]))
+            engage = Lazy(lambda cls: MappingProxyType(cls.Index["engage"]))
+            nist = Lazy(lambda cls: MappingProxyType(cls.Index["nist"]))
 
         @dataclass(frozen=True)
         class Deployment:
             """Generic deployment parameters."""
 
-            Index = dict(IndexTide.load()["configurations"]["deployment"])
-            status = dict(Index["status"])
-            promotion = dict(Index["promotion"])
-            default_responders = str(Index["default_responders"])
-            proxy = dict(Index["proxy"])
-            metadata_lookup = dict(Index["metadata_lookup"])
+            Index = Lazy(
+                lambda cls: MappingProxyType(IndexTide.section("configurations")["deployment"])
+            )
+            status = Lazy(lambda cls: MappingProxyType(cls.Index["status"]))
+            promotion = Lazy(lambda cls: MappingProxyType(cls.Index["promotion"]))
+            default_responders = Lazy(lambda cls: str(cls.Index["default_responders"]))
+            proxy = Lazy(lambda cls: MappingProxyType(cls.Index["proxy"]))
+            metadata_lookup = Lazy(lambda cls: MappingProxyType(cls.Index["metadata_lookup"]))
+            orchestration = Lazy(
+                lambda cls: MappingProxyType(cls.Index.get("orchestration", {}))
+            )
 
         @dataclass(frozen=True)
         class Lookups:
             """Lookups feature management"""
 
-            Index = dict(IndexTide.load()["configurations"]["lookups"])
-            validation = dict(Index["validation"])
+            Index = Lazy(
+                lambda cls: MappingProxyType(IndexTide.section("configurations")["lookups"])
+            )
+            validation = Lazy(lambda cls: MappingProxyType(cls.Index["validation"]))
 
         """TIDE Configuration Interface.
 
         Exposes all the configurations of the instance
         """
-        Index = dict(IndexTide.load()["configurations"])
-        """Contains all configurations"""
\ No newline at end of file
+        Index = Lazy(lambda cls: MappingProxyType(IndexTide.section("configurations")))
+        """Contains all configurations"""
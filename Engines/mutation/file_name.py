@@ -3,14 +3,19 @@ import os
 import git
 from pathlib import Path
 
-import yaml
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.logs import log
-from Engines.modules.files import safe_file_name, resolve_configurations, resolve_paths
-
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+from Engines.modules.files import (
+    safe_file_name,
+    resolve_configurations,
+    resolve_paths,
+    load_yaml,
+    resolve_root,
+)
+
+ROOT = resolve_root()
 CONFIGURATIONS = resolve_configurations()
 PATHS = resolve_paths()
 MODELS_TYPES = CONFIGURATIONS["global"]["models"]
@@ -46,7 +51,7 @@ def run():
         highest_id = 0
         files_to_assign = []
         for file in sorted(os.listdir(PATHS[model])):
-            data = yaml.safe_load(open(PATHS[model] / file, encoding="utf-8"))
+            data = load_yaml(PATHS[model] / file)
             model_name = data["name"]
             model_id = data.get("id")
 
@@ -89,7 +94,7 @@ def run():
             for file in files_to_assign:
                 log("INFO", "Re-aligning file name with model_data", file)
                 file_name = PATHS[model] / file
-                data = yaml.safe_load(open(file_name, encoding="utf-8"))
+                data = load_yaml(file_name)
                 highest_id += 1
                 model_name = data["name"]
                 model_id = f"{model.upper()}{str(highest_id).zfill(4)}"
@@ -1,4 +1,3 @@
-import yaml
 import os
 import git
 import sys
@@ -10,9 +9,9 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from Engines.modules.logs import log
-from Engines.modules.files import resolve_configurations, resolve_paths
+from Engines.modules.files import resolve_configurations, resolve_paths, load_yaml, resolve_root
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 CONFIGURATIONS = resolve_configurations()
 PATHS = resolve_paths()
@@ -21,9 +20,7 @@ DEPLOYMENT_CONFIG = CONFIGURATIONS["deployment"]
 PRODUCTION_STATUSES = DEPLOYMENT_CONFIG["status"]["production"]
 PROMOTION_ENABLED = DEPLOYMENT_CONFIG["promotion"].get("enabled")
 PROMOTION_TARGET = DEPLOYMENT_CONFIG["promotion"].get("promotion_target")
-STATUS_VOCAB = yaml.safe_load(
-    open(PATHS["vocabularies"] / "MDR Status.yaml", encoding="utf-8")
-)
+STATUS_VOCAB = load_yaml(PATHS["vocabularies"] / "MDR Status.yaml")
 VALID_STATUSES = [k["id"] for k in STATUS_VOCAB["keys"]]
 if (os.environ.get("DEBUG") == True or os.environ.get("TERM_PROGRAM") == "vscode"):
     DEBUG = True
@@ -65,10 +62,15 @@ class PromoteMDR:
         log("SUCCESS", f"Successfully promoted MDR to {PROMOTION_TARGET}")
 
 
-    def promote(self, deployment:list[Path]):
+    def promote(self, deployment:list[Path]) -> list[Path]:
+        """
+        Returns the MDR files which were modified by the promotion.
+        """
         log("TITLE", "MDR Status Promotion")
         log("INFO", "Promotes the status of modified MDR files according to configuration")
 
+        promoted = list()
+
         if PROMOTION_ENABLED:
 
             if PROMOTION_TARGET not in VALID_STATUSES:
@@ -92,11 +94,11 @@ class PromoteMDR:
                         "SKIP",
                         "Found nothing to deploy in PRE_DEPLOYMENT environment variable",
                     )
-                    return
+                    return promoted
 
             for mdr in deployment:
                 system_promotion = {}
-                data = yaml.safe_load(open(mdr, encoding="utf-8"))
+                data = load_yaml(mdr)
                 mdr_name = data["name"]
 
                 for system in (conf := data["configurations"]):
@@ -122,6 +124,7 @@ class PromoteMDR:
                     )
                     statuses_to_replace = [system_promotion[s] for s in system_promotion]
                     self.edit_mdr_statuses(mdr, statuses_to_replace)
+                    promoted.append(mdr)
 
         else:
             log(
@@ -130,3 +133,5 @@ class PromoteMDR:
                 advice="You can enable MDR Promotion under config>deployment>status>promotion",
             )
 
+        return promoted
+
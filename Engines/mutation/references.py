@@ -10,9 +10,9 @@ import toml
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.logs import log
-from Engines.modules.files import resolve_paths
+from Engines.modules.files import resolve_paths, parse_yaml, resolve_root
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 PATHS = resolve_paths()
 MODELS_SCOPE = ["tam", "tvm", "cdm", "bdr", "mdr"]
@@ -97,7 +97,7 @@ def run():
         log("INFO", "Now processing all files under model type", model_type)
         for file in sorted(os.listdir(folder)):
             raw_body = open(folder / file, "r", encoding="utf-8").read()
-            current_references = yaml.safe_load(raw_body).get("references")
+            current_references = parse_yaml(raw_body).get("references")
             if current_references and (type(current_references) is not list):
                 log("DEBUG", "No need to migrate", file)
 
@@ -115,7 +115,7 @@ def run():
                     large_block = "\n" + large_block
                 if "references" in header:
                     old_references = "references:" + header.split("references:")[1]
-                    old_references = yaml.safe_load(old_references)
+                    old_references = parse_yaml(old_references)
 
                     new_references = upgrade_refs(old_references)
                     new_references = new_references + "\n"
@@ -8,7 +8,7 @@ from pathlib import Path
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.logs import log
-from Engines.modules.files import resolve_paths
+from Engines.modules.files import resolve_paths, resolve_root
 
 removal = """
 #validation:
@@ -18,7 +18,7 @@ removal = """
     #-
 """
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 PATHS = resolve_paths()
 CDM_FOLDER = PATHS["cdm"]
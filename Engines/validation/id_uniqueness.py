@@ -1,19 +1,15 @@
-import yaml
 from pathlib import Path
 import os
 import git
-import toml
 import sys
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.documentation import get_icon
 from Engines.modules.logs import log
-from Engines.modules.files import resolve_paths
+from Engines.modules.files import resolve_paths, load_yaml, resolve_configurations
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
-
-TIDE_CONFIG = toml.load(open(ROOT / "Configurations/global.toml", encoding="utf-8"))
+TIDE_CONFIG = resolve_configurations()["global"]
 METASCHEMAS = TIDE_CONFIG["metaschemas"]
 SKIPS = ["logsources", "ram", "mdrv2", "lookup_metadata"]
 
@@ -39,7 +35,7 @@ def run():
             for model in os.listdir(PATHS[meta_name]):
                 model_path = Path(PATHS[meta_name]) / model
 
-                model_body = yaml.safe_load(open(model_path, encoding="utf-8"))
+                model_body = load_yaml(model_path)
 
                 if "uuid" in model_body.keys():
                     id = model_body["uuid"]
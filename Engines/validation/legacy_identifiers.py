@@ -0,0 +1,74 @@
+import os
+import git
+import sys
+from tabulate import tabulate
+
+sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
+
+from Engines.modules.framework import vocab_references, legacy_aliases
+from Engines.modules.logs import log
+from Engines.modules.tide import DataTide
+
+MODELS_INDEX = DataTide.Models.Index
+MODELS_SCHEMAS = {
+    model_type: getattr(DataTide.TideSchemas, model_type, {}).get("properties")
+    for model_type in MODELS_INDEX
+}
+FAIL_ON_LEGACY = DataTide.Configurations.Global.Index.get("validation", {}).get(
+    "fail_on_legacy_identifiers", False
+)
+
+
+def find_legacy_identifiers(body, metaschema: dict) -> list[tuple[str, str, str]]:
+    """
+    Returns the field, legacy identifier and replacing identifier of every
+    vocabulary value of the model body still using a legacy identifier.
+    """
+    return [
+        (field, identifier, legacy_aliases(vocab)[identifier])
+        for field, vocab, identifier in vocab_references(body, metaschema)
+        if identifier in legacy_aliases(vocab)
+    ]
+
+
+def run():
+
+    log("TITLE", "Legacy Identifiers Report")
+    log(
+        "INFO",
+        "Reports models referencing vocabulary entries by a legacy identifier",
+    )
+
+    report = list()
+
+    for model_type, models in MODELS_INDEX.items():
+        metaschema = MODELS_SCHEMAS.get(model_type)
+        if not metaschema:
+            continue
+        for model_id, body in models.items():
+            for field, legacy, identifier in find_legacy_identifiers(body, metaschema):
+                report.append([model_id, body.get("name"), field, legacy, identifier])
+
+    if report:
+        # Legacy identifiers still resolve, so they only fail validation
+        # when the configuration asks for it
+        if FAIL_ON_LEGACY is True:
+            os.environ["VALIDATION_WARNING_RAISED"] = "True"
+        log(
+            "WARNING",
+            f"Found {len(report)} legacy identifiers in use",
+            advice="Replace them with the current identifier of the vocabulary entry",
+        )
+        print(
+            tabulate(
+                report,
+                headers=["Model", "Name", "Field", "Legacy", "Replaced By"],
+                tablefmt="fancy_grid",
+            )
+        )
+    else:
+        log("SUCCESS", "No legacy identifiers in use across models")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,23 +1,20 @@
 from jsonschema import Draft7Validator
 from tabulate import tabulate
 import git
-import yaml
 from pathlib import Path
 import os
 import sys
 import pandas as pd
 import numpy as np
 import re
-import toml
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.validation import indicator_validation
 from Engines.modules.logs import Colors, log
-from Engines.modules.files import resolve_paths
+from Engines.modules.files import resolve_paths, load_yaml, resolve_configurations
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
-CONFIG = toml.load(open(ROOT / "Configurations/global.toml", encoding="utf-8"))
+CONFIG = resolve_configurations()["global"]
 PATHS = resolve_paths()
 
 JSONSCHEMAS_PATHS = PATHS["json_schemas"]
@@ -26,12 +23,8 @@ LOOKUPS_METADATA_JSONSCHEMA_PATH = (
 )
 LOOKUPS_PATH = Path(PATHS["lookups"])
 
-LOOKUPS_JSONSCHEMA = yaml.safe_load(
-    open(LOOKUPS_METADATA_JSONSCHEMA_PATH, encoding="utf-8")
-)
-LOOKUPS_CONFIG = toml.load(
-    open(ROOT / "Configurations/lookups.toml", encoding="utf-8")
-)
+LOOKUPS_JSONSCHEMA = load_yaml(LOOKUPS_METADATA_JSONSCHEMA_PATH)
+LOOKUPS_CONFIG = resolve_configurations()["lookups"]
 
 METADATA_MANDATORY = LOOKUPS_CONFIG["validation"].get("enforce_metadata")
 NAMING_CONVENTION = LOOKUPS_CONFIG["validation"].get("naming_convention")
@@ -94,11 +87,8 @@ def run():
                         log("ONGOING", lookup, "Sentinel specific checks...")
                         lookup_metadata_file = lookup.replace(".csv", ".metadata.yaml")
                         try:
-                            lookup_metadata = yaml.safe_load(
-                                open(
-                                    LOOKUPS_PATH / lookup_folder / lookup_metadata_file,
-                                    encoding="utf-8",
-                                )
+                            lookup_metadata = load_yaml(
+                                LOOKUPS_PATH / lookup_folder / lookup_metadata_file
                             )
 
                         except:
@@ -172,9 +162,7 @@ def run():
 
                     # Checking metadata schema
                     v = Draft7Validator(LOOKUPS_JSONSCHEMA)
-                    lookup_metadata_content = yaml.safe_load(
-                        open(LOOKUPS_PATH / lookup_folder / lookup, encoding="utf-8")
-                    )
+                    lookup_metadata_content = load_yaml(LOOKUPS_PATH / lookup_folder / lookup)
                     errors = sorted(
                         v.iter_errors(lookup_metadata_content), key=lambda e: e.path
                     )
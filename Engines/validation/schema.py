@@ -7,7 +7,7 @@ import sys
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.tide import DataTide
+from Engines.modules.tide import DataTide, IndexTide
 from Engines.modules.logs import log
 
 JSONSCHEMAS_INDEX = DataTide.JsonSchemas.Index
@@ -31,7 +31,9 @@ def run():
             for model in MODELS_INDEX[schema]:
                 count += 1
 
-                body = MODELS_INDEX[schema][model]
+                # Validation reshapes the body, so works on a copy to keep
+                # the shared index intact for later toolchain stages
+                body = IndexTide.writable(MODELS_INDEX[schema][model])
                 metadata = body.get("metadata") or body["meta"]
                 metadata["created"] = str(metadata["created"])
                 metadata["modified"] = str(metadata["modified"])
@@ -1,26 +1,33 @@
-import yaml
 import os
 import git
 import re
+import json
 from datetime import datetime
 import sys
 import traceback
 from pathlib import Path
 from typing import Literal, Tuple
+from functools import partial
+from tabulate import tabulate
 
 
 sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
-from Engines.modules.deployment import enabled_systems, modified_mdr_files, Proxy
+from Engines.modules.deployment import (
+    enabled_systems,
+    modified_mdr_files,
+    deploy_concurrently,
+    deployment_plan,
+    Proxy,
+)
 from Engines.modules.logs import log, Colors, coretide_intro
 from Engines.modules.tide import DataTide, IndexTide
 from Engines.mutation.promotion import PromoteMDR
 
 
 toolchain_start_time = datetime.now()
-PRODUCTION_STATUS = DataTide.Configurations.Deployment.status["production"]
-SAFE_STATUS = DataTide.Configurations.Deployment.status["safe"]
 MDR_METADATA_LOOKUPS_CONFIG = DataTide.Configurations.Deployment.metadata_lookup
+ORCHESTRATION_CONFIG = DataTide.Configurations.Deployment.orchestration
 
 os.environ["INDEX_OUTPUT"] = "cache"
 
@@ -43,77 +50,34 @@ torrent = rf"""
 print(torrent)
 
 
-def make_deploy_plan(
-    plan: Literal["STAGING", "PRODUCTION"]
-) -> dict[str, list[str]]:
+def make_deploy_plan(plan: Literal["STAGING", "PRODUCTION"]) -> dict:
+    """
+    Builds the deployment plan from the index. The plan is written as JSON
+    to DEPLOYMENT_PLAN_OUTPUT if set, so later stages and dry runs can
+    reuse it.
+    """
 
     log("INFO", "Compiling MDRs to deploy in plan", plan)
-    mdr_files = list()
-    deploy_mdr = dict()
 
     if plan == "FULL":
-        MDR_PATH = Path(DataTide.Configurations.Global.Paths.Tide.mdr)
-        mdr_files = [MDR_PATH / mdr for mdr in os.listdir(MDR_PATH)]
+        mdr_files = None
         log(
             "ONGOING",
             "Redeploying complete MDR library",
-            f"[{len(mdr_files)} MDR] are in scope",
+            f"[{len(DataTide.Models.mdr)} MDR] are in scope",
         )
 
     else:
         mdr_files = modified_mdr_files(plan)
 
-    for rule in mdr_files:
-        data = yaml.safe_load(open(rule, encoding="utf-8"))
-        name = data["name"]
-        conf_data = data["configurations"]
-        mdr_uuid = data["uuid"]
-
-        for system in conf_data:
-            platform_status = conf_data[system]["status"]
-
-            if system in SYSTEMS_DEPLOYMENT:
-                if plan == "PRODUCTION":
-                    if platform_status in PRODUCTION_STATUS:
-                        deploy_mdr.setdefault(system, []).append(mdr_uuid)
-                        log(
-                            "SUCCESS",
-                            f"[{system.upper()}][{platform_status}] Identified MDR to deploy in {plan}",
-                            name,
-                        )
-                    else:
-                        log(
-                            "WARNING",
-                            f"[{system.upper()}][{platform_status}] Skipping as cannot be deployed in {plan}",
-                            name,
-                        )
-
-                elif plan == "STAGING":
-                    if (
-                        platform_status not in PRODUCTION_STATUS
-                        and platform_status not in SAFE_STATUS
-                    ):
-                        deploy_mdr.setdefault(system, []).append(mdr_uuid)
-                        log(
-                            "SUCCESS",
-                            f"[{system.upper()}][{platform_status}] Identified MDR to deploy in {plan}",
-                            name,
-                        )
-                    else:
-                        log(
-                            "WARNING",
-                            f"[{system.upper()}][{platform_status}] Skipping as cannot be deployed in {plan}",
-                            name,
-                        )
-
-            else:
-                log(
-                    "FAILURE",
-                    f"[{system.upper()}] is disabled and cannot be deployed to for",
-                    name,
-                )
-
-    return deploy_mdr
+    plan_data = deployment_plan(plan, mdr_files)
+
+    if output := os.getenv("DEPLOYMENT_PLAN_OUTPUT"):
+        with open(output, "w", encoding="utf-8") as plan_file:
+            json.dump(plan_data, plan_file, indent=2)
+        log("INFO", "Exported deployment plan to", output)
+
+    return plan_data
 
 
 if not DEPLOYMENT_PLAN:
@@ -135,15 +99,20 @@ if DEPLOYMENT_PLAN not in SUPPORTED_PLANS:
 
 
 # Status promotion, happening before the main deployment loop
+promoted_mdr = list()
 if DEPLOYMENT_PLAN == "PRODUCTION":
     pre_deployment = modified_mdr_files(DEPLOYMENT_PLAN)
     log("TITLE", "Pre-deployment Routine")
-    PromoteMDR().promote(pre_deployment)
+    promoted_mdr = PromoteMDR().promote(pre_deployment)
 
 
+# Promoted MDR files are applied onto the index, so the plan and deployers
+# read their latest status without re-indexing the repository.
+IndexTide.refresh(files=promoted_mdr)
+
 # Refetches the deployment plan, so it can read the MDR after modification
 # and assess the correct latest status
-deployment_list = make_deploy_plan(DEPLOYMENT_PLAN)  # type: ignore
+deployment_list = make_deploy_plan(DEPLOYMENT_PLAN)["systems"]  # type: ignore
 
 if len(deployment_list) == 0:  # In case of no deployments possible, fail graciously
     log(
@@ -153,13 +122,7 @@ if len(deployment_list) == 0:  # In case of no deployments possible, fail gracio
     traceback.print_exc()
     sys.exit(19)
 
-# Need reindexation after MDR promotion is complete.
-IndexTide.reload()
-
-# Need to import later so DataTide has been correctly
-# Refreshed post-promotion, and thus can correctly set
-# global modules variables.
-from Engines.modules.plugins import DeployTide
+from Engines.modules.plugins import DeployTide, plugins_report
 
 if MDR_METADATA_LOOKUPS_CONFIG["enabled"]:
     log("TITLE", "MDR Metadata Deployment")
@@ -184,17 +147,15 @@ if MDR_METADATA_LOOKUPS_CONFIG["enabled"]:
             )
             raise (Exception("METADATA DEPLOYMENT ENGINE NOT FOUND"))
 
-for system in deployment_list:
-    log("TITLE", "MDR Deployment")
-    log(
-        "INFO",
-        "Deploy MDR onto the system they target, if allowed at the instance level and deployment context",
-    )
+log("TITLE", "MDR Deployment")
+log(
+    "INFO",
+    "Deploy MDR onto the system they target, if allowed at the instance level and deployment context",
+)
 
-    if system in DeployTide.mdr:
-        log("ONGOING", "Deploying MDR for target system", system)
-        DeployTide.mdr[system].deploy(deployment=deployment_list[system])
-    else:
+
+def deploy_system(system: str):
+    if system not in DeployTide.mdr:
         log(
             "FATAL",
             f"Cannot find a deployement engine for the target system {system}",
@@ -202,9 +163,52 @@ for system in deployment_list:
         )
         raise (Exception("DEPLOYMENT ENGINE NOT FOUND"))
 
+    log("ONGOING", "Deploying MDR for target system", system)
+    DeployTide.mdr[system].deploy(deployment=deployment_list[system])
+
+
+timeouts = {
+    system: ORCHESTRATION_CONFIG.get("timeouts", {}).get(system)
+    or ORCHESTRATION_CONFIG.get("timeout")
+    for system in deployment_list
+}
+deployment_results = deploy_concurrently(
+    {system: partial(deploy_system, system) for system in deployment_list},
+    workers=int(ORCHESTRATION_CONFIG.get("workers") or 0),
+    timeouts=timeouts,
+)
+
 print(Colors.GREEN + "Execution Report".center(80, "=") + Colors.STOP)
 
 time_to_execute = datetime.now() - toolchain_start_time
 time_to_execute = "%.2f" % time_to_execute.total_seconds()
 
-log("INFO", "Completed deployment toolchain in", f"{time_to_execute} seconds")
\ No newline at end of file
+print(
+    tabulate(
+        [
+            [
+                system,
+                len(deployment_list[system]),
+                result["status"],
+                "%.2f" % result["seconds"],
+                result["error"] or "",
+            ]
+            for system, result in deployment_results.items()
+        ],
+        headers=["System", "MDR", "Status", "Seconds", "Error"],
+        tablefmt="fancy_grid",
+    )
+)
+
+plugins_report()
+
+log("INFO", "Completed deployment toolchain in", f"{time_to_execute} seconds")
+
+failed_systems = [
+    system
+    for system, result in deployment_results.items()
+    if result["status"] != "SUCCESS"
+]
+if failed_systems:
+    log("FATAL", "Deployment failed on systems", ", ".join(failed_systems))
+    raise Exception("DEPLOYMENT FAILED")
\ No newline at end of file
@@ -11,7 +11,12 @@ sys.path.append(str(git.Repo(".", search_parent_directories=True).working_dir))
 
 from Engines.modules.deployment import enabled_systems, enabled_lookup_systems, diff_calculation
 from Engines.modules.logs import log, Colors, coretide_intro
-from Engines.modules.tide import DataTide
+from Engines.modules.tide import DataTide, IndexTide
+
+# Lookups deployments never read models, vocabularies or schemas,
+# so only the relevant index sections are loaded.
+IndexTide.require("paths", "configurations", "lookups")
+
 from Engines.modules.plugins import DeployTide
 
 toolchain_start_time = datetime.now()
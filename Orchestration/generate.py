@@ -34,7 +34,9 @@ models_indexer.run()
 reports_indexer.run()
 templates.run()
 
-IndexTide.reload()
+# Tide indexes are injected into the vocabularies, and templates were
+# regenerated, both are needed up to date by the next stages
+IndexTide.refresh(sections=["vocabs", "templates"])
 from Engines.framework import json_schemas, vscode_snippets
 
 json_schemas.run()
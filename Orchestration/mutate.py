@@ -16,8 +16,9 @@ from Engines.mutation import (
     remove_cdm_validation,
     references,
 )
+from Engines.modules.files import resolve_root
 
-ROOT = Path(str(git.Repo(".", search_parent_directories=True).working_dir))
+ROOT = resolve_root()
 
 print(coretide_intro())
 
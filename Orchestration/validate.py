@@ -12,6 +12,7 @@ from Engines.validation import (
     uuid_v4,
     schema,
     cve,
+    legacy_identifiers,
 )
 
 toolchain_start_time = datetime.now()
@@ -38,6 +39,7 @@ id_uniqueness.run()
 uuid_v4.run()
 schema.run()
 cve.run()
+legacy_identifiers.run()
 
 print("\n" + "Execution Report".center(80, "="))
 